@@ -10,6 +10,7 @@ from dotenv import load_dotenv
 
 from agent_atlassian.protocol_bindings.a2a_server.agent import AtlassianAgent # type: ignore[import-untyped]
 from agent_atlassian.protocol_bindings.a2a_server.agent_executor import AtlassianAgentExecutor # type: ignore[import-untyped]
+from agent_atlassian.mcp_pool import close_mcp_pool
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
@@ -21,6 +22,10 @@ from a2a.types import (
 )
 
 from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian import metrics
 
 load_dotenv()
 
@@ -42,6 +47,9 @@ def main(host: str, port: int):
         agent_card=get_agent_card(host, port), http_handler=request_handler
     )
     app = server.build()
+    app.add_route('/metrics', metrics_endpoint, methods=['GET'])
+    # Shut down the pooled MCP server sessions with the app
+    app.add_event_handler('shutdown', close_mcp_pool)
 
     # Add CORSMiddleware to allow requests from any origin (disables CORS restrictions)
     app.add_middleware(
@@ -55,6 +63,11 @@ def main(host: str, port: int):
     uvicorn.run(app, host=host, port=port)
 
 
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+  """Serves the metrics recorded in this process in Prometheus text format."""
+  return PlainTextResponse(metrics.render_prometheus(), media_type='text/plain; version=0.0.4')
+
+
 def get_agent_card(host: str, port: int):
   """Returns the Agent Card for the Atlassian CRUD Agent."""
   capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
@@ -1,7 +1,6 @@
 # Copyright CNOE Contributors (https://cnoe.io)
 # SPDX-License-Identifier: Apache-2.0
 
-import asyncio
 import importlib.util
 import logging
 import os
@@ -18,6 +17,10 @@ from pydantic import BaseModel
 
 from agent_atlassian.state import AgentState, Message, MsgType, OutputState
 from agent_atlassian.llm_factory import LLMFactory
+from agent_atlassian.agent_cache import get_react_agent
+from agent_atlassian.mcp_pool import get_mcp_pool
+from agent_atlassian.loop_runner import get_background_loop, run_sync
+from agent_atlassian.tool_router import route_tools
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,12 @@ if not spec or not spec.origin:
 
 server_path = str(Path(spec.origin).resolve())
 
+AGENT_PROMPT = (
+    "You are a helpful assistant that can interact with Atlassian. "
+    "You can use the Atlassian API to get information about applications, clusters, and projects. "
+    "You can also perform actions like syncing applications or rolling back to previous versions."
+)
+
 async def create_agent(prompt=None, response_format=None):
   memory = MemorySaver()
 
@@ -141,8 +150,6 @@ async def _async_atlassian_agent(state: AgentState, config: RunnableConfig) -> D
       raise ValueError("ATLASSIAN_TOKEN must be set as an environment variable.")
 
     atlassian_api_url = os.getenv("ATLASSIAN_API_URL")
-    model = LLMFactory().get_llm()
-
     if not atlassian_api_url:
       raise ValueError("ATLASSIAN_API_URL must be set as an environment variable.")
     args = config.get("configurable", {})
@@ -187,35 +194,18 @@ async def _async_atlassian_agent(state: AgentState, config: RunnableConfig) -> D
         human_message = "Hello, I need help with Atlassian"
         logger.warning("No user input found, using default message")
 
-    logger.info(f"Launching MCP server at: {server_path}")
-
-    client = MultiServerMCPClient(
-        {
-            "atlassian": {
-                "command": "uv",
-                "args": ["run", server_path],
-                "env": {
-                    "ATLASSIAN_TOKEN": atlassian_token,
-                    "ATLASSIAN_API_URL": atlassian_api_url,
-                    "ATLASSIAN_EMAIL": atlassian_email,
-                    "ATLASSIAN_VERIFY_SSL": "false"
-                },
-                "transport": "stdio",
-            }
-        }
-    )
-    tools = await client.get_tools()
-    memory = MemorySaver()
-    agent = create_react_agent(
-        model,
-        tools,
-        checkpointer=memory,
-        prompt=(
-            "You are a helpful assistant that can interact with Atlassian. "
-            "You can use the Atlassian API to get information about applications, clusters, and projects. "
-            "You can also perform actions like syncing applications or rolling back to previous versions."
-        )
-    )
+    # Tools are served by warm, long-lived MCP server sessions
+    pool = await get_mcp_pool()
+    tools = await pool.get_tools()
+    logger.debug(f"Using pooled MCP server sessions at: {server_path}: {pool.stats()}")
+    # The model client and compiled graph are reused across invocations. The
+    # graph has no checkpointer of its own: each invocation starts from the
+    # messages passed in, and the workflow graph keeps the conversation.
+    # Only the tools relevant to this turn are bound, so their schemas are
+    # the only ones sent with each LLM call
+    context = "\n".join(str(m.content) for m in (messages or [])[-5:] if m.content != human_message)
+    tools = route_tools(tools, human_message, context)
+    agent = get_react_agent(tools, prompt=AGENT_PROMPT)
     
     # Use the actual user message instead of a hardcoded one
     logger.info(f"Invoking agent with user message: {human_message}")
@@ -254,6 +244,12 @@ async def _async_atlassian_agent(state: AgentState, config: RunnableConfig) -> D
 
     return {"atlassian_output": OutputState(messages=(messages or []) + output_messages)}
 
+# Async node for workflow servers that run the graph on their own event loop.
+# The run is still carried out on the background loop, which owns the pooled
+# MCP sessions and HTTP client, so they are shared by sync and async callers.
+async def aagent_atlassian(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    return await get_background_loop().run_async(_async_atlassian_agent(state, config))
+
 # Sync wrapper for workflow server
 def agent_atlassian(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
-    return asyncio.run(_async_atlassian_agent(state, config))
+    return run_sync(_async_atlassian_agent(state, config))
@@ -0,0 +1,152 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Process-wide cache of chat models and compiled ReAct agents.
+
+Building the chat model client, converting tool schemas and compiling the
+ReAct graph are the same work on every request as long as the configuration
+does not change. Models are cached by provider and configuration
+fingerprint, and compiled agents additionally by prompt, response format,
+tool set and checkpointer, so any configuration change builds a new entry
+instead of reusing a stale one. A cached agent is only reused with the very
+tool objects it was built from, since those are bound to a session pool.
+
+Configuration (environment variables):
+    ATLASSIAN_AGENT_CACHE_SIZE: Compiled agents kept before the least recently used is dropped (default: 16)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+from langchain_core.tools import BaseTool
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.prebuilt import create_react_agent
+
+from agent_atlassian.llm_factory import LLMFactory
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+AGENT_CACHE_REQUESTS = counter(
+    "atlassian_agent_cache_requests_total",
+    "Compiled agent and chat model lookups by kind (agent or model) and result (hit or miss)",
+    ("kind", "result"),
+)
+
+_lock = threading.Lock()
+_models: Dict[Tuple[str, str], Any] = {}
+# Compiled agents with the tool list they were built from
+_agents: "OrderedDict[Hashable, Tuple[Sequence[BaseTool], CompiledStateGraph]]" = OrderedDict()
+# Fingerprints keyed by the identity of the tool list. Pools hand out the
+# same list on every request, so the schemas are hashed only once.
+_tool_fingerprints: Dict[int, Tuple[Sequence[BaseTool], str]] = {}
+
+
+def _max_agents() -> int:
+    try:
+        return max(1, int(os.getenv("ATLASSIAN_AGENT_CACHE_SIZE", "16")))
+    except ValueError:
+        return 16
+
+
+def tools_fingerprint(tools: Sequence[BaseTool]) -> str:
+    """Return a hash of the tools' names, descriptions and argument schemas."""
+    cached = _tool_fingerprints.get(id(tools))
+    if cached is not None and cached[0] is tools:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for tool in sorted(tools, key=lambda t: t.name):
+        schema = tool.args_schema if isinstance(tool.args_schema, dict) else tool.args
+        digest.update(json.dumps([tool.name, tool.description, schema], sort_keys=True, default=str).encode())
+    fingerprint = digest.hexdigest()[:16]
+    with _lock:
+        _tool_fingerprints[id(tools)] = (tools, fingerprint)
+        while len(_tool_fingerprints) > 64:
+            del _tool_fingerprints[next(iter(_tool_fingerprints))]
+    return fingerprint
+
+
+def get_llm(provider: Optional[str] = None) -> Any:
+    """Return the chat model for the configured provider, building it once per configuration."""
+    factory = LLMFactory(provider)
+    key = (factory.provider, factory.config_fingerprint())
+    with _lock:
+        model = _models.get(key)
+    if model is not None:
+        AGENT_CACHE_REQUESTS.inc(kind="model", result="hit")
+        return model
+
+    AGENT_CACHE_REQUESTS.inc(kind="model", result="miss")
+    model = factory.get_llm()
+    with _lock:
+        # Drop models built from an older configuration of the same provider
+        for stale in [k for k in _models if k[0] == key[0]]:
+            del _models[stale]
+        _models[key] = model
+    return model
+
+
+def get_react_agent(
+    tools: Sequence[BaseTool],
+    prompt: Optional[str] = None,
+    response_format: Any = None,
+    checkpointer: Any = None,
+    provider: Optional[str] = None,
+) -> CompiledStateGraph:
+    """Return a compiled ReAct agent, reusing one built for the same configuration.
+
+    Args:
+        tools: Tools to bind
+        prompt: System prompt (optional)
+        response_format: Structured response format (optional)
+        checkpointer: Checkpointer compiled into the graph; part of the key, by identity (optional)
+        provider: LLM provider (defaults to LLM_PROVIDER)
+
+    Returns:
+        The compiled agent graph
+    """
+    factory = LLMFactory(provider)
+    system_prompt = factory.cacheable_prompt(prompt)
+    key = (
+        factory.provider,
+        factory.config_fingerprint(),
+        repr(system_prompt),
+        repr(response_format),
+        tools_fingerprint(tools),
+        id(checkpointer) if checkpointer is not None else None,
+    )
+    with _lock:
+        entry = _agents.get(key)
+        if entry is not None:
+            _agents.move_to_end(key)
+    # Tools are bound to the session pool that produced them; an identical
+    # tool set from a new pool needs a graph bound to the new tools
+    if entry is not None and entry[0] is tools:
+        AGENT_CACHE_REQUESTS.inc(kind="agent", result="hit")
+        return entry[1]
+
+    AGENT_CACHE_REQUESTS.inc(kind="agent", result="miss")
+    logger.info(f"Compiling ReAct agent for provider={factory.provider} tools={key[4]}")
+    kwargs: Dict[str, Any] = {"checkpointer": checkpointer, "prompt": system_prompt}
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    agent = create_react_agent(get_llm(provider), list(tools), **kwargs)
+    with _lock:
+        _agents[key] = (tools, agent)
+        while len(_agents) > _max_agents():
+            _agents.popitem(last=False)
+    return agent
+
+
+def clear() -> None:
+    """Drop all cached models and agents."""
+    with _lock:
+        _models.clear()
+        _agents.clear()
+        _tool_fingerprints.clear()
@@ -0,0 +1,331 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""A LangGraph checkpointer that bounds how many conversation threads it keeps.
+
+``InMemorySaver`` keeps every thread for the life of the process, so memory
+grows with the number of distinct conversations. ``BoundedCheckpointer``
+wraps a checkpointer and deletes a thread once it has not been used for the
+TTL, and the least recently used thread once more than the maximum are
+stored. Eviction runs as threads are read and written, so it needs no
+background task.
+
+Configuration (environment variables):
+    ATLASSIAN_CHECKPOINT_BACKEND: memory or sqlite (default: memory)
+    ATLASSIAN_CHECKPOINT_SQLITE_PATH: Database file for the sqlite backend (default: atlassian_checkpoints.sqlite)
+    ATLASSIAN_CHECKPOINT_TTL: Seconds a thread is kept after its last use, 0 to keep forever (default: 86400)
+    ATLASSIAN_CHECKPOINT_MAX_THREADS: Threads kept before the least recently used is dropped, 0 for no limit (default: 1000)
+
+The sqlite backend needs the ``langgraph-checkpoint-sqlite`` package.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import (
+    DEFAULT_SIZE_BUCKETS,
+    counter,
+    gauge,
+    histogram,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_THREADS = gauge(
+    "atlassian_checkpoint_threads",
+    "Conversation threads currently held by the checkpointer",
+)
+CHECKPOINT_STORED_BYTES = gauge(
+    "atlassian_checkpoint_stored_bytes",
+    "Serialized size of all checkpoints and pending writes held, in bytes",
+)
+CHECKPOINT_WRITE_BYTES = histogram(
+    "atlassian_checkpoint_write_bytes",
+    "Serialized size of each checkpoint or write batch stored, in bytes",
+    ("kind",),
+    DEFAULT_SIZE_BUCKETS,
+)
+CHECKPOINT_THREAD_BYTES = histogram(
+    "atlassian_checkpoint_thread_bytes",
+    "Serialized size of a thread's checkpoints when it is removed, in bytes",
+    ("reason",),
+    DEFAULT_SIZE_BUCKETS,
+)
+CHECKPOINT_EVICTIONS = counter(
+    "atlassian_checkpoint_evictions_total",
+    "Threads removed from the checkpointer by reason (ttl, lru or deleted)",
+    ("reason",),
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    if not config:
+        return None
+    thread_id = config.get("configurable", {}).get("thread_id")
+    return str(thread_id) if thread_id is not None else None
+
+
+class BoundedCheckpointer(BaseCheckpointSaver):
+    """Wraps a checkpointer and evicts idle and least recently used threads.
+
+    Threads are tracked in the order they were last read or written. Storage
+    is delegated to ``inner``; when it does blocking I/O (anything other
+    than ``InMemorySaver``), async calls run its sync methods in a worker
+    thread, so any sync checkpointer can back an async graph.
+    """
+
+    def __init__(
+        self,
+        inner: BaseCheckpointSaver,
+        ttl: float = 86400.0,
+        max_threads: int = 1000,
+        known_threads: Sequence[str] = (),
+    ) -> None:
+        super().__init__(serde=inner.serde)
+        self.inner = inner
+        self.ttl = ttl
+        self.max_threads = max_threads
+        self._blocking = not isinstance(inner, InMemorySaver)
+        self._lock = threading.Lock()
+        # thread id -> (last use, stored bytes), least recently used first
+        self._threads: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        now = time.monotonic()
+        for thread_id in known_threads:
+            self._threads[thread_id] = (now, 0)
+        CHECKPOINT_THREADS.set(len(self._threads))
+
+    @classmethod
+    def from_env(cls) -> "BoundedCheckpointer":
+        backend = os.getenv("ATLASSIAN_CHECKPOINT_BACKEND", "memory").lower()
+        ttl = float(_env_int("ATLASSIAN_CHECKPOINT_TTL", 86400))
+        max_threads = _env_int("ATLASSIAN_CHECKPOINT_MAX_THREADS", 1000)
+        if backend == "memory":
+            return cls(InMemorySaver(), ttl, max_threads)
+        if backend == "sqlite":
+            inner, known = _sqlite_saver(os.getenv("ATLASSIAN_CHECKPOINT_SQLITE_PATH", "atlassian_checkpoints.sqlite"))
+            logger.info(f"Using SQLite checkpointer with {len(known)} stored threads")
+            return cls(inner, ttl, max_threads, known)
+        raise ValueError(f"Unknown ATLASSIAN_CHECKPOINT_BACKEND: {backend}. Valid options: memory, sqlite")
+
+    # Eviction
+
+    def _touch(self, thread_id: Optional[str], added_bytes: int = 0) -> List[Tuple[str, str]]:
+        """Mark a thread as used and return the (thread id, reason) pairs to evict."""
+        now = time.monotonic()
+        evicted: List[Tuple[str, str]] = []
+        with self._lock:
+            if thread_id is not None:
+                last_used, size = self._threads.pop(thread_id, (now, 0))
+                if self.ttl > 0 and now - last_used > self.ttl:
+                    evicted.append((thread_id, "ttl"))
+                    self._record_removal(size, "ttl")
+                    size = 0
+                if added_bytes:
+                    size += added_bytes
+                    CHECKPOINT_STORED_BYTES.inc(added_bytes)
+                self._threads[thread_id] = (now, size)
+            while self._threads:
+                oldest, (last_used, size) = next(iter(self._threads.items()))
+                if self.ttl > 0 and now - last_used > self.ttl:
+                    reason = "ttl"
+                elif self.max_threads > 0 and len(self._threads) > self.max_threads:
+                    reason = "lru"
+                else:
+                    break
+                del self._threads[oldest]
+                evicted.append((oldest, reason))
+                self._record_removal(size, reason)
+            CHECKPOINT_THREADS.set(len(self._threads))
+        return evicted
+
+    def _forget(self, thread_id: str) -> None:
+        with self._lock:
+            entry = self._threads.pop(thread_id, None)
+            if entry is not None:
+                self._record_removal(entry[1], "deleted")
+            CHECKPOINT_THREADS.set(len(self._threads))
+
+    @staticmethod
+    def _record_removal(size: int, reason: str) -> None:
+        CHECKPOINT_EVICTIONS.inc(reason=reason)
+        CHECKPOINT_THREAD_BYTES.observe(size, reason=reason)
+        CHECKPOINT_STORED_BYTES.dec(size)
+
+    def _evict(self, evicted: List[Tuple[str, str]]) -> None:
+        for thread_id, reason in evicted:
+            logger.debug(f"Evicting checkpoint thread {thread_id} ({reason})")
+            self.inner.delete_thread(thread_id)
+
+    async def _aevict(self, evicted: List[Tuple[str, str]]) -> None:
+        if evicted:
+            await self._run(self._evict, evicted)
+
+    async def _run(self, fn: Any, *args: Any) -> Any:
+        if self._blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    # Size accounting
+
+    def _checkpoint_bytes(self, checkpoint: Checkpoint, new_versions: ChannelVersions) -> int:
+        """Serialized size of what the inner saver stores for this checkpoint."""
+        values = checkpoint.get("channel_values", {})
+        size = len(self.serde.dumps_typed({k: v for k, v in checkpoint.items() if k != "channel_values"})[1])
+        for channel in new_versions:
+            if channel in values:
+                size += len(self.serde.dumps_typed(values[channel])[1])
+        CHECKPOINT_WRITE_BYTES.observe(size, kind="checkpoint")
+        return size
+
+    def _writes_bytes(self, writes: Sequence[Tuple[str, Any]]) -> int:
+        size = sum(len(self.serde.dumps_typed(value)[1]) for _, value in writes)
+        CHECKPOINT_WRITE_BYTES.observe(size, kind="writes")
+        return size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            largest = sorted(self._threads.items(), key=lambda item: item[1][1], reverse=True)[:5]
+            return {
+                "backend": type(self.inner).__name__,
+                "threads": len(self._threads),
+                "max_threads": self.max_threads,
+                "ttl": self.ttl,
+                "largest_threads": {thread_id: size for thread_id, (_, size) in largest},
+            }
+
+    # Checkpointer interface
+
+    @property
+    def config_specs(self) -> list:
+        return self.inner.config_specs
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.inner.get_next_version(current, channel)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        self._evict(self._touch(_thread_id(config)))
+        return self.inner.get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.inner.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        self._evict(self._touch(_thread_id(config), self._checkpoint_bytes(checkpoint, new_versions)))
+        return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._evict(self._touch(_thread_id(config), self._writes_bytes(writes)))
+        self.inner.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._forget(str(thread_id))
+        self.inner.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self._aevict(self._touch(_thread_id(config)))
+        return await self._run(self.inner.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await self._run(lambda: list(self.inner.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        await self._aevict(self._touch(_thread_id(config), self._checkpoint_bytes(checkpoint, new_versions)))
+        return await self._run(self.inner.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._aevict(self._touch(_thread_id(config), self._writes_bytes(writes)))
+        await self._run(self.inner.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self._forget(str(thread_id))
+        await self._run(self.inner.delete_thread, thread_id)
+
+
+def _sqlite_saver(path: str) -> Tuple[BaseCheckpointSaver, List[str]]:
+    """Open a SQLite checkpointer and list the threads it already holds."""
+    import sqlite3
+
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError as e:
+        raise ImportError(
+            "ATLASSIAN_CHECKPOINT_BACKEND=sqlite requires the langgraph-checkpoint-sqlite package"
+        ) from e
+
+    # Calls come from the event loop and from worker threads; SqliteSaver
+    # serializes them with its own lock
+    saver = SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+    saver.setup()
+    # Threads left by a previous run are tracked from now, so they expire
+    # after one TTL unless used again
+    with saver.cursor(transaction=False) as cur:
+        cur.execute("SELECT DISTINCT thread_id FROM checkpoints")
+        known = [str(row[0]) for row in cur.fetchall()]
+    return saver, known
+
+
+def create_checkpointer() -> BoundedCheckpointer:
+    """Return a bounded checkpointer configured from the environment."""
+    return BoundedCheckpointer.from_env()
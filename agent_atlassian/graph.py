@@ -1,22 +1,24 @@
 # Copyright CNOE Contributors (https://cnoe.io)
 # SPDX-License-Identifier: Apache-2.0
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
-from langgraph.checkpoint.memory import InMemorySaver
 
-from agent_atlassian.agent import agent_atlassian
+from agent_atlassian.agent import aagent_atlassian, agent_atlassian
+from agent_atlassian.checkpointer import create_checkpointer
 from agent_atlassian.state import AgentState
 
 def build_graph() -> CompiledStateGraph:
   graph_builder = StateGraph(AgentState)
-  graph_builder.add_node("agent_atlassian", agent_atlassian)
+  # Sync and async invocations both run on the shared background loop
+  graph_builder.add_node("agent_atlassian", RunnableLambda(agent_atlassian, afunc=aagent_atlassian, name="agent_atlassian"))
 
   graph_builder.add_edge(START, "agent_atlassian")
   graph_builder.add_edge("agent_atlassian", END)
 
-  # Set memory checkpointer
-  checkpointer = InMemorySaver()
+  # Set checkpointer; idle and least recently used threads are evicted
+  checkpointer = create_checkpointer()
 
   return graph_builder.compile(checkpointer=checkpointer)
 
@@ -0,0 +1,164 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compaction of conversation history sent to the LLM.
+
+A2A sessions keep one checkpointed thread per ``contextId``, so every turn
+adds its question, tool calls, raw tool results and answer to the prompt of
+all later turns. Once the history exceeds a token budget, it is compacted
+before the model is called, in two steps:
+
+1. Tool results outside the most recent turns are cut down to a short
+   excerpt. The tool message itself stays, so every tool call still has its
+   result, as the LLM APIs require.
+2. If that is not enough, the oldest turns are dropped whole, starting from
+   the first one.
+
+The most recent turns are never changed. The compacted history replaces the
+thread's stored messages, so the checkpoint shrinks as well.
+
+Configuration (environment variables):
+    ATLASSIAN_HISTORY_MAX_TOKENS: Approximate token budget for the history, 0 to disable (default: 12000)
+    ATLASSIAN_HISTORY_KEEP_TURNS: Most recent turns kept verbatim (default: 2)
+    ATLASSIAN_HISTORY_TOOL_EXCERPT_CHARS: Characters kept from each compacted tool result (default: 500)
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKETS = (256, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072)
+
+HISTORY_PROMPT_TOKENS = histogram(
+    "atlassian_history_prompt_tokens",
+    "Approximate tokens of conversation history sent to the LLM per model call",
+    (),
+    TOKEN_BUCKETS,
+)
+HISTORY_COMPACTED_MESSAGES = counter(
+    "atlassian_history_compacted_messages_total",
+    "Messages compacted out of conversation history by action (elided or dropped)",
+    ("action",),
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _turn_starts(messages: Sequence[BaseMessage]) -> List[int]:
+    """Indexes of the messages that start a turn (each human message)."""
+    starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return starts
+
+
+def _elide(message: ToolMessage, excerpt_chars: int) -> Optional[ToolMessage]:
+    """Return the tool message cut down to an excerpt, or None if it is short enough."""
+    if "elided_chars" in message.response_metadata:
+        return None
+    text = message.content if isinstance(message.content, str) else str(message.content)
+    if len(text) <= excerpt_chars:
+        return None
+    elided = len(text) - excerpt_chars
+    return message.model_copy(
+        update={
+            "content": f"{text[:excerpt_chars]}\n[... {elided} characters of earlier tool output omitted]",
+            "response_metadata": {**message.response_metadata, "elided_chars": elided},
+        }
+    )
+
+
+def compact_messages(
+    messages: Sequence[BaseMessage],
+    max_tokens: int,
+    keep_turns: int = 2,
+    excerpt_chars: int = 500,
+) -> Optional[List[BaseMessage]]:
+    """Compact a conversation history to fit a token budget.
+
+    Args:
+        messages: Conversation history, oldest first
+        max_tokens: Approximate token budget
+        keep_turns: Most recent turns never compacted
+        excerpt_chars: Characters kept from each compacted tool result
+
+    Returns:
+        The compacted messages, or None if the history already fits
+    """
+    if max_tokens <= 0 or count_tokens_approximately(messages) <= max_tokens:
+        return None
+
+    starts = _turn_starts(messages)
+    if keep_turns <= 0:
+        protected_from = len(messages)
+    elif len(starts) > keep_turns:
+        protected_from = starts[-keep_turns]
+    else:
+        return None
+
+    # Step 1: cut old tool results down to an excerpt
+    compacted = list(messages)
+    elided = 0
+    for i in range(protected_from):
+        message = compacted[i]
+        if isinstance(message, ToolMessage):
+            shorter = _elide(message, excerpt_chars)
+            if shorter is not None:
+                compacted[i] = shorter
+                elided += 1
+
+    # Step 2: drop the oldest turns while still over budget
+    dropped = 0
+    old_starts = [start for start in starts if start < protected_from]
+    for next_start in [*old_starts[1:], protected_from]:
+        if count_tokens_approximately(compacted[dropped:]) <= max_tokens:
+            break
+        dropped = next_start
+
+    if not elided and not dropped:
+        return None
+    HISTORY_COMPACTED_MESSAGES.inc(elided, action="elided")
+    HISTORY_COMPACTED_MESSAGES.inc(dropped, action="dropped")
+    logger.info(f"Compacted conversation history: {elided} tool results shortened, {dropped} messages dropped")
+    return compacted[dropped:]
+
+
+def history_compaction_hook(
+    max_tokens: Optional[int] = None,
+    keep_turns: Optional[int] = None,
+    excerpt_chars: Optional[int] = None,
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return a ``pre_model_hook`` for ``create_react_agent`` that compacts history.
+
+    Arguments default to the ``ATLASSIAN_HISTORY_*`` environment variables.
+    """
+    if max_tokens is None:
+        max_tokens = _env_int("ATLASSIAN_HISTORY_MAX_TOKENS", 12000)
+    if keep_turns is None:
+        keep_turns = _env_int("ATLASSIAN_HISTORY_KEEP_TURNS", 2)
+    if excerpt_chars is None:
+        excerpt_chars = _env_int("ATLASSIAN_HISTORY_TOOL_EXCERPT_CHARS", 500)
+
+    def compact_history(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"] if isinstance(state, dict) else state.messages
+        compacted = compact_messages(messages, max_tokens, keep_turns, excerpt_chars)
+        HISTORY_PROMPT_TOKENS.observe(count_tokens_approximately(compacted if compacted is not None else messages))
+        if compacted is None:
+            return {"messages": []}
+        # Replace the stored history, so the checkpoint is compacted too
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *compacted]}
+
+    return compact_history
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 from typing import Any, Iterable
@@ -10,6 +11,9 @@ from typing import Any, Iterable
 from langchain_openai import AzureChatOpenAI, ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import SystemMessage
+
+from agent_atlassian.prompt_cache import cacheable_prompt, with_cache_metrics
 
 
 class LLMFactory:
@@ -23,6 +27,17 @@ class LLMFactory:
 
   SUPPORTED_PROVIDERS = {"azure-openai", "openai", "anthropic-claude", "google-gemini"}
 
+  # Environment variables each builder reads; a change to any of them means
+  # a cached model (and any agent compiled around it) is stale.
+  PROVIDER_ENV_VARS = {
+    "azure_openai": (
+      "AZURE_OPENAI_DEPLOYMENT", "AZURE_OPENAI_API_VERSION", "AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_KEY",
+    ),
+    "openai": ("OPENAI_API_KEY", "OPENAI_ENDPOINT", "OPENAI_MODEL_NAME", "LLM_PROMPT_CACHE_KEY"),
+    "anthropic_claude": ("ANTHROPIC_API_KEY", "ANTHROPIC_MODEL_NAME"),
+    "google_gemini": ("GOOGLE_API_KEY", "GOOGLE_GEMINI_MODEL_NAME"),
+  }
+
   # ------------------------------------------------------------------ #
   # Construction helpers
   # ------------------------------------------------------------------ #
@@ -61,9 +76,28 @@ class LLMFactory:
     """
 
     builder = getattr(self, f"_build_{self.provider}_llm")
-    llm = builder(response_format, temperature, **kwargs)
+    llm = with_cache_metrics(builder(response_format, temperature, **kwargs), self.provider)
     return llm.bind_tools(tools, strict=strict_tools) if tools else llm
 
+  def cacheable_prompt(self, prompt: str | None) -> str | SystemMessage | None:
+    """Return *prompt* marked for the provider's prompt cache.
+
+    For Anthropic this adds a ``cache_control`` breakpoint, which caches the
+    tool schemas and the system prompt together; OpenAI, Azure OpenAI and
+    Gemini cache the prompt prefix without one. See ``prompt_cache``.
+    """
+    return cacheable_prompt(prompt, self.provider)
+
+  def config_fingerprint(self) -> str:
+    """Return a hash of the provider and the configuration its model is built from.
+
+    Secrets are hashed, never returned, so the fingerprint is safe to log.
+    """
+    config = [self.provider] + [
+      f"{name}={os.getenv(name, '')}" for name in self.PROVIDER_ENV_VARS.get(self.provider, ())
+    ]
+    return hashlib.sha256("\n".join(config).encode()).hexdigest()[:16]
+
   # ------------------------------------------------------------------ #
   # Internal builders (one per provider)
   # ------------------------------------------------------------------ #
@@ -120,6 +154,11 @@ class LLMFactory:
     logging.info(f"[LLM] OpenAI model={model_name} endpoint={base_url}")
 
     model_kwargs = {"response_format": response_format} if response_format else {}
+    # Sent in the request body rather than as an SDK argument, which openai
+    # SDKs older than the parameter reject
+    prompt_cache_key = os.getenv("LLM_PROMPT_CACHE_KEY")
+    if prompt_cache_key:
+      kwargs["extra_body"] = {**(kwargs.get("extra_body") or {}), "prompt_cache_key": prompt_cache_key}
     return ChatOpenAI(
       model_name=model_name,
       api_key=api_key,
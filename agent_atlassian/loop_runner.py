@@ -0,0 +1,110 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""A long-lived event loop for running the agent from synchronous callers.
+
+``asyncio.run`` creates and closes an event loop on every call, and
+everything bound to that loop (MCP server sessions, the HTTP client, the
+tool bindings of cached agents) is thrown away with it. Instead, coroutines
+are submitted to a single loop that runs in a daemon thread for the life of
+the process, so those resources are opened once and reused by every run.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An event loop running in its own daemon thread."""
+
+    def __init__(self, name: str = "agent-atlassian-loop") -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the loop and block until it completes.
+
+        Must not be called from the loop's own thread, which would deadlock.
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from the loop thread")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeouts and interrupts in the caller cancel the work too
+            future.cancel()
+            raise
+
+    async def run_async(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Await a coroutine on the loop from another event loop.
+
+        Cancelling the awaiting task cancels the coroutine.
+        """
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Run the loop's shutdown coroutine, then stop the loop and its thread."""
+        if not self.is_running:
+            return
+        from agent_atlassian.mcp_pool import close_mcp_pool
+
+        try:
+            self.submit(close_mcp_pool()).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error closing MCP sessions on the background loop: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+
+_loop: Optional[BackgroundLoop] = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Return the process-wide background loop, starting it on first use."""
+    global _loop
+    with _lock:
+        if _loop is None or not _loop.is_running:
+            _loop = BackgroundLoop()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the background loop and return its result."""
+    return get_background_loop().run(coro, timeout)
+
+
+@atexit.register
+def shutdown_background_loop() -> None:
+    global _loop
+    with _lock:
+        loop, _loop = _loop, None
+    if loop is not None:
+        loop.close()
@@ -0,0 +1,69 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-process transport to the bundled Atlassian MCP server.
+
+The MCP server ships in this package, so instead of starting it as a child
+process and talking JSON-RPC over its stdin/stdout, the agent can import
+the server's ``FastMCP`` instance and call its tools directly. Tool
+arguments are still validated against the tool's schema and results are
+converted exactly as for a remote session, but there is no subprocess,
+serialization or pipe I/O.
+
+Tools then run on the agent's event loop and share its process, so a
+misbehaving tool is not isolated from the agent; use the stdio or SSE
+transports when that matters.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import CallToolResult, TextContent
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessMCPServer:
+    """Exposes the bundled FastMCP server's tools without a transport.
+
+    Implements the ``call_tool`` part of ``ClientSession``, so the tools it
+    returns are ordinary LangChain MCP tools.
+    """
+
+    def __init__(self) -> None:
+        # Imported lazily: loading the server registers all of its tools
+        from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.server import mcp
+
+        self.server = mcp
+        self.calls = 0
+        self._tools: Optional[List[BaseTool]] = None
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> CallToolResult:
+        """Run a tool coroutine in this process (same interface as ``ClientSession.call_tool``).
+
+        Errors are reported the way an MCP server reports them, as a result
+        with ``isError`` set.
+        """
+        self.calls += 1
+        try:
+            content = await self.server.call_tool(name, arguments or {})
+        except Exception as e:
+            logger.debug(f"In-process tool {name} failed: {e}")
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+        return CallToolResult(content=list(content), isError=False)
+
+    async def get_tools(self) -> List[BaseTool]:
+        if self._tools is None:
+            tools = await self.server.list_tools()
+            self._tools = [convert_mcp_tool_to_langchain_tool(self, tool) for tool in tools]
+        return self._tools
+
+    def stats(self) -> Dict[str, Any]:
+        return {"transport": "inprocess", "calls": self.calls}
+
+    async def close(self) -> None:
+        from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import close_http_client
+
+        await close_http_client()
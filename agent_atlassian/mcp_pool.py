@@ -0,0 +1,509 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pool of long-lived sessions to the bundled Atlassian MCP server.
+
+Opening an MCP session over stdio spawns ``uv run server.py``, imports every
+tool module and performs the initialize handshake. That takes seconds, so the
+agent keeps a few sessions warm for the lifetime of the process instead of
+opening one per request.
+
+Each session is owned by a background task (stdio transports must be entered
+and exited from the same task) and serves up to
+``ATLASSIAN_MCP_SESSION_CONCURRENCY`` tool calls at a time. Sessions are
+recycled after ``ATLASSIAN_MCP_MAX_REQUESTS`` calls, and replaced when a call
+fails at the transport level or a periodic ping goes unanswered. Calls in
+flight on a session that is found dead fail with ``ConnectionError`` instead
+of waiting forever. A call cancelled by the caller (for example a cancelled
+A2A task) stops waiting for its answer; the tool is left to finish on the
+server, since the mcp client API does not expose the request id a
+``notifications/cancelled`` would need.
+
+Calls made under a request deadline (see ``mcp_atlassian.deadline``) carry
+it to the server in the request's ``_meta``, less the hop margin, so the
+tool and its API calls stop in time. The pool stops waiting, and cancels
+the call, when the deadline itself passes.
+
+The tools returned by :meth:`MCPSessionPool.get_tools` are bound to the pool
+rather than to one session, so every call is routed to the least busy
+healthy session.
+
+With ``ATLASSIAN_MCP_TRANSPORT=inprocess`` no sessions are opened at all:
+:func:`get_mcp_pool` returns an :class:`InProcessMCPServer` that calls the
+bundled server's tools directly (see ``mcp_inprocess.py``).
+
+Configuration (environment variables):
+    ATLASSIAN_MCP_TRANSPORT: "stdio" (default), "sse", "streamable_http" or "inprocess"
+    ATLASSIAN_MCP_URL: Server URL for the sse and streamable_http transports
+    ATLASSIAN_MCP_POOL_SIZE: Number of warm sessions (default: 2)
+    ATLASSIAN_MCP_SESSION_CONCURRENCY: Concurrent tool calls per session (default: 4)
+    ATLASSIAN_MCP_MAX_REQUESTS: Tool calls served before a session is recycled (default: 500, 0 disables)
+    ATLASSIAN_MCP_HEALTH_CHECK_INTERVAL: Seconds between pings of each session (default: 30, 0 disables)
+    ATLASSIAN_MCP_HEALTH_CHECK_TIMEOUT: Seconds to wait for a ping answer (default: 10)
+    ATLASSIAN_MCP_STARTUP_TIMEOUT: Seconds to wait for a new session (default: 60)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.sessions import Connection, create_session
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolRequest, CallToolRequestParams, CallToolResult, ClientRequest
+
+from agent_atlassian.mcp_inprocess import InProcessMCPServer
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.deadline import (
+    DEADLINES_EXCEEDED,
+    META_KEY,
+    DeadlineExceeded,
+    get_deadline,
+    hop_margin,
+    remaining,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_STARTED = counter(
+    "atlassian_mcp_pool_sessions_started_total",
+    "MCP server sessions started by the agent's session pool",
+)
+TOOL_CALLS_CANCELLED = counter(
+    "atlassian_mcp_pool_tool_calls_cancelled_total",
+    "Tool calls cancelled by the caller while in flight on a pooled session",
+)
+SESSIONS_RECYCLED = counter(
+    "atlassian_mcp_pool_sessions_recycled_total",
+    "MCP server sessions retired by the session pool, by reason",
+    ("reason",),
+)
+
+# Directory of the databases shared by this process's stdio servers
+_shared_dir: Optional[str] = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def mcp_transport() -> str:
+    """Return the configured transport to the Atlassian MCP server."""
+    return os.getenv("ATLASSIAN_MCP_TRANSPORT", "stdio").lower()
+
+
+def _shared_db(name: str) -> str:
+    """Private SQLite file shared by the pooled server processes.
+
+    Consecutive tool calls of one request may be served by different sessions
+    of the pool: a call that returns an artifact handle and the follow-up
+    calls that read it, or a write and the reads that must see it.
+    """
+    global _shared_dir
+    if _shared_dir is None:
+        _shared_dir = tempfile.mkdtemp(prefix="atlassian-mcp-")
+    return os.path.join(_shared_dir, name)
+
+
+def atlassian_mcp_connection() -> Connection:
+    """Build the connection to the Atlassian MCP server.
+
+    For stdio, the bundled server is started with all ``ATLASSIAN_*``
+    settings of this process, so client tuning (rate limits, caches, ...)
+    applies there too, and its sessions share artifacts and tool cache
+    invalidations through private SQLite files. For sse and
+    streamable_http, the server at ``ATLASSIAN_MCP_URL`` is used as is.
+    """
+    transport = mcp_transport()
+    if transport in ("sse", "streamable_http"):
+        url = os.getenv("ATLASSIAN_MCP_URL")
+        if not url:
+            raise ValueError(f"ATLASSIAN_MCP_URL must be set for the {transport} transport.")
+        return {"transport": transport, "url": url}
+    if transport != "stdio":
+        raise ValueError(f"Unsupported ATLASSIAN_MCP_TRANSPORT for a session pool: {transport}")
+
+    spec = importlib.util.find_spec("agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.server")
+    if not spec or not spec.origin:
+        raise ImportError("Cannot find agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.server module")
+
+    for name in ("ATLASSIAN_TOKEN", "ATLASSIAN_API_URL", "ATLASSIAN_EMAIL"):
+        if not os.getenv(name):
+            raise ValueError(f"{name} must be set as an environment variable.")
+
+    env = {
+        "ATLASSIAN_VERIFY_SSL": "false",
+        "ATLASSIAN_ARTIFACT_DB": _shared_db("artifacts.sqlite"),
+        "ATLASSIAN_TOOL_CACHE_DB": _shared_db("tool-cache.sqlite"),
+    }
+    env.update({name: value for name, value in os.environ.items() if name.startswith("ATLASSIAN_")})
+    return {
+        "command": "uv",
+        "args": ["run", str(Path(spec.origin).resolve())],
+        "env": env,
+        "transport": "stdio",
+    }
+
+
+class PooledSession:
+    """One long-lived MCP session, owned by its own task."""
+
+    def __init__(self, connection: Connection, max_concurrency: int) -> None:
+        self.connection = connection
+        self.max_concurrency = max_concurrency
+        self.session: Optional[ClientSession] = None
+        self.requests = 0
+        self.in_flight = 0
+        self.healthy = True
+        self.retiring = False
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # Set once the session can no longer answer; in-flight calls race it,
+        # since a request to a server that died is otherwise never answered
+        self.dead = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return self.session is not None and self.healthy and not self.retiring
+
+    async def start(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            self._closing.set()
+            self._task.cancel()
+            raise RuntimeError(f"MCP server session did not start within {timeout}s")
+        if self._error is not None:
+            raise RuntimeError(f"MCP server session failed to start: {self._error}") from self._error
+
+    async def _run(self) -> None:
+        try:
+            async with create_session(self.connection) as session:
+                await session.initialize()
+                self.session = session
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            if self._ready.is_set():
+                logger.warning(f"MCP server session ended unexpectedly: {e}")
+        finally:
+            self.mark_dead()
+            self.session = None
+            self._ready.set()
+
+    def mark_dead(self) -> None:
+        self.healthy = False
+        self.dead.set()
+
+    @asynccontextmanager
+    async def use(self) -> AsyncIterator[ClientSession]:
+        async with self._slots:
+            if self.session is None:
+                raise RuntimeError("MCP server session is closed")
+            self.in_flight += 1
+            self._idle.clear()
+            try:
+                yield self.session
+            finally:
+                self.in_flight -= 1
+                self.requests += 1
+                if self.in_flight == 0:
+                    self._idle.set()
+
+    async def close(self, drain_timeout: float = 30.0) -> None:
+        """Stop accepting calls, wait for in-flight ones, then end the session."""
+        self.retiring = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Closing MCP server session with calls still in flight")
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """Warm, health-checked MCP sessions shared by all agent requests.
+
+    Args:
+        connection: Connection used to open each session
+        size: Number of sessions kept open
+        max_concurrency: Concurrent tool calls per session
+        max_requests: Tool calls served by a session before it is recycled (0 disables)
+        health_check_interval: Seconds between pings of each session (0 disables)
+        health_check_timeout: Seconds to wait for a ping before the session is replaced
+        startup_timeout: Seconds to wait for a new session to initialize
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        size: int = 2,
+        max_concurrency: int = 4,
+        max_requests: int = 500,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 10.0,
+        startup_timeout: float = 60.0,
+    ) -> None:
+        self.connection = connection
+        self.size = max(1, size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_requests = max_requests
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.startup_timeout = startup_timeout
+        self._members: List[PooledSession] = []
+        self._tools: Optional[List[BaseTool]] = None
+        self._lock = asyncio.Lock()
+        self._background: Set[asyncio.Task] = set()
+        self._health_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, connection: Optional[Connection] = None) -> "MCPSessionPool":
+        return cls(
+            connection or atlassian_mcp_connection(),
+            size=_env_int("ATLASSIAN_MCP_POOL_SIZE", 2),
+            max_concurrency=_env_int("ATLASSIAN_MCP_SESSION_CONCURRENCY", 4),
+            max_requests=_env_int("ATLASSIAN_MCP_MAX_REQUESTS", 500),
+            health_check_interval=_env_float("ATLASSIAN_MCP_HEALTH_CHECK_INTERVAL", 30.0),
+            health_check_timeout=_env_float("ATLASSIAN_MCP_HEALTH_CHECK_TIMEOUT", 10.0),
+            startup_timeout=_env_float("ATLASSIAN_MCP_STARTUP_TIMEOUT", 60.0),
+        )
+
+    async def start(self) -> None:
+        """Open the initial sessions and start the health checks."""
+        await self._replenish()
+        if self.health_check_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _spawn(self) -> PooledSession:
+        member = PooledSession(self.connection, self.max_concurrency)
+        await member.start(self.startup_timeout)
+        SESSIONS_STARTED.inc()
+        logger.info("Started pooled MCP server session")
+        return member
+
+    async def _replenish(self) -> None:
+        """Open sessions until the pool is back at its configured size."""
+        async with self._lock:
+            missing = self.size - len(self._members)
+            if missing <= 0 or self._closed:
+                return
+            results = await asyncio.gather(*(self._spawn() for _ in range(missing)), return_exceptions=True)
+            for result in results:
+                if isinstance(result, PooledSession):
+                    self._members.append(result)
+                else:
+                    logger.error(f"Could not start MCP server session: {result}")
+            if not self._members:
+                raise RuntimeError("No MCP server session could be started") from results[0]
+
+    def _retire(self, member: PooledSession, reason: str) -> None:
+        """Take a session out of rotation, close it once drained and start a replacement."""
+        if member not in self._members:
+            return
+        self._members.remove(member)
+        member.retiring = True
+        SESSIONS_RECYCLED.inc(reason=reason)
+        logger.info(f"Recycling MCP server session after {member.requests} requests ({reason})")
+        self._run_in_background(member.close())
+        if not self._closed:
+            self._run_in_background(self._replenish())
+
+    def _run_in_background(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _pick(self) -> Optional[PooledSession]:
+        candidates = [member for member in self._members if member.available]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda member: member.in_flight)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledSession]:
+        """Borrow the least busy healthy session for one call."""
+        member = self._pick()
+        if member is None:
+            for dead in [m for m in self._members if not m.available]:
+                self._retire(dead, "unhealthy")
+            await self._replenish()
+            member = self._pick()
+            if member is None:
+                raise RuntimeError("No healthy MCP server session available")
+        async with member.use():
+            yield member
+        if self.max_requests and member.requests >= self.max_requests:
+            self._retire(member, "max_requests")
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> CallToolResult:
+        """Call a tool on a pooled session (same interface as ``ClientSession.call_tool``).
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes before the tool answers
+        """
+        deadline = get_deadline()
+        left = remaining()
+        if left is not None and left <= 0:
+            DEADLINES_EXCEEDED.inc(where="mcp_call")
+            raise DeadlineExceeded(f"Request deadline exceeded before calling {name}")
+
+        async with self.acquire() as member:
+            session = member.session
+
+            async def send() -> CallToolResult:
+                if deadline is None:
+                    return await session.call_tool(name, arguments)
+                params = CallToolRequestParams.model_validate(
+                    {"name": name, "arguments": arguments, "_meta": {META_KEY: deadline - hop_margin()}}
+                )
+                return await session.send_request(
+                    ClientRequest(CallToolRequest(method="tools/call", params=params)), CallToolResult
+                )
+
+            call = asyncio.ensure_future(send())
+            dead = asyncio.ensure_future(member.dead.wait())
+            try:
+                await asyncio.wait({call, dead}, timeout=remaining(), return_when=asyncio.FIRST_COMPLETED)
+                if not call.done() and not member.dead.is_set():
+                    # The server stops the tool itself at the deadline it was sent
+                    DEADLINES_EXCEEDED.inc(where="mcp_call")
+                    raise DeadlineExceeded(f"Request deadline exceeded while calling {name}")
+                if not call.done():
+                    raise ConnectionError(f"MCP server session died while calling {name}")
+                return call.result()
+            except DeadlineExceeded:
+                # The server is fine, only this call ran out of time
+                raise
+            except asyncio.CancelledError:
+                if not call.done():
+                    TOOL_CALLS_CANCELLED.inc()
+                raise
+            except McpError:
+                # The server answered with an error; the session itself is fine
+                raise
+            except Exception:
+                member.mark_dead()
+                self._retire(member, "transport_error")
+                raise
+            finally:
+                call.cancel()
+                dead.cancel()
+
+    async def get_tools(self) -> List[BaseTool]:
+        """Return LangChain tools that route every call through the pool.
+
+        The tool list is loaded once and reused for the lifetime of the pool.
+        """
+        if self._tools is None:
+            async with self.acquire() as member:
+                result = await member.session.list_tools()
+            self._tools = [convert_mcp_tool_to_langchain_tool(self, tool) for tool in result.tools]
+        return self._tools
+
+    async def _health_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            for member in list(self._members):
+                if not member.healthy or member.session is None:
+                    self._retire(member, "unhealthy")
+                    continue
+                # Busy sessions are pinged too: a server that died mid-call
+                # would otherwise leave its callers waiting forever
+                try:
+                    await asyncio.wait_for(member.session.send_ping(), timeout=self.health_check_timeout)
+                except Exception as e:
+                    logger.warning(f"MCP server session failed its health check: {e!r}")
+                    member.mark_dead()
+                    self._retire(member, "health_check")
+            if len(self._members) < self.size:
+                try:
+                    await self._replenish()
+                except Exception as e:
+                    logger.error(f"Could not replenish MCP session pool: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "sessions": [
+                {"requests": m.requests, "in_flight": m.in_flight, "healthy": m.healthy}
+                for m in self._members
+            ],
+        }
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+        members, self._members = self._members, []
+        await asyncio.gather(*(member.close() for member in members), return_exceptions=True)
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+
+_pool: Optional[Union[MCPSessionPool, InProcessMCPServer]] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_mcp_pool() -> Union[MCPSessionPool, InProcessMCPServer]:
+    """Return the process-wide source of MCP tools, starting it on first use.
+
+    This is a session pool, or the in-process server when
+    ``ATLASSIAN_MCP_TRANSPORT=inprocess``; both provide ``get_tools()``,
+    ``stats()`` and ``close()``. Sessions belong to the event loop they were
+    opened on; if called from a different loop, a new pool is started.
+    """
+    global _pool, _pool_loop
+    if mcp_transport() == "inprocess":
+        if not isinstance(_pool, InProcessMCPServer):
+            _pool, _pool_loop = InProcessMCPServer(), None
+        return _pool
+
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        # Publish the pool before starting it so concurrent callers share it;
+        # they wait on the pool's lock until the first sessions are up
+        pool = _pool = MCPSessionPool.from_env()
+        _pool_loop = loop
+        try:
+            await pool.start()
+        except Exception:
+            if _pool is pool:
+                _pool, _pool_loop = None, None
+            raise
+        return pool
+    return _pool
+
+
+async def close_mcp_pool() -> None:
+    global _pool, _pool_loop
+    if isinstance(_pool, InProcessMCPServer) or (_pool is not None and _pool_loop is asyncio.get_running_loop()):
+        await _pool.close()
+    _pool, _pool_loop = None, None
@@ -0,0 +1,105 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Provider-side prompt caching for the agent's static prompt prefix.
+
+The tool schemas and the system prompt are the same on every LLM call, and
+together they are most of the input tokens of a short turn. Providers can
+cache such a prefix and bill and process it at a fraction of the cost, as
+long as it is byte-identical across calls:
+
+- Anthropic caches up to an explicit ``cache_control`` breakpoint. The
+  request prefix is tools, then system prompt, then messages, so one
+  breakpoint on the system prompt caches the tool schemas with it.
+- OpenAI and Azure OpenAI cache prompts of 1024 tokens or more
+  automatically; ``LLM_PROMPT_CACHE_KEY`` (OpenAI only) groups requests that
+  share a prefix so they are routed to the same cache.
+- Gemini 2.5 models cache implicitly.
+
+To keep the prefix stable, the system prompt holds no per-request data and
+tools are bound in name order (see ``tool_router``). Cached and uncached
+input tokens reported by the provider are counted per provider.
+
+Configuration (environment variables):
+    LLM_PROMPT_CACHING: Set to false to leave out cache breakpoints (default: true)
+    LLM_PROMPT_CACHE_KEY: OpenAI prompt_cache_key sent with each request (optional)
+"""
+
+import logging
+import os
+from typing import Any, Dict, Optional, Union
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import SystemMessage
+from langchain_core.outputs import LLMResult
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+LLM_INPUT_TOKENS = counter(
+    "atlassian_llm_input_tokens_total",
+    "LLM input tokens by provider and cache status (cache_read, cache_write or uncached)",
+    ("provider", "cache"),
+)
+
+# Chat model class -> LLMFactory provider name
+MODEL_PROVIDERS = {
+    "AzureChatOpenAI": "azure_openai",
+    "ChatOpenAI": "openai",
+    "ChatAnthropic": "anthropic_claude",
+    "ChatGoogleGenerativeAI": "google_gemini",
+}
+
+
+def prompt_caching_enabled() -> bool:
+    return os.getenv("LLM_PROMPT_CACHING", "true").lower() not in ("false", "0", "no")
+
+
+def model_provider(model: Any) -> str:
+    """Return the provider name of a chat model instance."""
+    return MODEL_PROVIDERS.get(type(model).__name__, type(model).__name__)
+
+
+def cacheable_prompt(prompt: Optional[str], provider: str) -> Union[str, SystemMessage, None]:
+    """Return the system prompt with a cache breakpoint where the provider needs one."""
+    if prompt is None or provider != "anthropic_claude" or not prompt_caching_enabled():
+        return prompt
+    return SystemMessage(content=[{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}])
+
+
+class PromptCacheMetrics(BaseCallbackHandler):
+    """Counts cached and uncached input tokens from the usage the provider reports."""
+
+    def __init__(self, provider: str) -> None:
+        self.provider = provider
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage: Dict[str, Any] = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                if not usage:
+                    continue
+                details = usage.get("input_token_details") or {}
+                read = details.get("cache_read") or 0
+                write = details.get("cache_creation") or 0
+                LLM_INPUT_TOKENS.inc(read, provider=self.provider, cache="cache_read")
+                LLM_INPUT_TOKENS.inc(write, provider=self.provider, cache="cache_write")
+                LLM_INPUT_TOKENS.inc(
+                    max(0, (usage.get("input_tokens") or 0) - read - write),
+                    provider=self.provider,
+                    cache="uncached",
+                )
+
+
+def with_cache_metrics(model: Any, provider: Optional[str] = None) -> Any:
+    """Attach a :class:`PromptCacheMetrics` handler to a chat model and return it."""
+    provider = provider or model_provider(model)
+    callbacks = getattr(model, "callbacks", None)
+    if callbacks is not None and not isinstance(callbacks, list):
+        # A callback manager was configured; leave it alone
+        logger.debug(f"Not counting prompt cache tokens for {provider}: model has a callback manager")
+        return model
+    if not any(isinstance(handler, PromptCacheMetrics) for handler in callbacks or []):
+        model.callbacks = [*(callbacks or []), PromptCacheMetrics(provider)]
+    return model
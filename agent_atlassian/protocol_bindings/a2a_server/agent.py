@@ -4,23 +4,37 @@
 import logging
 import os
 import sys
+import time
 import asyncio
+from contextlib import aclosing
 from typing_extensions import override
-from typing import Any, AsyncIterable, Dict, List, Literal
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
 
-from langchain_mcp_adapters.client import MultiServerMCPClient
-
-from langchain_core.messages import AIMessage, ToolMessage, HumanMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage, HumanMessage, SystemMessage
 from langchain_core.runnables.config import (
     RunnableConfig,
 )
 from langchain_core.language_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import BaseModel
 
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent  # type: ignore
 
+from agent_atlassian.checkpointer import create_checkpointer
+from agent_atlassian.history import history_compaction_hook
+from agent_atlassian.mcp_pool import get_mcp_pool
+from agent_atlassian.prompt_cache import cacheable_prompt, model_provider, with_cache_metrics
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.deadline import (
+    DEADLINES_EXCEEDED,
+    DeadlineExceeded,
+    deadline_scope,
+)
+from agent_atlassian.tool_router import route_tools
+from agent_atlassian.protocol_bindings.a2a_server.response import (
+    ResponseFormat,
+    infer_response,
+    message_text,
+    structured_response_mode,
+)
 from agent_atlassian.protocol_bindings.a2a_server.state import (
     AgentState,
     InputState,
@@ -37,7 +51,9 @@ def debug_print(message: str, banner: bool = False):
     if banner:
         print("=" * 80)
 
-memory = MemorySaver()
+# Conversation state per contextId, bounded by ATLASSIAN_CHECKPOINT_TTL and
+# ATLASSIAN_CHECKPOINT_MAX_THREADS
+memory = create_checkpointer()
 
 def sanitize_tools_for_gemini(tools):
     """
@@ -230,11 +246,18 @@ def get_available_llm() -> BaseChatModel:
     
     raise ValueError("No valid LLM configuration found. Please configure environment variables.")
 
-class ResponseFormat(BaseModel):
-    """Respond to the user in this format."""
+def answer_reserve(deadline: Optional[float]) -> float:
+    """Seconds before the deadline at which the agent stops and answers with what it has.
 
-    status: Literal['input_required', 'completed', 'error'] = 'input_required'
-    message: str
+    ATLASSIAN_DEADLINE_ANSWER_RESERVE (default: 10), at most a quarter of the time left.
+    """
+    try:
+        reserve = float(os.getenv("ATLASSIAN_DEADLINE_ANSWER_RESERVE", "10"))
+    except ValueError:
+        reserve = 10.0
+    if deadline is None:
+        return reserve
+    return max(0.0, min(reserve, (deadline - time.time()) / 4))
 
 class AtlassianAgent:
     """
@@ -259,11 +282,32 @@ class AtlassianAgent:
         'Set response status to error if the input indicates an error'
     )
 
+    # Appended to the system prompt when the status is inferred from the answer
+    INFER_STATUS_INSTRUCTION: str = (
+        ' If you need more information from the user to complete the request, end your reply with a question.'
+    )
+
+    # Sent, without tools, when the request deadline comes close
+    PARTIAL_ANSWER_INSTRUCTION: str = (
+        'The time available for this request has run out before it could be finished. '
+        'Using only the information gathered so far, give the best answer you can to the request below, '
+        'and say briefly what could not be completed.\n\n'
+        'Request: {query}\n\n'
+        'Information gathered:\n{findings}'
+    )
+    # Characters of each tool result, and of all of them, included in the partial answer prompt
+    PARTIAL_ANSWER_RESULT_CHARS = 2000
+    PARTIAL_ANSWER_MAX_CHARS = 12000
+
     def __init__(self):
       # Setup the agent with automatic or explicit LLM provider selection
-      self.model = get_available_llm()
+      self.model = with_cache_metrics(get_available_llm())
       self.graph = None
+      self.tools = []
+      # Graphs compiled per tool subset, keyed by tool names
+      self._graphs: Dict[frozenset, Any] = {}
       self._initialized = False
+      self._init_lock = asyncio.Lock()
       
       debug_print("Atlassian Agent created successfully (MCP setup deferred)", banner=True)
 
@@ -271,36 +315,21 @@ class AtlassianAgent:
         """Ensure the agent is properly initialized with MCP tools (called on first request)"""
         if self._initialized:
             return
-            
+        # Requests run concurrently; the first ones must not initialize twice
+        async with self._init_lock:
+            if not self._initialized:
+                await self._initialize()
+
+    async def _initialize(self):
+        """Set up the MCP tools and the agent graph"""
         debug_print("Initializing MCP client and tools...", banner=True)
         
         try:
-            server_path = "./agent_atlassian/protocol_bindings/mcp_server/mcp_atlassian/server.py"
-            print(f"Launching MCP server at: {server_path}")
-
-            atlassian_token = os.getenv("ATLASSIAN_TOKEN")
-            if not atlassian_token:
-                raise ValueError("ATLASSIAN_TOKEN must be set as an environment variable.")
-
-            atlassian_api_url = os.getenv("ATLASSIAN_API_URL")
-            if not atlassian_api_url:
-                raise ValueError("ATLASSIAN_API_URL must be set as an environment variable.")
-                
-            client = MultiServerMCPClient(
-                {
-                    "math": {
-                        "command": "uv",
-                        "args": ["run", server_path],
-                        "env": {
-                            "ATLASSIAN_TOKEN": os.getenv("ATLASSIAN_TOKEN"),
-                            "ATLASSIAN_API_URL": os.getenv("ATLASSIAN_API_URL"),
-                            "ATLASSIAN_VERIFY_SSL": "false"
-                        },
-                        "transport": "stdio",
-                    }
-                }
-            )
-            tools = await client.get_tools()
+            # Warm MCP server sessions shared by all requests; each tool call
+            # is routed to a pooled session instead of spawning a server
+            pool = await get_mcp_pool()
+            print(f"Using pooled MCP server sessions: {pool.stats()}")
+            tools = await pool.get_tools()
             print('*'*80)
             print("Available Tools and Parameters:")
             for tool in tools:
@@ -323,13 +352,8 @@ class AtlassianAgent:
                 print()
             print('*'*80)
             
-            self.graph = create_react_agent(
-                self.model,
-                sanitize_tools_for_gemini(tools),
-                checkpointer=memory,
-                prompt=self.SYSTEM_INSTRUCTION,
-                response_format=(self.RESPONSE_FORMAT_INSTRUCTION, ResponseFormat),
-            )
+            self.tools = sanitize_tools_for_gemini(tools)
+            self.graph = self._graph_for(self.tools)
 
             debug_print("Agent graph created successfully", banner=True)
             self._initialized = True
@@ -340,9 +364,52 @@ class AtlassianAgent:
             # Don't raise - allow agent to work without MCP for basic functionality
             self._initialized = True
 
+    def _graph_for(self, tools: List[Any]) -> Any:
+        """Return the agent graph bound to a subset of the tools, compiling it once.
+
+        All graphs share the checkpointer, so a conversation continues across
+        turns that use different subsets.
+        """
+        key = frozenset(tool.name for tool in tools)
+        graph = self._graphs.get(key)
+        if graph is None:
+            prompt = self.SYSTEM_INSTRUCTION
+            kwargs: Dict[str, Any] = {}
+            if structured_response_mode() == 'llm':
+                # An extra LLM call after the loop fills in ResponseFormat
+                kwargs['response_format'] = (self.RESPONSE_FORMAT_INSTRUCTION, ResponseFormat)
+            else:
+                prompt += self.INFER_STATUS_INSTRUCTION
+            graph = create_react_agent(
+                self.model,
+                tools,
+                checkpointer=memory,
+                # Tools and system prompt form a stable prefix for the provider's prompt cache
+                prompt=cacheable_prompt(prompt, model_provider(self.model)),
+                # Keep the per-thread history within ATLASSIAN_HISTORY_MAX_TOKENS
+                pre_model_hook=history_compaction_hook(),
+                **kwargs,
+            )
+            self._graphs[key] = graph
+        return graph
+
+    async def _graph_for_query(self, query: str, config: RunnableConfig) -> Any:
+        """Return the graph bound to the tools relevant to a user turn."""
+        # Recent turns of the thread help route follow-ups like "and the next one?"
+        state = await self.graph.aget_state(config)
+        recent = [m for m in state.values.get('messages', []) if isinstance(m, (HumanMessage, AIMessage))][-4:]
+        context = "\n".join(str(m.content) for m in recent)
+        return self._graph_for(route_tools(self.tools, query, context))
+
     async def stream(
-      self, query: str, sessionId: str
+      self, query: str, sessionId: str, deadline: Optional[float] = None
     ) -> AsyncIterable[dict[str, Any]]:
+      """Run a user turn, yielding progress, answer tokens and the final response.
+
+      With a ``deadline`` (epoch seconds), the graph is stopped
+      ``answer_reserve`` seconds before it, and the remaining time is used to
+      answer from the tool results gathered so far.
+      """
       print("DEBUG: Starting stream with query:", query, "and sessionId:", sessionId)
       
       # Ensure the agent is properly initialized before processing requests
@@ -356,50 +423,82 @@ class AtlassianAgent:
           }
           return
       
+      graph = self.graph
+      inputs: dict[str, Any] = {'messages': [('user', query)]}
+      config: RunnableConfig = {
+          # Tool calls of this run inherit the deadline (see _astream)
+          'configurable': {'thread_id': sessionId, 'deadline': deadline},
+          'recursion_limit': 10  # Prevent infinite recursion
+      }
+      answer_by = deadline - answer_reserve(deadline) if deadline is not None else None
       try:
-          inputs: dict[str, Any] = {'messages': [('user', query)]}
-          config: RunnableConfig = {
-              'configurable': {'thread_id': sessionId},
-              'recursion_limit': 10  # Prevent infinite recursion
-          }
-
           iteration_count = 0
           max_iterations = 15
 
-          async for item in self.graph.astream(inputs, config, stream_mode='values'):
-              iteration_count += 1
-              if iteration_count > max_iterations:
-                  print(f"WARNING: Exceeded maximum iterations ({max_iterations}), stopping")
-                  yield {
-                      'is_task_complete': True,
-                      'require_user_input': False,
-                      'content': 'Request took too many iterations to complete. Please try a simpler query.',
-                  }
-                  return
-                  
-              message = item['messages'][-1]
-              print('*'*80)
-              print("DEBUG: Streamed message:", message)
-              print('*'*80)
-              if (
-                  isinstance(message, AIMessage)
-                  and message.tool_calls
-                  and len(message.tool_calls) > 0
-              ):
-                  yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Looking up Atlassian Resources...',
-                  }
-              elif isinstance(message, ToolMessage):
-                  yield {
-                    'is_task_complete': False,
-                    'require_user_input': False,
-                    'content': 'Processing Atlassian Resources...',
-                  }
-
-          yield self.get_agent_response(config)
+          graph = await self._graph_for_query(query, config)
+          try:
+              async with aclosing(self._astream(graph, inputs, config, answer_by)) as events:
+                  async for mode, item in events:
+                      if mode == 'messages':
+                          chunk, metadata = item
+                          # Only the agent node's tokens; the structured response pass is not the answer
+                          if metadata.get('langgraph_node') == 'agent' and isinstance(chunk, AIMessageChunk):
+                              text = message_text(chunk)
+                              if text:
+                                  yield {
+                                    'is_task_complete': False,
+                                    'require_user_input': False,
+                                    'content': text,
+                                    'token': True,
+                                  }
+                          continue
+
+                      iteration_count += 1
+                      if iteration_count > max_iterations:
+                          print(f"WARNING: Exceeded maximum iterations ({max_iterations}), stopping")
+                          yield {
+                              'is_task_complete': True,
+                              'require_user_input': False,
+                              'content': 'Request took too many iterations to complete. Please try a simpler query.',
+                          }
+                          return
+
+                      for node, update in item.items():
+                          if node not in ('agent', 'tools') or not isinstance(update, dict):
+                              continue
+                          for message in update.get('messages', []):
+                              print('*'*80)
+                              print("DEBUG: Streamed message:", message)
+                              print('*'*80)
+                              if isinstance(message, AIMessage) and message.tool_calls:
+                                  names = ', '.join(call['name'] for call in message.tool_calls)
+                                  yield {
+                                    'is_task_complete': False,
+                                    'require_user_input': False,
+                                    'content': f'Looking up Atlassian Resources with {names}...',
+                                  }
+                              elif isinstance(message, ToolMessage):
+                                  yield {
+                                    'is_task_complete': False,
+                                    'require_user_input': False,
+                                    'content': f'Processing Atlassian Resources from {message.name}...',
+                                  }
+          except DeadlineExceeded:
+              DEADLINES_EXCEEDED.inc(where="agent")
+              logger.warning(f"Request on context {sessionId} reached its deadline, answering with partial results")
+              await self._close_pending_tool_calls(
+                  graph, config, 'Stopped at the request deadline before the tool returned.'
+              )
+              yield await self._partial_answer(graph, config, query, deadline)
+              return
+
+          yield self.get_agent_response(config, graph)
           
+      except asyncio.CancelledError:
+          # The task was cancelled mid-run; a tool call left without a result
+          # would make the thread's next LLM call fail
+          await asyncio.shield(self._close_pending_tool_calls(graph, config))
+          raise
       except RecursionError as e:
           print(f"ERROR: Recursion error occurred: {e}")
           yield {
@@ -415,14 +514,143 @@ class AtlassianAgent:
               'content': f'An error occurred while processing your request: {str(e)}',
           }
 
-    def get_agent_response(self, config: RunnableConfig) -> dict[str, Any]:
+    async def _astream(
+        self, graph: Any, inputs: dict[str, Any], config: RunnableConfig, until: Optional[float]
+    ) -> AsyncIterator[tuple]:
+        """Stream the graph's messages and updates, stopping it at ``until`` (epoch seconds).
+
+        The graph runs in its own task, under the run's deadline, so it can
+        be stopped between or in the middle of steps without depending on
+        what the consumer does between events.
+
+        Raises:
+            DeadlineExceeded: If the graph has not finished by ``until``
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> None:
+            try:
+                with deadline_scope(config['configurable'].get('deadline')):
+                    # 'messages' carries the LLM tokens as they are generated,
+                    # 'updates' the messages each node adds (tool calls and tool results)
+                    async for event in graph.astream(inputs, config, stream_mode=['messages', 'updates']):
+                        events.put_nowait(('event', event))
+                events.put_nowait(('done', None))
+            except Exception as e:
+                events.put_nowait(('error', e))
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                timeout = until - time.time() if until is not None else None
+                try:
+                    kind, value = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded('Request deadline reached before the agent finished') from None
+                if kind == 'done':
+                    return
+                if kind == 'error':
+                    raise value
+                yield value
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+    async def _partial_answer(
+        self, graph: Any, config: RunnableConfig, query: str, deadline: Optional[float]
+    ) -> dict[str, Any]:
+        """Answer a turn stopped at its deadline from the tool results it gathered, and record it in the thread."""
+        findings: List[str] = []
+        names: List[str] = []
+        try:
+            state = await graph.aget_state(config)
+            messages = state.values.get('messages', [])
+            # Tool results of this turn, after its user message
+            start = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=0)
+            size = 0
+            for message in messages[start:]:
+                if not isinstance(message, ToolMessage) or message.status == 'error':
+                    continue
+                names.append(message.name or 'tool')
+                text = str(message.content)[:self.PARTIAL_ANSWER_RESULT_CHARS]
+                if size + len(text) > self.PARTIAL_ANSWER_MAX_CHARS:
+                    break
+                size += len(text)
+                findings.append(f'{message.name}: {text}')
+        except Exception as e:
+            logger.warning(f"Could not read the tool results of a run stopped at its deadline: {e}")
+
+        content = ''
+        # Tool calls are not replayed: some providers reject tool messages
+        # in a request without tools
+        prompt = self.PARTIAL_ANSWER_INSTRUCTION.format(query=query, findings='\n\n'.join(findings) or 'None')
+        timeout = max(1.0, deadline - time.time()) if deadline is not None else None
+        try:
+            response = await asyncio.wait_for(
+                self.model.ainvoke([SystemMessage(content=self.SYSTEM_INSTRUCTION), HumanMessage(content=prompt)]),
+                timeout,
+            )
+            content = message_text(response).strip()
+        except Exception as e:
+            logger.warning(f"Could not generate a partial answer: {e!r}")
+        if not content:
+            content = 'The request ran out of time before it could be completed.'
+            if names:
+                content += f" Results were retrieved from {', '.join(dict.fromkeys(names))}, but not summarized."
+            content += ' Please try again, or narrow the request.'
+
+        try:
+            await graph.aupdate_state(config, {'messages': [AIMessage(content=content)]}, as_node='agent')
+        except Exception as e:
+            logger.warning(f"Could not record the partial answer in the thread: {e}")
+        return {
+            'is_task_complete': True,
+            'require_user_input': False,
+            'content': content,
+        }
+
+    async def _close_pending_tool_calls(
+        self,
+        graph: Any,
+        config: RunnableConfig,
+        reason: str = 'Cancelled by the user before the tool returned.',
+    ) -> None:
+        """Answer tool calls of a stopped run, so the thread stays valid for the next message."""
+        try:
+            state = await graph.aget_state(config)
+            messages = state.values.get('messages', [])
+            answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+            last_ai = next((m for m in reversed(messages) if isinstance(m, AIMessage)), None)
+            pending = [call for call in (last_ai.tool_calls if last_ai else []) if call['id'] not in answered]
+            if pending:
+                await graph.aupdate_state(
+                    config,
+                    {'messages': [
+                        ToolMessage(
+                            content=reason,
+                            tool_call_id=call['id'],
+                            name=call['name'],
+                            status='error',
+                        )
+                        for call in pending
+                    ]},
+                    as_node='tools',
+                )
+        except Exception as e:
+            logger.warning(f"Could not close pending tool calls of stopped run: {e}")
+
+    def get_agent_response(self, config: RunnableConfig, graph: Any = None) -> dict[str, Any]:
       print("DEBUG: Fetching agent response with config:", config)
-      current_state = self.graph.get_state(config)
+      current_state = (graph or self.graph).get_state(config)
       print('*'*80)
       print("DEBUG: Current state:", current_state)
       print('*'*80)
 
       structured_response = current_state.values.get('structured_response')
+      if structured_response is None:
+        # No structured response pass: classify the final answer instead
+        structured_response = infer_response(current_state.values.get('messages', []))
       print('='*80)
       print("DEBUG: Structured response:", structured_response)
       print('='*80)
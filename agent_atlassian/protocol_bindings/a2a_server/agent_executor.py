@@ -2,16 +2,47 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from agent_atlassian.protocol_bindings.a2a_server.agent import AtlassianAgent # type: ignore[import-untyped]
+from agent_atlassian.protocol_bindings.a2a_server.scheduler import ExecutionScheduler, SchedulerBusy
 from typing_extensions import override
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
+import asyncio
+import logging
+from typing import Dict, Optional
+from uuid import uuid4
+
 from a2a.types import (
+    Artifact,
+    Part,
+    Task,
     TaskArtifactUpdateEvent,
+    TaskNotCancelableError,
     TaskState,
     TaskStatus,
     TaskStatusUpdateEvent,
+    TextPart,
 )
-from a2a.utils import new_agent_text_message, new_task, new_text_artifact
+from a2a.utils import new_agent_text_message, new_task
+from a2a.utils.errors import ServerError
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+A2A_CANCELLED = counter(
+    "atlassian_a2a_cancelled_tasks_total",
+    "A2A tasks cancelled while queued or running",
+)
+
+
+def result_artifact(artifact_id: str, text: str) -> Artifact:
+    """Build one chunk of the result artifact; all chunks of a task share the artifact id."""
+    return Artifact(
+        artifactId=artifact_id,
+        name='current_result',
+        description='Result of request to agent.',
+        parts=[Part(root=TextPart(text=text))],
+    )
 
 
 class AtlassianAgentExecutor(AgentExecutor):
@@ -19,6 +50,10 @@ class AtlassianAgentExecutor(AgentExecutor):
 
     def __init__(self):
         self.agent = AtlassianAgent()
+        # Per-contextId ordering, a global concurrency limit and a bounded queue
+        self.scheduler = ExecutionScheduler.from_env()
+        # Queued or running executions by task id, for cancel()
+        self._runs: Dict[str, asyncio.Task] = {}
 
     @override
     async def execute(
@@ -35,21 +70,78 @@ class AtlassianAgentExecutor(AgentExecutor):
         if not task:
             task = new_task(context.message)
             event_queue.enqueue_event(task)
-        
+
+        # The deadline starts now, so time spent queued counts against it
+        metadata = context.message.metadata or {}
+        deadline = self.scheduler.deadline_for(metadata.get('timeout_seconds'))
+
+        run = asyncio.ensure_future(self._schedule(query, task, event_queue, deadline))
+        self._runs[task.id] = run
+        try:
+            await run
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            # Only the run was cancelled, by cancel(), which reports the canceled state
+        except SchedulerBusy as e:
+            # Not started: the client can send the same message again later
+            event_queue.enqueue_event(
+                TaskStatusUpdateEvent(
+                    status=TaskStatus(
+                        state=TaskState.rejected,
+                        message=new_agent_text_message(
+                            f'{e} Please retry in {e.retry_after:g} seconds.',
+                            task.contextId,
+                            task.id,
+                        ),
+                    ),
+                    final=True,
+                    contextId=task.contextId,
+                    taskId=task.id,
+                    metadata={'retryable': True, 'retry_after': e.retry_after, 'reason': e.reason},
+                )
+            )
+        finally:
+            # Also reached when execute() itself is cancelled: stop the run with it
+            run.cancel()
+            self._runs.pop(task.id, None)
+
+    async def _schedule(
+        self, query: str, task: Task, event_queue: EventQueue, deadline: Optional[float]
+    ) -> None:
+        async with self.scheduler.slot(task.contextId, deadline):
+            await self._run(query, task, event_queue, deadline)
+
+    async def _run(
+        self, query: str, task: Task, event_queue: EventQueue, deadline: Optional[float]
+    ) -> None:
+        # LLM tokens are appended to the result artifact as they arrive. The
+        # last chunk replaces them with the final answer, which is the same
+        # text unless the structured response pass reworded it.
+        artifact_id = str(uuid4())
+        streamed = False
+
         # invoke the underlying agent, using streaming results
-        async for event in self.agent.stream(query, task.contextId):
-            if event['is_task_complete']:
+        async for event in self.agent.stream(query, task.contextId, deadline):
+            if event.get('token'):
+                event_queue.enqueue_event(
+                    TaskArtifactUpdateEvent(
+                        append=streamed,
+                        contextId=task.contextId,
+                        taskId=task.id,
+                        lastChunk=False,
+                        artifact=result_artifact(artifact_id, event['content']),
+                    )
+                )
+                streamed = True
+            elif event['is_task_complete']:
                 event_queue.enqueue_event(
                     TaskArtifactUpdateEvent(
                         append=False,
                         contextId=task.contextId,
                         taskId=task.id,
                         lastChunk=True,
-                        artifact=new_text_artifact(
-                            name='current_result',
-                            description='Result of request to agent.',
-                            text=event['content'],
-                        ),
+                        artifact=result_artifact(artifact_id, event['content']),
                     )
                 )
                 event_queue.enqueue_event(
@@ -61,6 +153,17 @@ class AtlassianAgentExecutor(AgentExecutor):
                     )
                 )
             elif event['require_user_input']:
+                if streamed:
+                    # Close the streamed artifact with the question asked
+                    event_queue.enqueue_event(
+                        TaskArtifactUpdateEvent(
+                            append=False,
+                            contextId=task.contextId,
+                            taskId=task.id,
+                            lastChunk=True,
+                            artifact=result_artifact(artifact_id, event['content']),
+                        )
+                    )
                 event_queue.enqueue_event(
                     TaskStatusUpdateEvent(
                         status=TaskStatus(
@@ -97,4 +200,31 @@ class AtlassianAgentExecutor(AgentExecutor):
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
     ) -> None:
-        raise Exception('cancel not supported')
+        """Stop a queued or running task and report it as canceled.
+
+        Cancelling the run unwinds the graph, aborts the LLM request and any
+        in-flight MCP tool calls (see ``mcp_pool``), and frees the task's
+        scheduler slot.
+        """
+        task_id = context.task_id or (context.current_task.id if context.current_task else None)
+        context_id = context.context_id or (context.current_task.contextId if context.current_task else None)
+        run = self._runs.get(task_id) if task_id else None
+        if run is None or run.done():
+            raise ServerError(error=TaskNotCancelableError())
+
+        run.cancel()
+        # Wait for the run to unwind, so its resources are released before the reply
+        await asyncio.gather(run, return_exceptions=True)
+        A2A_CANCELLED.inc()
+        logger.info(f"Cancelled task {task_id}")
+        event_queue.enqueue_event(
+            TaskStatusUpdateEvent(
+                status=TaskStatus(
+                    state=TaskState.canceled,
+                    message=new_agent_text_message('Task cancelled.', context_id, task_id),
+                ),
+                final=True,
+                contextId=context_id,
+                taskId=task_id,
+            )
+        )
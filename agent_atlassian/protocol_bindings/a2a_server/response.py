@@ -0,0 +1,83 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Final response of an A2A turn: its text and its task status.
+
+The status (completed, input required or error) is filled in by an extra
+structured-response LLM call after the ReAct loop (the default), or, with
+``ATLASSIAN_STRUCTURED_RESPONSE=infer``, classified locally from the text
+of the final answer by :func:`infer_response`. An answer that reports no
+results ("I couldn't find any issues matching ...") is a completed answer,
+not an error.
+
+Configuration (environment variables):
+    ATLASSIAN_STRUCTURED_RESPONSE: "llm" (default) or "infer"
+"""
+
+import os
+import re
+from typing import Any, List, Literal
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+
+def message_text(message: AIMessage) -> str:
+    """Return the text of a message whose content is a string or a list of content blocks."""
+    if isinstance(message.content, str):
+        return message.content
+    return ''.join(
+        block.get('text', '') if isinstance(block, dict) else str(block)
+        for block in message.content
+        if not isinstance(block, dict) or block.get('type') == 'text'
+    )
+
+
+class ResponseFormat(BaseModel):
+    """Respond to the user in this format."""
+
+    status: Literal['input_required', 'completed', 'error'] = 'input_required'
+    message: str
+
+
+# Replies asking the user for something: a closing question, or a request for details
+INPUT_REQUIRED_PATTERN = re.compile(
+    r"\?\s*$|\b(?:please|could you|can you|would you)\s+(?:provide|specify|confirm|clarify|share|tell me)\b",
+    re.IGNORECASE,
+)
+# Replies reporting a failure. "find" is left out on purpose: not finding
+# anything is a valid answer to a search.
+ERROR_PATTERN = re.compile(
+    r"^error\b|\b(?:i (?:encountered|ran into|hit) an? error|an error occurred|"
+    r"(?:failed|unable) to (?:retrieve|fetch|access|connect|authenticate|complete|create|update)|"
+    r"(?:couldn't|could not) (?:retrieve|fetch|access|connect|authenticate|complete|create|update))\b",
+    re.IGNORECASE,
+)
+
+
+def structured_response_mode() -> str:
+    """'llm' (default) asks the model for a ResponseFormat; 'infer' classifies the final answer locally."""
+    mode = os.getenv("ATLASSIAN_STRUCTURED_RESPONSE", "llm").lower()
+    return mode if mode in ("infer", "llm") else "llm"
+
+
+def infer_response(messages: List[Any]) -> ResponseFormat | None:
+    """Build the ResponseFormat for a finished ReAct loop from its last message, without an LLM call.
+
+    Returns None if the loop did not end with an answer.
+    """
+    if not messages:
+        return None
+    last = messages[-1]
+    if not isinstance(last, AIMessage) or last.tool_calls:
+        return None
+    text = message_text(last).strip()
+    if not text:
+        return None
+    if ERROR_PATTERN.search(text[:300]):
+        status = 'error'
+    elif INPUT_REQUIRED_PATTERN.search(text[-300:]):
+        status = 'input_required'
+    else:
+        status = 'completed'
+    return ResponseFormat(status=status, message=text)
@@ -0,0 +1,225 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Admission control for A2A task execution.
+
+All requests share one agent, one checkpointer and one LLM quota. The
+scheduler decides when each request runs:
+
+- Requests on the same ``contextId`` run one at a time, in arrival order,
+  so two messages of a conversation never race on its checkpoint.
+- At most ``ATLASSIAN_A2A_MAX_CONCURRENCY`` requests run at once; the rest
+  wait for a slot.
+- A request is rejected with :class:`SchedulerBusy` when
+  ``ATLASSIAN_A2A_MAX_QUEUE`` requests are already waiting, or when it has
+  waited ``ATLASSIAN_A2A_QUEUE_TIMEOUT`` seconds. Clients should retry it
+  later.
+- Each request gets a deadline, ``ATLASSIAN_A2A_REQUEST_TIMEOUT`` seconds
+  after it arrives (shorter if the client asks for it), which its queue
+  wait counts against. The agent answers with what it has when the
+  deadline comes close (see ``mcp_atlassian.deadline``).
+
+Configuration (environment variables):
+    ATLASSIAN_A2A_MAX_CONCURRENCY: Requests executed at once (default: 8)
+    ATLASSIAN_A2A_MAX_QUEUE: Requests waiting before new ones are rejected, 0 for no limit (default: 100)
+    ATLASSIAN_A2A_QUEUE_TIMEOUT: Seconds a request may wait before it is rejected, 0 for no limit (default: 60)
+    ATLASSIAN_A2A_REQUEST_TIMEOUT: Seconds from arrival by which a request is answered, 0 for no limit (default: 300)
+
+Example:
+    deadline = scheduler.deadline_for(requested_timeout)
+    async with scheduler.slot(task.contextId, deadline):
+        async for event in agent.stream(query, task.contextId, deadline):
+            ...
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+A2A_RUNNING = gauge(
+    "atlassian_a2a_running_requests",
+    "A2A requests currently executing",
+)
+A2A_QUEUED = gauge(
+    "atlassian_a2a_queued_requests",
+    "A2A requests waiting for their session or an execution slot",
+)
+A2A_QUEUE_WAIT_SECONDS = histogram(
+    "atlassian_a2a_queue_wait_seconds",
+    "Time A2A requests waited before executing",
+    (),
+    (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+A2A_REJECTED = counter(
+    "atlassian_a2a_rejected_requests_total",
+    "A2A requests rejected by reason (queue_full or queue_timeout)",
+    ("reason",),
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class SchedulerBusy(Exception):
+    """Raised when a request is not admitted; it can be retried after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, reason: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ExecutionScheduler:
+    """Global concurrency limit with per-session FIFO ordering and a bounded queue.
+
+    Args:
+        max_concurrency: Requests executed at once
+        max_queue: Requests waiting before new ones are rejected (0 for no limit)
+        queue_timeout: Seconds a request may wait before it is rejected (0 for no limit)
+        request_timeout: Seconds from arrival by which a request is answered (0 for no limit)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_queue: int = 100,
+        queue_timeout: float = 60.0,
+        request_timeout: float = 300.0,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.request_timeout = request_timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        # contextId -> (lock, requests holding or waiting for it)
+        self._sessions: Dict[str, list] = {}
+        self._running = 0
+        self._queued = 0
+
+    @classmethod
+    def from_env(cls) -> "ExecutionScheduler":
+        return cls(
+            max_concurrency=_env_int("ATLASSIAN_A2A_MAX_CONCURRENCY", 8),
+            max_queue=_env_int("ATLASSIAN_A2A_MAX_QUEUE", 100),
+            queue_timeout=float(_env_int("ATLASSIAN_A2A_QUEUE_TIMEOUT", 60)),
+            request_timeout=float(_env_int("ATLASSIAN_A2A_REQUEST_TIMEOUT", 300)),
+        )
+
+    def deadline_for(self, requested: Any = None) -> Optional[float]:
+        """Return the deadline (epoch seconds) of a request arriving now, or None for no limit.
+
+        A client may ask for a shorter timeout than ``request_timeout``, in seconds.
+        """
+        timeout = self.request_timeout
+        try:
+            requested = float(requested) if requested is not None else 0.0
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring invalid request timeout: {requested!r}")
+            requested = 0.0
+        if requested > 0:
+            timeout = min(timeout, requested) if timeout > 0 else requested
+        return time.time() + timeout if timeout > 0 else None
+
+    def _retry_after(self) -> float:
+        # Rough time for the queue ahead to drain, at a few seconds per request
+        return float(min(60, 5 * (1 + self._queued // self.max_concurrency)))
+
+    def _update_gauges(self) -> None:
+        A2A_RUNNING.set(self._running)
+        A2A_QUEUED.set(self._queued)
+
+    async def _acquire(self, session: list) -> None:
+        # Session first: a request waits behind earlier messages of its
+        # conversation without holding a global slot
+        await session[0].acquire()
+        try:
+            await self._slots.acquire()  # type: ignore[union-attr]
+        except BaseException:
+            session[0].release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, context_id: str, deadline: Optional[float] = None) -> AsyncIterator[None]:
+        """Wait for the turn of a request on ``context_id`` and hold an execution slot.
+
+        Raises:
+            SchedulerBusy: If the queue is full, or the wait exceeds the queue
+                timeout or reaches the request's ``deadline``
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        # A request that can start right away is never counted as queued
+        waits = context_id in self._sessions or self._slots.locked()
+        if waits and self.max_queue > 0 and self._queued >= self.max_queue:
+            A2A_REJECTED.inc(reason="queue_full")
+            raise SchedulerBusy(
+                f"Server busy: {self._queued} requests are already queued", "queue_full", self._retry_after()
+            )
+
+        session = self._sessions.setdefault(context_id, [asyncio.Lock(), 0])
+        session[1] += 1
+        if waits:
+            self._queued += 1
+            self._update_gauges()
+        started = time.monotonic()
+        admitted = False
+        timeout = self.queue_timeout if self.queue_timeout > 0 else None
+        until_deadline = deadline - time.time() if deadline is not None else None
+        limit = f"within {self.queue_timeout:g} seconds"
+        if until_deadline is not None and (timeout is None or until_deadline < timeout):
+            timeout = max(0.0, until_deadline)
+            limit = "before the request deadline"
+        try:
+            try:
+                if timeout is not None:
+                    await asyncio.wait_for(self._acquire(session), timeout)
+                else:
+                    await self._acquire(session)
+            except asyncio.TimeoutError:
+                A2A_REJECTED.inc(reason="queue_timeout")
+                raise SchedulerBusy(
+                    f"Server busy: no execution slot {limit}",
+                    "queue_timeout",
+                    self._retry_after(),
+                ) from None
+            finally:
+                if waits:
+                    self._queued -= 1
+                waited = time.monotonic() - started
+
+            admitted = True
+            self._running += 1
+            self._update_gauges()
+            A2A_QUEUE_WAIT_SECONDS.observe(waited)
+            if waited > 1.0:
+                logger.info(f"Request on context {context_id} waited {waited:.1f}s for execution")
+            yield
+        finally:
+            if admitted:
+                self._running -= 1
+                self._slots.release()  # type: ignore[union-attr]
+                session[0].release()
+            session[1] -= 1
+            if session[1] == 0:
+                self._sessions.pop(context_id, None)
+            self._update_gauges()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "sessions": len(self._sessions),
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
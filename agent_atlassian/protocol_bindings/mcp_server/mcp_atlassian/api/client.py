@@ -4,12 +4,45 @@ This module provides a client for interacting with the Atlassian API.
 It handles authentication, request formatting, and response parsing.
 """
 
+import asyncio
+import functools
+import importlib.util
 import os
 import logging
-from typing import Optional, Dict, Tuple, Any
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from collections import deque
+from urllib.parse import urlparse
 import httpx
 from dotenv import load_dotenv
 
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.httpcache import (
+    HTTP_CACHE_REQUESTS,
+    CachedResponse,
+    ConditionalCache,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.pagination import (
+    PageRequest,
+    next_page,
+    offset_params,
+    page_items,
+    remaining_pages,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.ratelimit import RateLimitScheduler, SiteRateLimiter
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.retry import RETRIES, RETRY_OUTCOMES, RetryPolicy
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.singleflight import SingleFlight, request_key
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.store import PersistentStore, persistent_ttl
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.deadline import (
+    DEADLINES_EXCEEDED,
+    DeadlineExceeded,
+    time_budget,
+    within_deadline,
+    without_deadline,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.exceptions import MCPAtlassianAPIError
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import DEFAULT_SIZE_BUCKETS, counter, histogram
+
 # Load environment variables
 load_dotenv()
 
@@ -18,13 +51,306 @@ load_dotenv()
 
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-)
 logger = logging.getLogger("atlassian_mcp")
 
+API_REQUEST_DURATION = histogram(
+    "atlassian_api_request_duration_seconds",
+    "Atlassian API request latency in seconds, including retries and rate limit waits",
+    ("method", "endpoint"),
+)
+API_RESPONSE_BYTES = histogram(
+    "atlassian_api_response_bytes",
+    "Size of Atlassian API response bodies in bytes",
+    ("method", "endpoint"),
+    DEFAULT_SIZE_BUCKETS,
+)
+API_RESPONSES = counter(
+    "atlassian_api_responses_total",
+    "Atlassian API responses by method, endpoint and status code ('error' when no response was received)",
+    ("method", "endpoint", "status"),
+)
+
+# Path segments replaced by placeholders so that metrics are labelled by
+# endpoint rather than by individual issue, page or user
+_ENDPOINT_PLACEHOLDERS = (
+    (re.compile(r"^[A-Z][A-Z0-9_]*-\d+$"), "{key}"),
+    (re.compile(r"^\d+$"), "{id}"),
+    (re.compile(r"^(\d+:)?[0-9a-fA-F]{8,}(-[0-9a-fA-F]+)*$"), "{id}"),
+)
+
+
+def endpoint_template(path: str) -> str:
+    """Normalise an API path into its endpoint template.
+
+    Example:
+        endpoint_template("rest/api/2/issue/PROJ-123/comment") == "rest/api/2/issue/{key}/comment"
+    """
+    segments: List[str] = []
+    for segment in path.split("?", 1)[0].strip("/").split("/"):
+        # Keep the API version (rest/api/2/...)
+        if segments and segments[-1] == "api":
+            segments.append(segment)
+            continue
+        for pattern, placeholder in _ENDPOINT_PLACEHOLDERS:
+            if pattern.match(segment):
+                segment = placeholder
+                break
+        segments.append(segment)
+    return "/".join(segments)
+
+# Process-wide HTTP client shared by every Jira/Confluence tool. It is opened
+# by the MCP server lifespan and closed on shutdown; ``get_http_client`` also
+# creates it lazily so tools keep working when called outside the server.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid integer for {name}: {value!r}, using {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back to default."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Invalid number for {name}: {value!r}, using {default}")
+        return default
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("true", "1", "yes", "y", "on")
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client from environment settings.
+
+    Environment variables:
+        ATLASSIAN_HTTP_MAX_CONNECTIONS: Maximum open connections (default: 20)
+        ATLASSIAN_HTTP_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept alive (default: 10)
+        ATLASSIAN_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default: 30)
+        ATLASSIAN_HTTP2: Enable HTTP/2 when the ``h2`` package is installed (default: false)
+    """
+    limits = httpx.Limits(
+        max_connections=_env_int("ATLASSIAN_HTTP_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_env_int("ATLASSIAN_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10),
+        keepalive_expiry=_env_float("ATLASSIAN_HTTP_KEEPALIVE_EXPIRY", 30.0),
+    )
+
+    http2 = _env_bool("ATLASSIAN_HTTP2")
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("ATLASSIAN_HTTP2 is enabled but the 'h2' package is not installed, using HTTP/1.1")
+        http2 = False
+
+    logger.debug(f"Creating shared HTTP client (limits={limits}, http2={http2})")
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=30)
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the shared HTTP client for the running event loop.
+
+    Returns:
+        The shared ``httpx.AsyncClient`` instance
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_client is not None and not _http_client.is_closed:
+        if _http_client_loop is loop:
+            return _http_client
+        # Connections are bound to the loop that opened them, so a client
+        # created on another (possibly closed) loop cannot be reused here.
+        logger.debug("Shared HTTP client belongs to another event loop, recreating it")
+        _http_client = None
+
+    _http_client = _build_http_client()
+    _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _http_client, _http_client_loop
+
+    client = _http_client
+    _http_client = None
+    _http_client_loop = None
+    if client is not None and not client.is_closed:
+        logger.debug("Closing shared HTTP client")
+        await client.aclose()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, opening it on first use."""
+    return await open_http_client()
+
+
+_rate_limiter: Optional[RateLimitScheduler] = None
+
+
+def get_rate_limiter() -> RateLimitScheduler:
+    """Return the process-wide rate limit scheduler.
+
+    Environment variables:
+        ATLASSIAN_RATE_LIMIT_RPS: Requests per second allowed per site, 0 to disable (default: 10)
+        ATLASSIAN_RATE_LIMIT_BURST: Requests that may be sent back-to-back (default: 20)
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimitScheduler(
+            rate=_env_float("ATLASSIAN_RATE_LIMIT_RPS", 10.0),
+            burst=_env_int("ATLASSIAN_RATE_LIMIT_BURST", 20),
+        )
+    return _rate_limiter
+
+
+def get_rate_limit_state() -> Dict[str, Dict[str, Any]]:
+    """Return the current budget and back-off state for every known site."""
+    return get_rate_limiter().state()
+
+
+_retry_policy: Optional[RetryPolicy] = None
+# Identical in-flight GET requests share one upstream call
+_inflight = SingleFlight()
+_response_cache: Optional[ConditionalCache] = None
+
+
+def get_response_cache() -> ConditionalCache:
+    """Return the process-wide conditional-request cache.
+
+    Environment variables:
+        ATLASSIAN_HTTP_CACHE_MAX_BYTES: Total size of cached response bodies,
+            0 disables the cache (default: 33554432, i.e. 32 MiB)
+    """
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ConditionalCache(_env_int("ATLASSIAN_HTTP_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    return _response_cache
+
+
+_persistent_store: Optional[PersistentStore] = None
+_persistent_store_failed = False
+
+
+def get_persistent_store() -> Optional[PersistentStore]:
+    """Return the on-disk response store, or None if it is not configured.
+
+    Environment variables:
+        ATLASSIAN_CACHE_DB: Path of the SQLite database; unset disables the store
+        ATLASSIAN_CACHE_DB_MAX_AGE: Seconds after which stored responses are purged (default: 604800)
+    """
+    global _persistent_store, _persistent_store_failed
+    if _persistent_store is None and not _persistent_store_failed:
+        path = os.getenv("ATLASSIAN_CACHE_DB")
+        if not path:
+            return None
+        try:
+            _persistent_store = PersistentStore(
+                os.path.expanduser(path),
+                max_age=_env_float("ATLASSIAN_CACHE_DB_MAX_AGE", 7 * 86400.0),
+            )
+            logger.info(f"Using persistent response cache at {path}")
+        except Exception as e:
+            logger.warning(f"Could not open persistent response cache at {path}: {e}")
+            _persistent_store_failed = True
+    return _persistent_store
+
+
+async def _load_cached(cache_key: Tuple[str, ...]) -> Optional[CachedResponse]:
+    """Look up a cached response in memory, then in the persistent store.
+
+    Only an entry read from the persistent store may still be within its
+    TTL; the copy kept in memory is re-validated on every use.
+    """
+    cache = get_response_cache()
+    cached = cache.get(cache_key)
+    if cached is None:
+        store = get_persistent_store()
+        if store is not None:
+            cached = await asyncio.to_thread(store.get, cache_key)
+            if cached is not None and cached.can_revalidate:
+                cache.put(cache_key, cached.revalidated_only())
+    return cached
+
+
+async def _store_cached(cache_key: Tuple[str, ...], entry: CachedResponse, persist: bool) -> None:
+    """Save a response in memory and, for persistable endpoints, on disk with its TTL."""
+    if entry.can_revalidate:
+        get_response_cache().put(cache_key, entry.revalidated_only())
+    store = get_persistent_store()
+    if persist and store is not None:
+        await asyncio.to_thread(store.put, cache_key, entry)
+
+
+async def _invalidate_cached(url: str) -> None:
+    """Evict cached GET responses of a resource after a request that may have changed it."""
+    evicted = get_response_cache().discard_resource(url)
+    if evicted:
+        logger.debug(f"Evicted {evicted} cached responses after a write to {url}")
+    store = get_persistent_store()
+    if store is not None:
+        await asyncio.to_thread(store.discard_resource, url)
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy.
+
+    Environment variables:
+        ATLASSIAN_RETRY_MAX_ATTEMPTS: Total attempts per request, 1 disables retries (default: 3)
+        ATLASSIAN_RETRY_BASE_DELAY: Backoff before the first retry in seconds (default: 0.2)
+        ATLASSIAN_RETRY_MAX_DELAY: Maximum backoff between attempts in seconds (default: 5)
+    """
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy(
+            max_attempts=max(_env_int("ATLASSIAN_RETRY_MAX_ATTEMPTS", 3), 1),
+            base_delay=_env_float("ATLASSIAN_RETRY_BASE_DELAY", 0.2),
+            max_delay=_env_float("ATLASSIAN_RETRY_MAX_DELAY", 5.0),
+        )
+    return _retry_policy
+
+
+async def _send_request(
+    client: httpx.AsyncClient,
+    limiter: SiteRateLimiter,
+    method: str,
+    url: str,
+    path: str,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request through the site's rate limiter.
+
+    429 responses are queued behind the site's back-off and re-sent instead
+    of being surfaced to the caller as failures, unless the back-off would
+    outlast the request deadline.
+    """
+    max_throttle_retries = _env_int("ATLASSIAN_RATE_LIMIT_MAX_RETRIES", 5)
+    max_wait = _env_float("ATLASSIAN_RATE_LIMIT_MAX_WAIT", 60.0)
+
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        response = await client.request(method, url, **kwargs)
+        backoff = limiter.observe(response.status_code, response.headers)
+        if backoff is None or attempt >= max_throttle_retries or backoff > max_wait or not within_deadline(backoff):
+            return response
+        attempt += 1
+        logger.info(f"Request to {path} throttled (429), re-queued (attempt {attempt}/{max_throttle_retries})")
 
 
 def get_env() -> Optional[str]:
@@ -34,6 +360,164 @@ def get_env() -> Optional[str]:
         logger.warning("ATLASSIAN_TOKEN is not set in environment variables.")
     return token
 
+async def _send_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    path: str,
+    idempotency_key: Optional[str] = None,
+    **request_kwargs: Any,
+) -> httpx.Response:
+    """Send a request, retrying transient failures according to the retry policy.
+
+    Each attempt's timeout is capped by the time left before the request
+    deadline, and no retry is made whose back-off would outlast it.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes before an attempt is sent
+    """
+    limiter = get_rate_limiter().for_site(urlparse(url).netloc)
+    policy = get_retry_policy()
+    timeout = request_kwargs.pop("timeout", None)
+
+    attempt = 1
+    while True:
+        error: Optional[httpx.RequestError] = None
+        try:
+            response = await _send_request(
+                client, limiter, method, url, path, timeout=time_budget(timeout), **request_kwargs
+            )
+        except httpx.RequestError as e:
+            if attempt >= policy.max_attempts or not policy.should_retry_error(method, e, idempotency_key):
+                if attempt > 1:
+                    RETRY_OUTCOMES.inc(method=method, outcome="exhausted")
+                raise
+            error = e
+            reason = type(e).__name__
+        else:
+            if attempt >= policy.max_attempts or not policy.should_retry_status(
+                method, response.status_code, idempotency_key
+            ):
+                break
+            reason = str(response.status_code)
+
+        delay = policy.backoff(attempt)
+        if not within_deadline(delay):
+            logger.warning(f"Not retrying {method} {path} after {reason}: the request deadline is too close")
+            if error is not None:
+                RETRY_OUTCOMES.inc(method=method, outcome="exhausted")
+                raise error
+            break
+        RETRIES.inc(method=method, endpoint=endpoint_template(path), reason=reason)
+        logger.warning(f"Retrying {method} {path} after {reason} in {delay:.2f}s (attempt {attempt + 1}/{policy.max_attempts})")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    if attempt > 1:
+        outcome = "exhausted" if response.status_code in policy.retry_statuses else "recovered"
+        RETRY_OUTCOMES.inc(method=method, outcome=outcome)
+    return response
+
+
+async def _execute_request(
+    method: str,
+    url: str,
+    path: str,
+    headers: Dict[str, str],
+    params: Dict[str, Any],
+    data: Dict[str, Any],
+    timeout: int,
+    idempotency_key: Optional[str],
+    cache_key: Optional[Tuple[str, ...]] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """Send a prepared request and decode the response into (success, data).
+
+    When ``cache_key`` is given, a cached response that is still within its
+    TTL is returned without a request; otherwise it is re-validated and
+    returned unchanged if the server answers 304 Not Modified.
+    """
+    endpoint = endpoint_template(path)
+    cached = await _load_cached(cache_key) if cache_key is not None else None
+    # TTLs only apply to the persistent tier; in memory, entries are re-validated
+    ttl = persistent_ttl(path) if get_persistent_store() is not None else None
+    if cached is not None:
+        if cached.is_fresh():
+            logger.debug("Serving cached response within its TTL")
+            HTTP_CACHE_REQUESTS.inc(endpoint=endpoint, result="fresh")
+            return (True, cached.data)
+        headers = {**headers, **cached.conditional_headers()}
+
+    try:
+        client = await get_http_client()
+        logger.debug(f"Full request URL: {url}")
+
+        started = time.perf_counter()
+        try:
+            response = await _send_with_retries(
+                client,
+                method,
+                url,
+                path,
+                idempotency_key=idempotency_key,
+                headers=headers,
+                params=params,
+                json=data if method in ["POST", "PUT", "PATCH"] else None,
+                timeout=timeout,
+            )
+        except (httpx.RequestError, DeadlineExceeded):
+            API_RESPONSES.inc(method=method, endpoint=endpoint, status="error")
+            raise
+        finally:
+            API_REQUEST_DURATION.observe(time.perf_counter() - started, method=method, endpoint=endpoint)
+        API_RESPONSES.inc(method=method, endpoint=endpoint, status=str(response.status_code))
+        API_RESPONSE_BYTES.observe(len(response.content), method=method, endpoint=endpoint)
+
+        logger.debug(f"Response status code: {response.status_code}")
+
+        if cached is not None and response.status_code == 304:
+            logger.debug("Response not modified, serving cached body")
+            HTTP_CACHE_REQUESTS.inc(endpoint=endpoint, result="hit")
+            await _store_cached(cache_key, cached.refreshed(ttl), persist=ttl is not None)
+            return (True, cached.data)
+
+        if response.status_code in [200, 201, 202, 204]:
+            if response.status_code == 204:
+                logger.debug("Request successful (204 No Content)")
+                return (True, {"status": "success"})
+            try:
+                body = response.json()
+            except ValueError:
+                logger.warning("Request successful but could not parse JSON response")
+                return (True, {"status": "success", "raw_response": response.text})
+            if cache_key is not None and (get_response_cache().enabled or get_persistent_store() is not None):
+                HTTP_CACHE_REQUESTS.inc(endpoint=endpoint, result="stale" if cached is not None else "miss")
+                entry = CachedResponse.from_response(body, len(response.content), response.headers, ttl)
+                if entry is not None:
+                    await _store_cached(cache_key, entry, persist=ttl is not None)
+                elif cached is not None:
+                    get_response_cache().discard(cache_key)
+            return (True, body)
+        else:
+            error_message = f"API request failed: {response.status_code}"
+            try:
+                error_data = response.json()
+                logger.error(f"Error details: {error_data}")
+                return (False, {"error": error_message, "details": error_data})
+            except ValueError:
+                logger.error(f"Error response (not JSON): {response.text[:200]}")
+                return (False, {"error": f"{error_message} - {response.text[:200]}"})
+
+    except httpx.RequestError as e:
+        logger.error(f"Request error: {str(e)}")
+        return (False, {"error": f"Request error: {str(e)}"})
+    except DeadlineExceeded as e:
+        logger.warning(f"{method} {path} not sent: {e}")
+        return (False, {"error": str(e)})
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        return (False, {"error": f"Unexpected error: {str(e)}"})
+
+
 async def make_api_request(
     path: str,
     method: str = "GET",
@@ -41,17 +525,27 @@ async def make_api_request(
     params: Dict[str, Any] = {},
     data: Dict[str, Any] = {},
     timeout: int = 30,
+    idempotency_key: Optional[str] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     """
     Make a request to the Atlassian API
 
+    Identical GET requests (same path, parameters and credentials) that are
+    already in flight share a single upstream request and decoded result, and
+    GET responses with an ETag/Last-Modified validator are cached and
+    re-validated. Callers must treat the returned data as read-only.
+
     Args:
         path: API path to request (without base URL)
         method: HTTP method (default: GET)
         token: API token (defaults to environment variable)
         params: Query parameters for the request (optional)
         data: JSON data for POST/PATCH/PUT requests (optional)
-        timeout: Request timeout in seconds (default: 30)
+        timeout: Request timeout in seconds, capped by the request deadline if any (default: 30)
+        idempotency_key: Key identifying this logical request. POST/PATCH requests
+            are only retried on transient failures when a key is given, so pass one
+            only to endpoints that deduplicate on it; Jira and Confluence Cloud do
+            not (optional)
 
     Returns:
         Tuple of (success, data) where data is either the response JSON or an error dict
@@ -78,69 +572,206 @@ async def make_api_request(
         "Authorization": f"Basic {encoded_auth}",
         "Accept": "application/json"
     }
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
 
 
-    logger.debug(f"Request headers: {headers}")
+    logger.debug(f"Request headers: {{**headers, 'Authorization': '[redacted]'}}")
     logger.debug(f"Request parameters: {params}")
     if data:
         logger.debug(f"Request data: {data}")
 
+    method = method.upper()
+    if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+        logger.error(f"Unsupported HTTP method: {method}")
+        return (False, {"error": f"Unsupported method: {method}"})
+
+    url = f"{url}/{path}"
+    if method != "GET":
+        try:
+            return await _execute_request(method, url, path, headers, params, data, timeout, idempotency_key)
+        finally:
+            # Also after a failure: the write may have been applied anyway
+            await _invalidate_cached(url)
+
+    key = request_key(method, url, params, headers["Authorization"])
+    execute = functools.partial(
+        _execute_request, method, url, path, headers, params, data, timeout, idempotency_key, key
+    )
+    if _env_bool("ATLASSIAN_SINGLE_FLIGHT", True):
+        # The shared request runs without any one caller's deadline; each
+        # caller waits for it only within its own
+        try:
+            return await _inflight.do(key, execute, timeout=time_budget(None), context=without_deadline())
+        except DeadlineExceeded as e:
+            logger.warning(f"{method} {path} not sent: {e}")
+            return (False, {"error": str(e)})
+        except asyncio.TimeoutError:
+            DEADLINES_EXCEEDED.inc(where="http")
+            logger.warning(f"Request deadline exceeded while waiting for {method} {path}")
+            return (False, {"error": f"Request deadline exceeded while waiting for {path}"})
+    return await execute()
+
+
+async def paginate(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    items_key: Optional[str] = None,
+    max_items: Optional[int] = None,
+    page_size: Optional[int] = None,
+    prefetch: Optional[int] = None,
+    fanout: Optional[int] = None,
+    token: Optional[str] = None,
+    timeout: int = 30,
+) -> AsyncIterator[Any]:
+    """
+    Iterate lazily over the items of a paginated Atlassian endpoint
+
+    Offset (``startAt``/``start``), ``isLast``, ``_links.next`` and
+    ``nextPageToken`` pagination are all recognised from the responses. Pages
+    are fetched by a background task that stays at most ``prefetch`` pages
+    ahead of the consumer; it is cancelled when the iteration stops early.
+
+    When the first page of an offset endpoint reports ``total``, the remaining
+    pages are requested concurrently, at most ``fanout`` at a time, and handed
+    to the consumer in order. A page that comes back shorter than requested
+    has the rest of its range fetched before the next page is handed over.
+
+    Example:
+        async for issue in paginate("rest/api/2/search", {"jql": jql}, max_items=500):
+            ...
+
+    Args:
+        path: API path to request (without base URL)
+        params: Query parameters of the first page; an offset in them is honoured,
+            the page size is replaced by ``page_size`` (optional)
+        items_key: Response key holding the items; detected when omitted (optional)
+        max_items: Stop after this many items (optional, default: no limit)
+        page_size: Items requested per page (default: ATLASSIAN_PAGE_SIZE or 50)
+        prefetch: Pages fetched ahead of the consumer (default: ATLASSIAN_PAGE_PREFETCH or 2)
+        fanout: Concurrent page requests once the total is known
+            (default: ATLASSIAN_PAGINATION_FANOUT or 8; 1 fetches pages one at a time)
+        token: API token (defaults to environment variable)
+        timeout: Request timeout in seconds (default: 30)
+
+    Yields:
+        Items of every page, in order
+
+    Raises:
+        MCPAtlassianAPIError: If a page request fails
+    """
+    page_size = page_size or _env_int("ATLASSIAN_PAGE_SIZE", 50)
+    prefetch = max(1, prefetch or _env_int("ATLASSIAN_PAGE_PREFETCH", 2))
+    fanout = max(1, fanout or _env_int("ATLASSIAN_PAGINATION_FANOUT", 8))
+    size_key = offset_params(path)[1]
+    if max_items is not None:
+        page_size = min(page_size, max_items)
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    params[size_key] = page_size
+
+    pages: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=prefetch)
+    done = object()
+
+    async def fetch_page(request: PageRequest) -> Tuple[Any, List[Any]]:
+        success, data = await make_api_request(
+            request.path, params=request.params, token=token, timeout=timeout
+        )
+        if not success:
+            raise MCPAtlassianAPIError(f"Failed to fetch page of {request.path}: {data}", data)
+        return data, page_items(data, items_key)
+
+    async def release(request: PageRequest, task: "asyncio.Task[Tuple[Any, List[Any]]]") -> None:
+        items = (await task)[1]
+        await pages.put(items)
+        # A page shorter than requested would leave a hole before the next
+        # one; fetch the rest of its range until it is filled or runs dry
+        offset_key, size_key = offset_params(request.path)
+        offset, missing = request.params[offset_key] + len(items), request.params[size_key] - len(items)
+        while items and missing > 0:
+            _, items = await fetch_page(
+                PageRequest(request.path, {**request.params, offset_key: offset, size_key: missing})
+            )
+            await pages.put(items)
+            offset, missing = offset + len(items), missing - len(items)
+
+    async def fetch_concurrently(requests: List[PageRequest]) -> None:
+        # Keep at most ``fanout`` requests in flight and release pages in order
+        in_flight: "deque[Tuple[PageRequest, asyncio.Task[Tuple[Any, List[Any]]]]]" = deque()
+        try:
+            for request in requests:
+                in_flight.append((request, asyncio.create_task(fetch_page(request))))
+                if len(in_flight) >= fanout:
+                    await release(*in_flight.popleft())
+            while in_flight:
+                await release(*in_flight.popleft())
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+
+    async def fetch_pages() -> None:
+        request: Optional[PageRequest] = PageRequest(path, params)
+        fetched = 0
+        try:
+            while request is not None:
+                data, items = await fetch_page(request)
+                await pages.put(items)
+                fetched += len(items)
+                if max_items is not None and fetched >= max_items:
+                    break
+                remaining = remaining_pages(
+                    request, data, items, None if max_items is None else max_items - fetched + len(items)
+                ) if fanout > 1 else None
+                if remaining:
+                    logger.debug(f"Fetching {len(remaining)} more pages of {path}, {fanout} at a time")
+                    await fetch_concurrently(remaining)
+                    break
+                request = next_page(request, data, items)
+            await pages.put(done)
+        except Exception as e:
+            await pages.put(e)
+
+    producer = asyncio.create_task(fetch_pages())
+    yielded = 0
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            url = f"{url}/{path}"
-            logger.debug(f"Full request URL: {url}")
-
-            method_map = {
-                "GET": client.get,
-                "POST": client.post,
-                "PUT": client.put,
-                "PATCH": client.patch,
-                "DELETE": client.delete,
-            }
-
-            if method not in method_map:
-                logger.error(f"Unsupported HTTP method: {method}")
-                return (False, {"error": f"Unsupported method: {method}"})
-
-            if method in ["POST", "PUT", "PATCH"]:
-                response = await method_map[method](
-                    url,
-                    headers=headers,
-                    params=params,
-                    json=data
-                )
-            else:
-                response = await method_map[method](
-                    url,
-                    headers=headers,
-                    params=params
-                )
-
-
-            logger.debug(f"Response status code: {response.status_code}")
-
-            if response.status_code in [200, 201, 202, 204]:
-                if response.status_code == 204:
-                    logger.debug("Request successful (204 No Content)")
-                    return (True, {"status": "success"})
-                try:
-                    return (True, response.json())
-                except ValueError:
-                    logger.warning("Request successful but could not parse JSON response")
-                    return (True, {"status": "success", "raw_response": response.text})
-            else:
-                error_message = f"API request failed: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    logger.error(f"Error details: {error_data}")
-                    return (False, {"error": error_message, "details": error_data})
-                except ValueError:
-                    logger.error(f"Error response (not JSON): {response.text[:200]}")
-                    return (False, {"error": f"{error_message} - {response.text[:200]}"})
+        while True:
+            page = await pages.get()
+            if page is done:
+                return
+            if isinstance(page, Exception):
+                raise page
+            for item in page:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+    finally:
+        producer.cancel()
 
-    except httpx.RequestError as e:
-        logger.error(f"Request error: {str(e)}")
-        return (False, {"error": f"Request error: {str(e)}"})
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        return (False, {"error": f"Unexpected error: {str(e)}"})
\ No newline at end of file
+
+async def fetch_all(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    items_key: Optional[str] = None,
+    max_items: Optional[int] = None,
+    **kwargs: Any,
+) -> Tuple[bool, Any]:
+    """
+    Collect the items of a paginated endpoint, up to ``max_items``
+
+    Args:
+        path: API path to request (without base URL)
+        params: Query parameters of the first page (optional)
+        items_key: Response key holding the items; detected when omitted (optional)
+        max_items: Maximum number of items to return (optional)
+        **kwargs: Passed on to :func:`paginate`
+
+    Returns:
+        Tuple of (success, data) where data is either the list of items or an error dict
+    """
+    items: List[Any] = []
+    try:
+        async for item in paginate(path, params, items_key=items_key, max_items=max_items, **kwargs):
+            items.append(item)
+    except MCPAtlassianAPIError as e:
+        return (False, e.error)
+    return (True, items)
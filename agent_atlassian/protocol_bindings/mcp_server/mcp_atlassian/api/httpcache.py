@@ -0,0 +1,194 @@
+"""Conditional-request response cache for the Atlassian API client
+
+Successful GET responses that carry an ``ETag`` or ``Last-Modified``
+validator are kept together with their decoded body. The next identical
+request is re-validated with ``If-None-Match``/``If-Modified-Since``; on a
+304 the cached body is returned as-is, without downloading or parsing it
+again.
+
+Entries are keyed by request key, which includes a fingerprint of the
+credential, so a response fetched with one user's permissions is never
+served to another. The cache is bounded by the size of the stored response
+bodies and evicts the least recently used entries first.
+
+Entries loaded from the persistent store (see ``api/store.py``) may carry
+a TTL; while it has not expired the body is served without contacting
+Atlassian at all. Entries kept in memory are always re-validated.
+
+Any non-GET request evicts the entries of the resource it wrote to (see
+:meth:`ConditionalCache.discard_resource`), so a read right after a write
+does not see the old body.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Hashable, List, Mapping, Optional
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+HTTP_CACHE_REQUESTS = counter(
+    "atlassian_http_cache_requests_total",
+    "Cacheable GET requests by endpoint and cache result (fresh, hit, stale, miss)",
+    ("endpoint", "result"),
+)
+
+
+def resource_urls(url: str) -> List[str]:
+    """Return ``url`` without its query and each of its parent resources.
+
+    A write to ``.../issue/PROJ-1/transitions`` changes ``.../issue/PROJ-1`` too.
+    """
+    url = url.split("?", 1)[0].rstrip("/")
+    urls = [url]
+    scheme_end = url.find("://") + 3
+    while url.rfind("/") > scheme_end:
+        url = url[: url.rfind("/")]
+        urls.append(url)
+    return urls
+
+
+def affected_by_write(entry_url: str, url: str) -> bool:
+    """Whether a cached GET of ``entry_url`` may be stale after a write to ``url``."""
+    urls = resource_urls(url)
+    return entry_url in urls or entry_url.startswith(urls[0] + "/")
+
+
+@dataclass
+class CachedResponse:
+    """A decoded response body and the validators needed to re-validate it."""
+
+    data: Any
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+    # Wall-clock time until which the body is served without re-validation;
+    # 0 means every use is re-validated.
+    expires_at: float = 0.0
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def revalidated_only(self) -> "CachedResponse":
+        """Return a copy of this entry without its TTL, re-validated on every use."""
+        return replace(self, expires_at=0.0)
+
+    def refreshed(self, ttl: Optional[float]) -> "CachedResponse":
+        """Return a copy of this entry re-validated now, valid for ``ttl`` more seconds."""
+        now = time.time()
+        return replace(self, stored_at=now, expires_at=now + ttl if ttl else 0.0)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @classmethod
+    def from_response(
+        cls, data: Any, size: int, headers: Mapping[str, str], ttl: Optional[float] = None
+    ) -> Optional["CachedResponse"]:
+        """Build an entry from a 200 response.
+
+        Args:
+            data: Decoded response body
+            size: Size of the raw body in bytes
+            headers: Response headers
+            ttl: Seconds the body may be served without re-validation (optional)
+
+        Returns:
+            The entry, or None if the response is neither re-validatable nor given a TTL
+        """
+        cache_control = headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return None
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified and not ttl:
+            return None
+        entry = cls(data=data, size=size, etag=etag, last_modified=last_modified)
+        return entry.refreshed(ttl)
+
+
+class ConditionalCache:
+    """Byte-bounded LRU store of :class:`CachedResponse` entries.
+
+    Args:
+        max_bytes: Total size of cached bodies before entries are evicted
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            self.discard(key)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.size
+            self._entries[key] = entry
+            self.current_bytes += entry.size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.size
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry.size
+
+    def discard_resource(self, url: str) -> int:
+        """Evict entries whose request URL is ``url``, below it or a parent of it.
+
+        Returns:
+            The number of entries evicted
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if isinstance(key, tuple) and len(key) > 1 and affected_by_write(str(key[1]), url)
+            ]
+            for key in keys:
+                self.current_bytes -= self._entries.pop(key).size
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,154 @@
+"""Pagination styles of the Atlassian REST APIs
+
+Atlassian endpoints page their results in one of four ways:
+
+- Offset with a total (Jira ``startAt``/``maxResults``/``total``,
+  Confluence ``start``/``limit``/``size``)
+- Offset with an ``isLast`` flag (Jira Agile boards and sprints)
+- A ``_links.next`` URL (Confluence content and CQL search)
+- An opaque ``nextPageToken`` (Jira enhanced JQL search)
+
+This module works out from a response which style is in use, where the
+items are, and how to request the next page. When an offset response
+reports its total, every remaining page request is known up front and can
+be fetched concurrently (see ``remaining_pages``). The iteration itself lives in
+``api/client.py`` (see ``paginate``).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+# Keys that hold the page items, in the order they are looked for
+ITEM_KEYS: Sequence[str] = ("issues", "values", "results", "comments", "worklogs")
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """Path and query parameters of a single page request."""
+
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def is_confluence(path: str) -> bool:
+    return path.lstrip("/").startswith("wiki/")
+
+
+def offset_params(path: str) -> Tuple[str, str]:
+    """Return the (offset, page size) parameter names used by an endpoint."""
+    return ("start", "limit") if is_confluence(path) else ("startAt", "maxResults")
+
+
+def page_items(data: Any, items_key: Optional[str] = None) -> List[Any]:
+    """Return the list of items in a page response."""
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    if items_key:
+        return data.get(items_key) or []
+    for key in ITEM_KEYS:
+        if isinstance(data.get(key), list):
+            return data[key]
+    return []
+
+
+def page_total(data: Any) -> Optional[int]:
+    """Return the total number of results if the response reports it."""
+    if isinstance(data, dict) and isinstance(data.get("total"), int) and data["total"] >= 0:
+        return data["total"]
+    return None
+
+
+def _link_request(link: str, context: str) -> PageRequest:
+    """Turn a ``_links.next`` URL into a path and parameters.
+
+    Confluence returns links relative to its context path (``/wiki``), so the
+    context is added back when the link does not already contain it.
+    """
+    parsed = urlparse(link)
+    path = parsed.path
+    if context and not path.startswith(context):
+        path = context.rstrip("/") + path
+    return PageRequest(path.lstrip("/"), dict(parse_qsl(parsed.query, keep_blank_values=True)))
+
+
+def next_page(request: PageRequest, data: Any, items: List[Any]) -> Optional[PageRequest]:
+    """Work out the request for the page after ``data``.
+
+    Args:
+        request: The request that produced ``data``
+        data: Decoded page response
+        items: Items found in ``data``
+
+    Returns:
+        The next page request, or None when this was the last page
+    """
+    if not items or not isinstance(data, dict):
+        return None
+    if data.get("isLast") is True:
+        return None
+
+    token = data.get("nextPageToken")
+    if token:
+        return PageRequest(request.path, {**request.params, "nextPageToken": token})
+
+    links = data.get("_links")
+    if isinstance(links, dict) and links.get("next"):
+        linked = _link_request(links["next"], links.get("context", ""))
+        return PageRequest(linked.path, {**request.params, **linked.params})
+
+    offset_key = offset_params(request.path)[0]
+    response_offset_key = "startAt" if "startAt" in data else "start" if "start" in data else None
+    if response_offset_key is None:
+        return None
+
+    next_offset = int(data[response_offset_key]) + len(items)
+    total = page_total(data)
+    if total is not None and next_offset >= total:
+        return None
+    if total is None and data.get("isLast") is None:
+        # No total and no isLast flag: a short page is the last one
+        page_size = data.get("maxResults", data.get("limit"))
+        if isinstance(page_size, int) and len(items) < page_size:
+            return None
+    return PageRequest(request.path, {**request.params, offset_key: next_offset})
+
+
+def remaining_pages(
+    request: PageRequest, data: Any, items: List[Any], max_items: Optional[int] = None
+) -> Optional[List[PageRequest]]:
+    """List every page request after ``data`` when the result count is known.
+
+    Only offset responses that report ``total`` (and carry no cursor) qualify.
+    The stride is the number of items the first page actually holds, and each
+    request asks for exactly that many: Jira caps ``maxResults`` below the
+    requested size on some endpoints, and the echoed value cannot be relied on.
+
+    Args:
+        request: The request that produced ``data``
+        data: Decoded first page response
+        items: Items found in ``data``
+        max_items: Number of items wanted in total, counted from ``data`` (optional)
+
+    Returns:
+        The remaining page requests in order, or None if they cannot be derived
+    """
+    if not items or not isinstance(data, dict) or data.get("isLast") is True:
+        return None
+    if data.get("nextPageToken") or (isinstance(data.get("_links"), dict) and data["_links"].get("next")):
+        return None
+    total = page_total(data)
+    response_offset_key = "startAt" if "startAt" in data else "start" if "start" in data else None
+    if total is None or response_offset_key is None:
+        return None
+
+    start = int(data[response_offset_key])
+    stride = len(items)
+    end = total if max_items is None else min(total, start + max_items)
+    offset_key, size_key = offset_params(request.path)
+    return [
+        PageRequest(request.path, {**request.params, offset_key: offset, size_key: min(stride, end - offset)})
+        for offset in range(start + stride, end, stride)
+    ]
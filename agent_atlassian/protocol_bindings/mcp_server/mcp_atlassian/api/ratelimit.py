@@ -0,0 +1,236 @@
+"""Rate limit scheduling for the Atlassian API client
+
+This module keeps a token bucket per Atlassian site and feeds it with the
+rate limit headers Atlassian Cloud returns (``Retry-After`` and
+``X-RateLimit-*``). Requests wait in FIFO order for a token instead of
+failing, and a 429 response pauses the whole site until the advertised
+reset time.
+
+A limiter may be used from several event loops (the agent's background loop,
+the in-process server, ``asyncio.run`` in scripts). The budget is shared by
+all of them, and callers on each loop queue in FIFO order behind a lock of
+their own loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger("atlassian_mcp")
+
+# Back-off used for a 429 that carries no Retry-After header
+DEFAULT_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given either in seconds or as an HTTP date.
+
+    Returns:
+        Number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse ``X-RateLimit-Reset`` (ISO 8601 timestamp or epoch seconds).
+
+    Returns:
+        Number of seconds until the reset, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            reset_at = datetime.fromtimestamp(float(value), tz=timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max((reset_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class SiteRateLimiter:
+    """Token bucket and back-off state for a single Atlassian site.
+
+    Args:
+        site: Site identifier (the API host)
+        rate: Tokens added per second; 0 disables client-side throttling
+        burst: Bucket capacity
+    """
+
+    def __init__(self, site: str, rate: float, burst: int) -> None:
+        self.site = site
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.consecutive_429 = 0
+        self.throttled_total = 0
+        self.waiting = 0
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.near_limit = False
+        # asyncio locks belong to the loop they are first used on, so each
+        # loop queues its callers behind its own; the bucket itself is guarded
+        # by a thread lock, as loops may run in different threads
+        self._loop_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._state_lock = threading.Lock()
+
+    def _queue(self) -> asyncio.Lock:
+        """Return the lock that orders this limiter's callers on the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            lock = self._loop_locks.get(loop)
+            if lock is None:
+                lock = self._loop_locks[loop] = asyncio.Lock()
+            return lock
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        else:
+            self.tokens = self.capacity
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Wait until a request may be sent to this site.
+
+        Callers are served in arrival order; the lock is held while waiting so
+        later requests queue behind earlier ones.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._state_lock:
+            self.waiting += 1
+        try:
+            async with self._queue():
+                while True:
+                    with self._state_lock:
+                        now = time.monotonic()
+                        self._refill(now)
+                        wait = self.blocked_until - now
+                        if wait <= 0:
+                            if self.tokens >= 1:
+                                self.tokens -= 1
+                                return time.monotonic() - started
+                            wait = (1 - self.tokens) / self.rate
+                    logger.debug(f"Rate limiter for {self.site} waiting {wait:.2f}s")
+                    await asyncio.sleep(wait)
+        finally:
+            with self._state_lock:
+                self.waiting -= 1
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> Optional[float]:
+        """Update the limiter from a response.
+
+        Args:
+            status_code: HTTP status code of the response
+            headers: Response headers
+
+        Returns:
+            Seconds to back off before retrying if the response was a 429, otherwise None
+        """
+        with self._state_lock:
+            now = time.monotonic()
+            self.limit = _parse_int(headers.get("X-RateLimit-Limit")) or self.limit
+            remaining = _parse_int(headers.get("X-RateLimit-Remaining"))
+            if remaining is not None:
+                self.remaining = remaining
+                # Never spend more than the server says is left in this window
+                self.tokens = min(self.tokens, float(remaining))
+            self.near_limit = headers.get("X-RateLimit-NearLimit", "").lower() == "true"
+            reset = _parse_reset(headers.get("X-RateLimit-Reset"))
+
+            if status_code != 429:
+                self.consecutive_429 = 0
+                if remaining == 0 and reset:
+                    self.blocked_until = max(self.blocked_until, now + reset)
+                return None
+
+            self.consecutive_429 += 1
+            self.throttled_total += 1
+            delay = _parse_retry_after(headers.get("Retry-After"))
+            if delay is None:
+                delay = reset
+            if delay is None:
+                delay = min(DEFAULT_BACKOFF_SECONDS * 2 ** (self.consecutive_429 - 1), MAX_BACKOFF_SECONDS)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, now + delay)
+            logger.warning(f"Rate limited by {self.site}, backing off for {delay:.2f}s")
+            return delay
+
+    def state(self) -> Dict[str, Any]:
+        """Return a snapshot of the current budget and back-off state."""
+        with self._state_lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "site": self.site,
+                "tokens": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "rate_per_second": self.rate,
+                "queued_requests": self.waiting,
+                "backoff_remaining_seconds": round(max(self.blocked_until - now, 0.0), 2),
+                "rate_limit": self.limit,
+                "rate_limit_remaining": self.remaining,
+                "near_limit": self.near_limit,
+                "throttled_total": self.throttled_total,
+            }
+
+
+class RateLimitScheduler:
+    """Registry of per-site rate limiters.
+
+    Args:
+        rate: Tokens added per second for each site
+        burst: Bucket capacity for each site
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._sites: Dict[str, SiteRateLimiter] = {}
+
+    def for_site(self, site: str) -> SiteRateLimiter:
+        limiter = self._sites.get(site)
+        if limiter is None:
+            # Keeps the limiter another thread may have registered meanwhile
+            limiter = self._sites.setdefault(site, SiteRateLimiter(site, self.rate, self.burst))
+        return limiter
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        return {site: limiter.state() for site, limiter in list(self._sites.items())}
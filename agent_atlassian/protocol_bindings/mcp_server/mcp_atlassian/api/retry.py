@@ -0,0 +1,74 @@
+"""Retry policy for the Atlassian API client
+
+Transient failures (connection errors, timeouts and 502/503/504 responses)
+are retried with capped exponential backoff and jitter. Only requests that
+are safe to repeat are retried: idempotent methods, and POST/PATCH requests
+for which the caller supplied an idempotency key.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional
+
+import httpx
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+RETRIES = counter(
+    "atlassian_api_retries_total",
+    "Atlassian API request retries by method, endpoint and reason",
+    ("method", "endpoint", "reason"),
+)
+RETRY_OUTCOMES = counter(
+    "atlassian_api_retry_outcomes_total",
+    "Final outcome of Atlassian API requests that were retried at least once",
+    ("method", "outcome"),
+)
+
+# Errors raised before the request reached the server; safe to retry for any method
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Errors where the request may or may not have been processed
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry configuration for Atlassian API requests.
+
+    Attributes:
+        max_attempts: Total attempts including the first one
+        base_delay: Backoff before the first retry, in seconds
+        max_delay: Upper bound for a single backoff, in seconds
+        retry_statuses: Response status codes that are retried
+        idempotent_methods: Methods retried without an idempotency key
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({502, 503, 504}))
+    idempotent_methods: FrozenSet[str] = field(
+        default_factory=lambda: frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    )
+
+    def allows_method(self, method: str, idempotency_key: Optional[str] = None) -> bool:
+        """Check whether a request with this method may be sent more than once."""
+        return method in self.idempotent_methods or bool(idempotency_key)
+
+    def should_retry_status(self, method: str, status_code: int, idempotency_key: Optional[str] = None) -> bool:
+        return status_code in self.retry_statuses and self.allows_method(method, idempotency_key)
+
+    def should_retry_error(self, method: str, error: Exception, idempotency_key: Optional[str] = None) -> bool:
+        if isinstance(error, CONNECT_ERRORS):
+            return True
+        return isinstance(error, TRANSIENT_ERRORS) and self.allows_method(method, idempotency_key)
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (1-based).
+
+        Uses "equal jitter": half of the capped exponential delay is fixed and
+        the other half is random, so concurrent retries spread out without
+        collapsing to zero.
+        """
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return cap / 2 + random.uniform(0, cap / 2)
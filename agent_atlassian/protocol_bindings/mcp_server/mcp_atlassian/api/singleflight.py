@@ -0,0 +1,97 @@
+"""Single-flight coalescing for the Atlassian API client
+
+When several sessions ask for the same resource at the same time, only the
+first request goes upstream; the others wait for it and receive the same
+decoded result. The upstream request is cancelled once every caller waiting
+for it has been cancelled or has stopped waiting.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger("atlassian_mcp")
+
+COALESCED = counter(
+    "atlassian_api_coalesced_requests_total",
+    "GET requests served by joining an identical in-flight request",
+)
+
+
+def credential_fingerprint(authorization: str) -> str:
+    """Return a stable, non-reversible identifier for a credential."""
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def request_key(method: str, url: str, params: Dict[str, Any], authorization: str) -> Tuple[str, ...]:
+    """Build the coalescing key for a request.
+
+    Parameters are normalised with the same encoding httpx uses on the wire
+    and sorted, so ``{"a": 1, "b": 2}`` and ``{"b": "2", "a": "1"}`` match.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(httpx.QueryParams(params or {}).multi_items()))
+    return (method, url, query, credential_fingerprint(authorization))
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        # key -> [upstream task, callers waiting for it]
+        self._calls: Dict[Hashable, List[Any]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        context: Optional[contextvars.Context] = None,
+    ) -> Any:
+        """Run ``fn`` unless a call with the same key is already in flight.
+
+        The upstream call runs in its own task and every caller awaits it
+        through ``asyncio.shield``, so cancelling one caller does not cancel
+        the request for the others. When the last caller is cancelled or
+        times out, the upstream call is cancelled too.
+
+        Args:
+            key: Key identifying identical calls
+            fn: Starts the upstream call
+            timeout: Seconds this caller waits for the result (optional)
+            context: Context the upstream call runs in if this caller starts it
+                (default: a copy of the caller's)
+
+        Raises:
+            asyncio.TimeoutError: If the result is not available within ``timeout``
+        """
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.get_running_loop().create_task(fn(), context=context)
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            COALESCED.inc()
+            logger.debug("Joining identical in-flight request")
+        call[1] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call[0]), timeout)
+        finally:
+            call[1] -= 1
+            if call[1] == 0 and not call[0].done():
+                logger.debug("Cancelling in-flight request after its last caller left")
+                call[0].cancel()
+                self._forget(key, call[0])
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        call = self._calls.get(key)
+        if call is not None and call[0] is task:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,182 @@
+"""Persistent SQLite response store for the Atlassian API client
+
+The MCP server usually runs as a short-lived stdio subprocess, so the
+in-memory response cache starts empty on every launch. This module adds an
+optional on-disk second tier that keeps slowly changing metadata (field
+catalogs, link types, boards, sprints, users) and Confluence page bodies
+across restarts.
+
+The database uses WAL journaling and a busy timeout so that several server
+processes on the same node can share one file. Entries are keyed by the
+same request key as the in-memory cache (which includes a credential
+fingerprint) and carry their TTL and validators, so expired entries can
+still be re-validated with a conditional request. The TTL only applies to
+entries read from this store; once loaded into memory they are
+re-validated on every use.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Pattern, Tuple
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.httpcache import CachedResponse, resource_urls
+
+logger = logging.getLogger("atlassian_mcp")
+
+# Bump when the stored format changes; older databases are wiped on open
+SCHEMA_VERSION = 2
+
+# Endpoints worth persisting, with how long a stored response is served
+# without contacting Atlassian. Page bodies are kept only briefly and then
+# re-validated with their ETag/Last-Modified.
+PERSISTENT_TTLS: List[Tuple[Pattern[str], float]] = [
+    (re.compile(r"^/?rest/api/\d+/field(/search)?$"), 3600.0),
+    (re.compile(r"^/?rest/api/\d+/issueLinkType$"), 86400.0),
+    (re.compile(r"^/?rest/agile/1\.0/board(/\d+)?$"), 600.0),
+    (re.compile(r"^/?rest/agile/1\.0/(board/\d+/sprint|sprint/\d+)$"), 300.0),
+    (re.compile(r"^/?rest/api/\d+/(myself|user|user/search)$"), 3600.0),
+    (re.compile(r"^/?wiki/rest/api/content/\d+$"), 60.0),
+]
+
+
+def persistent_ttl(path: str) -> Optional[float]:
+    """Return the freshness TTL for a persistable endpoint, or None if it is not persisted."""
+    path = path.split("?", 1)[0]
+    for pattern, ttl in PERSISTENT_TTLS:
+        if pattern.match(path):
+            return ttl
+    return None
+
+
+def _db_key(key: Tuple[str, ...]) -> str:
+    return hashlib.sha256("\x1f".join(key).encode()).hexdigest()
+
+
+class PersistentStore:
+    """SQLite-backed store of :class:`CachedResponse` entries.
+
+    Args:
+        path: Database file path
+        max_age: Seconds after which entries are purged regardless of validators
+    """
+
+    def __init__(self, path: str, max_age: float = 7 * 86400) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS responses")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_url ON responses (url)")
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.purge()
+
+    def get(self, key: Tuple[str, ...]) -> Optional[CachedResponse]:
+        db_key = _db_key(key)
+        try:
+            row = self._connect().execute(
+                "SELECT body, size, etag, last_modified, stored_at, expires_at FROM responses WHERE key = ?",
+                (db_key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        body, size, etag, last_modified, stored_at, expires_at = row
+        try:
+            data = json.loads(body)
+        except (TypeError, ValueError) as e:
+            # A corrupted or truncated row; drop it so the next request refetches
+            logger.warning(f"Discarding unreadable persistent cache entry: {e}")
+            self._delete(db_key)
+            return None
+        return CachedResponse(
+            data=data,
+            size=size,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=stored_at,
+            expires_at=expires_at,
+        )
+
+    def put(self, key: Tuple[str, ...], entry: CachedResponse) -> None:
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, size, etag, last_modified, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _db_key(key),
+                    key[1].split("?", 1)[0].rstrip("/"),
+                    json.dumps(entry.data, ensure_ascii=False),
+                    entry.size,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.stored_at,
+                    entry.expires_at,
+                ),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache write failed: {e}")
+
+    def _delete(self, db_key: str) -> None:
+        try:
+            self._connect().execute("DELETE FROM responses WHERE key = ?", (db_key,))
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache delete failed: {e}")
+
+    def discard_resource(self, url: str) -> None:
+        """Delete entries whose request URL is ``url``, below it or a parent of it."""
+        urls = resource_urls(url)
+        placeholders = ", ".join("?" for _ in urls)
+        try:
+            self._connect().execute(
+                f"DELETE FROM responses WHERE url IN ({placeholders}) OR substr(url, 1, ?) = ?",
+                (*urls, len(urls[0]) + 1, urls[0] + "/"),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache invalidation failed: {e}")
+
+    def purge(self) -> None:
+        """Remove entries older than ``max_age``."""
+        try:
+            self._connect().execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,))
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache purge failed: {e}")
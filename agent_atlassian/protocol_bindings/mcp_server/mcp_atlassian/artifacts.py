@@ -0,0 +1,283 @@
+"""Server-side store for large tool results.
+
+When a list result (search hits, board issues, page children, ...) is too
+large for the tool output limit, :mod:`compaction` parks the projected items
+here and returns a handle with a short summary instead: item count, the
+fields present, and a few preview rows. The artifact tools in
+``tools/artifacts.py`` then page, filter and aggregate the parked items by
+handle, so the full result never enters the prompt or the agent's
+conversation history.
+
+Artifacts are kept in memory for ``ATLASSIAN_ARTIFACT_TTL`` seconds. When
+``ATLASSIAN_ARTIFACT_DB`` is set they are also written to that SQLite file,
+so every server process sharing it (for example the agent's pool of stdio
+sessions) can serve any handle.
+
+Configuration (environment variables):
+    ATLASSIAN_TOOL_ARTIFACTS: Set to false to truncate large results instead (default: true)
+    ATLASSIAN_ARTIFACT_TTL: Seconds an artifact is kept (default: 3600)
+    ATLASSIAN_ARTIFACT_MAX_ENTRIES: Artifacts kept in memory (default: 64)
+    ATLASSIAN_ARTIFACT_MAX_BYTES: Serialized size of artifacts kept in memory (default: 67108864)
+    ATLASSIAN_ARTIFACT_DB: SQLite file shared between server processes (optional)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter, gauge
+
+logger = logging.getLogger("mcp-atlassian.artifacts")
+
+ARTIFACTS_CREATED = counter(
+    "atlassian_artifacts_created_total",
+    "Large tool results parked in the artifact store, by tool",
+    ("tool",),
+)
+ARTIFACT_STORED_BYTES = gauge(
+    "atlassian_artifact_stored_bytes",
+    "Serialized size of the artifacts held in memory, in bytes",
+)
+
+USAGE = (
+    "This result was too large to return in full and is stored under artifact_id. "
+    "Use artifact_slice to page through rows, artifact_filter to select rows by a field, "
+    "and artifact_aggregate to count, sum or average rows grouped by a field. "
+    "Fields are addressed with dotted paths, e.g. 'status.name'."
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def artifacts_enabled() -> bool:
+    return os.getenv("ATLASSIAN_TOOL_ARTIFACTS", "true").lower() not in ("false", "0", "no")
+
+
+@dataclass
+class Artifact:
+    """A parked list of result items."""
+
+    id: str
+    tool: str
+    items: List[Any]
+    meta: Dict[str, Any] = field(default_factory=dict)
+    size: int = 0
+    created: float = field(default_factory=time.time)
+
+
+class ArtifactStore:
+    """TTL + LRU store of artifacts, optionally shared through SQLite.
+
+    Args:
+        ttl: Seconds an artifact is kept
+        max_entries: Artifacts kept in memory
+        max_bytes: Serialized size of artifacts kept in memory
+        path: SQLite file shared between processes (optional)
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024,
+                 path: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries: "OrderedDict[str, Artifact]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            self._init_schema()
+
+    # SQLite tier
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Artifacts hold Jira and Confluence content; keep the file private
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                id TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                meta TEXT NOT NULL,
+                items TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL
+            )
+            """
+        )
+
+    def _write(self, artifact: Artifact, items_json: str) -> None:
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM artifacts WHERE created < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (id, tool, meta, items, size, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (artifact.id, artifact.tool, json.dumps(artifact.meta), items_json, artifact.size, artifact.created),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Artifact store write failed: {e}")
+
+    def _read(self, artifact_id: str) -> Optional[Artifact]:
+        try:
+            row = self._connect().execute(
+                "SELECT tool, meta, items, size, created FROM artifacts WHERE id = ?", (artifact_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Artifact store read failed: {e}")
+            return None
+        if row is None:
+            return None
+        tool, meta, items, size, created = row
+        return Artifact(artifact_id, tool, json.loads(items), json.loads(meta), size, created)
+
+    # Store interface
+
+    def put(self, tool: str, items: List[Any], meta: Optional[Dict[str, Any]] = None) -> Artifact:
+        """Park a list of items and return the new artifact."""
+        items_json = json.dumps(items, ensure_ascii=False, default=str)
+        artifact = Artifact(f"art_{uuid.uuid4().hex[:12]}", tool, items, dict(meta or {}), len(items_json.encode()))
+        with self._lock:
+            self._entries[artifact.id] = artifact
+            self._bytes += artifact.size
+            self._evict()
+        if self.path:
+            self._write(artifact, items_json)
+        ARTIFACTS_CREATED.inc(tool=tool)
+        return artifact
+
+    def get(self, artifact_id: str) -> Optional[Artifact]:
+        """Return an artifact by id, or None if it is unknown or has expired."""
+        with self._lock:
+            artifact = self._entries.get(artifact_id)
+            if artifact is not None:
+                self._entries.move_to_end(artifact_id)
+        if artifact is None and self.path:
+            artifact = self._read(artifact_id)
+            if artifact is not None:
+                with self._lock:
+                    self._entries[artifact_id] = artifact
+                    self._bytes += artifact.size
+                    self._evict()
+        if artifact is None or time.time() - artifact.created > self.ttl:
+            return None
+        return artifact
+
+    def _evict(self) -> None:
+        now = time.time()
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if (
+                now - oldest.created > self.ttl
+                or len(self._entries) > self.max_entries
+                or (self._bytes > self.max_bytes and len(self._entries) > 1)
+            ):
+                del self._entries[oldest.id]
+                self._bytes -= oldest.size
+            else:
+                break
+        ARTIFACT_STORED_BYTES.set(self._bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+artifact_store = ArtifactStore(
+    ttl=float(_env_int("ATLASSIAN_ARTIFACT_TTL", 3600)),
+    max_entries=_env_int("ATLASSIAN_ARTIFACT_MAX_ENTRIES", 64),
+    max_bytes=_env_int("ATLASSIAN_ARTIFACT_MAX_BYTES", 64 * 1024 * 1024),
+    path=os.path.expanduser(os.getenv("ATLASSIAN_ARTIFACT_DB", "")) or None,
+)
+
+
+# Field access
+
+def field_values(item: Any, path: str) -> List[Any]:
+    """Return the values at a dotted path in an item, flattening lists on the way."""
+    values = [item]
+    for part in path.split(".") if path else []:
+        found = []
+        for value in values:
+            for entry in value if isinstance(value, list) else [value]:
+                if isinstance(entry, dict) and part in entry:
+                    found.append(entry[part])
+        values = found
+    flattened: List[Any] = []
+    for value in values:
+        if isinstance(value, list):
+            flattened.extend(value)
+        else:
+            flattened.append(value)
+    return flattened
+
+
+def select_fields(item: Any, paths: List[str]) -> Dict[str, Any]:
+    """Project an item onto dotted paths."""
+    result = {}
+    for path in paths:
+        values = field_values(item, path)
+        result[path] = values[0] if len(values) == 1 else values or None
+    return result
+
+
+def schema(items: List[Any], sample: int = 200) -> Dict[str, str]:
+    """Describe the fields of the items as dotted path -> type names, nested one level deep."""
+    fields: Dict[str, set] = {}
+    for item in items[:sample]:
+        if not isinstance(item, dict):
+            fields.setdefault("", set()).add(type(item).__name__)
+            continue
+        for key, value in item.items():
+            fields.setdefault(key, set()).add(type(value).__name__)
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    fields.setdefault(f"{key}.{sub_key}", set()).add(type(sub_value).__name__)
+    return {name: "|".join(sorted(types)) for name, types in fields.items()}
+
+
+def summarize(artifact: Artifact, max_bytes: int = 8000, preview_rows: int = 5) -> Dict[str, Any]:
+    """Build the handle and summary returned in place of a parked result."""
+    summary: Dict[str, Any] = {
+        "artifact_id": artifact.id,
+        "source_tool": artifact.tool,
+        "item_count": len(artifact.items),
+    }
+    total = artifact.meta.get("total")
+    if isinstance(total, int) and total != len(artifact.items):
+        summary["total_available"] = total
+    summary["fields"] = schema(artifact.items)
+    summary["usage"] = USAGE
+    # As many preview rows as fit in the summary budget
+    preview: List[Any] = []
+    used = len(json.dumps(summary, ensure_ascii=False, default=str).encode())
+    for item in artifact.items[:preview_rows]:
+        size = len(json.dumps(item, ensure_ascii=False, default=str).encode())
+        if used + size > max_bytes:
+            break
+        preview.append(item)
+        used += size
+    summary["preview"] = preview
+    return summary
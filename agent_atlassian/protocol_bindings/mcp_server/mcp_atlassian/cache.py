@@ -0,0 +1,321 @@
+"""Result cache for read-only MCP tools.
+
+Read tools are decorated with :func:`cached_tool`, which stores their
+results for a per-tool TTL in a size-bounded LRU cache. Each cached result
+is tagged (for example ``jira:issue:PROJ-1``) and write tools decorated with
+:func:`invalidates` drop every result carrying one of the tags they touch.
+
+Example:
+    @cached_tool(ttl=60, tags=lambda args: ["jira:issue", f"jira:issue:{args['issue_key']}"])
+    async def get_issue(ctx: Context, issue_key: str) -> str: ...
+
+    @invalidates(lambda args: [f"jira:issue:{args['issue_key']}", "jira:search"])
+    async def transition_issue(ctx: Context, issue_key: str, transition_id: str) -> str: ...
+
+Each server process has its own cache. When ``ATLASSIAN_TOOL_CACHE_DB`` is
+set, writes also record the tags they touched in that SQLite file, and every
+process sharing it drops cached results with those tags that were read
+before the write. The agent's pool of stdio sessions shares one such file,
+so a write served by one session is seen by reads served by the others.
+
+Configuration (environment variables):
+    ATLASSIAN_TOOL_CACHE: Set to false to disable the cache (default: true)
+    ATLASSIAN_TOOL_CACHE_MAX_ENTRIES: Results kept per process (default: 256)
+    ATLASSIAN_TOOL_CACHE_DB: SQLite file sharing invalidations between server processes (optional)
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple, TypeVar, Union
+
+from mcp.server.fastmcp import Context
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger("mcp-atlassian.cache")
+
+TOOL_CACHE_REQUESTS = counter(
+    "atlassian_tool_cache_requests_total",
+    "Read tool calls by cache result (hit or miss)",
+    ("tool", "result"),
+)
+TOOL_CACHE_INVALIDATIONS = counter(
+    "atlassian_tool_cache_invalidations_total",
+    "Cached tool results dropped by write tools",
+    ("tool",),
+)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+TagSpec = Union[Iterable[str], Callable[[Dict[str, Any]], Iterable[str]], None]
+CacheKey = Tuple[str, str]
+
+
+class SharedInvalidations:
+    """Latest invalidation time of each tag, shared by processes through SQLite.
+
+    Args:
+        path: SQLite file shared between processes
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS invalidations (tag TEXT PRIMARY KEY, invalidated_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def record(self, tags: Set[str], at: float) -> None:
+        try:
+            self._connect().executemany(
+                "INSERT INTO invalidations (tag, invalidated_at) VALUES (?, ?) "
+                "ON CONFLICT (tag) DO UPDATE SET invalidated_at = MAX(invalidated_at, excluded.invalidated_at)",
+                [(tag, at) for tag in tags],
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not share tool cache invalidation: {e}")
+
+    def latest(self, tags: Set[str]) -> Optional[float]:
+        """Return the last time any of the tags was invalidated, or None if none was."""
+        try:
+            row = self._connect().execute(
+                f"SELECT MAX(invalidated_at) FROM invalidations WHERE tag IN ({', '.join('?' * len(tags))})",
+                tuple(tags),
+            ).fetchone()
+        except sqlite3.Error as e:
+            # Without the log, a cached result may be stale; treat it as invalidated
+            logger.warning(f"Could not read shared tool cache invalidations: {e}")
+            return float("inf")
+        return row[0]
+
+
+class ToolResultCache:
+    """TTL + LRU cache of tool results with tag-based invalidation.
+
+    Args:
+        max_entries: Number of results kept before the least recently used is evicted
+        shared: Invalidations shared with other processes (optional)
+    """
+
+    def __init__(self, max_entries: int = 256, shared: Optional[SharedInvalidations] = None) -> None:
+        self.max_entries = max_entries
+        self.shared = shared
+        # key -> (expiry on the monotonic clock, value, tags, wall-clock time the value was read)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any, Set[str], float]]" = OrderedDict()
+        self._tags: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value, tags, read_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+        if self.shared is not None and tags:
+            invalidated_at = self.shared.latest(tags)
+            if invalidated_at is not None and invalidated_at >= read_at:
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        self._remove(key)
+                return False, None
+        return True, value
+
+    def put(self, key: CacheKey, value: Any, ttl: float, tags: Set[str], read_at: Optional[float] = None) -> None:
+        """Store a result.
+
+        Args:
+            read_at: Wall-clock time the result was read (default: now); a write
+                in another process after that time invalidates it
+        """
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags, time.time() if read_at is None else read_at)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the given tags, in this and other processes.
+
+        Returns:
+            Number of entries removed from this process's cache
+        """
+        tags = set(tags)
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+        if self.shared is not None and tags:
+            self.shared.record(tags, time.time())
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _max_entries() -> int:
+    try:
+        return int(os.getenv("ATLASSIAN_TOOL_CACHE_MAX_ENTRIES", "256"))
+    except ValueError:
+        return 256
+
+
+def _shared_invalidations() -> Optional[SharedInvalidations]:
+    path = os.path.expanduser(os.getenv("ATLASSIAN_TOOL_CACHE_DB", ""))
+    if not path:
+        return None
+    try:
+        return SharedInvalidations(path)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Tool cache invalidations are not shared, cannot open {path}: {e}")
+        return None
+
+
+tool_cache = ToolResultCache(_max_entries(), _shared_invalidations())
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("ATLASSIAN_TOOL_CACHE", "true").lower() in ("true", "1", "yes", "y", "on")
+
+
+def _bound_arguments(signature: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the call's arguments by name, with defaults applied and the MCP context removed."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return {
+        name: value
+        for name, value in bound.arguments.items()
+        if not isinstance(value, Context) and name != "ctx"
+    }
+
+
+def _resolve_tags(spec: TagSpec, arguments: Dict[str, Any]) -> Set[str]:
+    if spec is None:
+        return set()
+    if callable(spec):
+        spec = spec(arguments)
+    return {tag for tag in spec if tag}
+
+
+def is_error_result(value: Any) -> bool:
+    """Whether a tool result reports a failure, as ``{"error": ...}`` or that dict serialized as JSON."""
+    if isinstance(value, dict):
+        return "error" in value
+    if isinstance(value, str) and value.lstrip().startswith("{") and '"error"' in value:
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            return False
+        return isinstance(decoded, dict) and "error" in decoded
+    return False
+
+
+def cached_tool(ttl: float, tags: TagSpec = None) -> Callable[[F], F]:
+    """Cache a read-only tool's results.
+
+    Args:
+        ttl: Seconds a result stays valid
+        tags: Tags attached to each result, either a list or a function of the
+            call's arguments; used by :func:`invalidates`
+    """
+
+    def decorator(fn: F) -> F:
+        signature = inspect.signature(fn)
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _cache_enabled():
+                return await fn(*args, **kwargs)
+
+            arguments = _bound_arguments(signature, args, kwargs)
+            key = (name, json.dumps(arguments, sort_keys=True, default=str))
+            hit, value = tool_cache.get(key)
+            if hit:
+                TOOL_CACHE_REQUESTS.inc(tool=name, result="hit")
+                logger.debug(f"Tool cache hit for {name}")
+                return value
+
+            TOOL_CACHE_REQUESTS.inc(tool=name, result="miss")
+            read_at = time.time()
+            value = await fn(*args, **kwargs)
+            # Some tools report failures as {"error": ...}, or as that dict in
+            # JSON, instead of raising
+            if not is_error_result(value):
+                tool_cache.put(key, value, ttl, _resolve_tags(tags, arguments), read_at)
+            return value
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def invalidates(tags: TagSpec) -> Callable[[F], F]:
+    """Drop cached read results affected by a write tool.
+
+    Invalidation runs after the write completes, whether it succeeded or not,
+    since a failed write may still have changed server state.
+
+    Args:
+        tags: Tags to invalidate, either a list or a function of the call's arguments
+    """
+
+    def decorator(fn: F) -> F:
+        signature = inspect.signature(fn)
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                resolved = _resolve_tags(tags, _bound_arguments(signature, args, kwargs))
+                removed = tool_cache.invalidate(resolved)
+                if removed:
+                    TOOL_CACHE_INVALIDATIONS.inc(removed, tool=name)
+                    logger.debug(f"{name} invalidated {removed} cached results for tags {sorted(resolved)}")
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
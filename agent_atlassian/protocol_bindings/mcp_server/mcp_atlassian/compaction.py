@@ -0,0 +1,285 @@
+"""Compaction of tool results before they are returned to the client.
+
+Most tools return the raw REST payload, which for issues and pages is
+mostly hypermedia (``self`` links, ``_links``, ``_expandable``, avatar
+URLs) and nested objects the LLM does not need. Tools registered with
+:func:`compact_tool` have their results:
+
+1. Projected through the simplified models where the payload is recognised
+   (``JiraIssue``, ``JiraSprint``, ``ConfluencePage``, ``ConfluenceComment``),
+   including the items of search and list responses; their other keys are
+   kept. When the tool followed pagination itself (``max_results``), the
+   per-page size it was called with (``limit``, ``maxResults``) is dropped
+2. Stripped of hypermedia keys everywhere else
+3. Serialized as compact JSON and capped at a per-tool byte limit. List
+   results over the limit are parked in the artifact store (see
+   :mod:`artifacts`) and replaced by a handle and summary; with artifacts
+   disabled they keep as many whole items as fit and say how to fetch the
+   rest. Other results are cut with a marker.
+
+Error results (a dict with an ``error`` key) are returned unchanged.
+
+Configuration (environment variables):
+    ATLASSIAN_TOOL_OUTPUT_COMPACT: Set to false to return raw results (default: true)
+    ATLASSIAN_TOOL_OUTPUT_MAX_BYTES: Byte limit per tool result, 0 for none (default: 24000, about 6000 tokens)
+    ATLASSIAN_TOOL_OUTPUT_LIMITS: Per-tool limits overriding the default, e.g. "get_issue=48000,search=32000"
+
+Example:
+    mcp.tool()(instrument_tool(compact_tool(issues.get_issue)))
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.artifacts import (
+    artifact_store,
+    artifacts_enabled,
+    summarize,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import (
+    DEFAULT_SIZE_BUCKETS,
+    counter,
+    histogram,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models import (
+    ConfluenceComment,
+    ConfluencePage,
+    JiraIssue,
+    JiraSprint,
+)
+
+logger = logging.getLogger("mcp-atlassian.compaction")
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+TOOL_RAW_RESULT_BYTES = histogram(
+    "atlassian_tool_raw_result_bytes",
+    "Size of MCP tool results before compaction, in bytes",
+    ("tool",),
+    DEFAULT_SIZE_BUCKETS,
+)
+TOOL_RESULTS_TRUNCATED = counter(
+    "atlassian_tool_results_truncated_total",
+    "Tool results cut to the tool's output byte limit",
+    ("tool",),
+)
+
+# Hypermedia and presentation keys that carry no information for the LLM
+HYPERMEDIA_KEYS = frozenset({"self", "_links", "_expandable", "expand", "avatarUrls", "iconUrl"})
+# Keys holding the items of list responses
+LIST_KEYS = ("issues", "values", "results", "comments", "worklogs")
+# Page size fields, which no longer apply once a tool has followed pagination
+PAGE_SIZE_KEYS = frozenset({"maxResults", "limit"})
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def compaction_enabled() -> bool:
+    return os.getenv("ATLASSIAN_TOOL_OUTPUT_COMPACT", "true").lower() not in ("false", "0", "no")
+
+
+def output_limit(tool: str) -> int:
+    """Return the byte limit for a tool's result (0 for no limit)."""
+    for entry in os.getenv("ATLASSIAN_TOOL_OUTPUT_LIMITS", "").split(","):
+        name, _, value = entry.partition("=")
+        if name.strip() == tool and value.strip().isdigit():
+            return int(value)
+    return _env_int("ATLASSIAN_TOOL_OUTPUT_MAX_BYTES", 24000)
+
+
+def strip_hypermedia(value: Any) -> Any:
+    """Recursively drop hypermedia keys from a decoded payload."""
+    if isinstance(value, dict):
+        return {k: strip_hypermedia(v) for k, v in value.items() if k not in HYPERMEDIA_KEYS}
+    if isinstance(value, list):
+        return [strip_hypermedia(item) for item in value]
+    return value
+
+
+def _project_item(item: Any, requested_fields: Optional[str]) -> Any:
+    """Project a single payload object through its simplified model, if recognised."""
+    if hasattr(item, "to_simplified_dict"):
+        return item.to_simplified_dict()
+    if not isinstance(item, dict):
+        return strip_hypermedia(item)
+    try:
+        if "key" in item and isinstance(item.get("fields"), dict):
+            return JiraIssue.from_api_response(item, requested_fields=requested_fields or None).to_simplified_dict()
+        if item.get("type") in ("page", "blogpost") and "title" in item:
+            body = item.get("body") if isinstance(item.get("body"), dict) else {}
+            content_format = next(iter(body), "view")
+            return ConfluencePage.from_api_response(item, content_format=content_format).to_simplified_dict()
+        if item.get("type") == "comment" and "body" in item:
+            return ConfluenceComment.from_api_response(item).to_simplified_dict()
+        if "originBoardId" in item and "state" in item:
+            return JiraSprint.from_api_response(item).to_simplified_dict()
+    except Exception as e:
+        logger.debug(f"Could not project tool result item, stripping it instead: {e}")
+    return strip_hypermedia(item)
+
+
+def project(value: Any, requested_fields: Optional[str] = None, paginated: bool = False) -> Any:
+    """Project a decoded tool result through the simplified models.
+
+    Args:
+        value: Decoded tool result
+        requested_fields: Jira fields the tool was asked for (optional)
+        paginated: Whether the tool collected the result over several pages
+    """
+    if isinstance(value, list):
+        return [_project_item(item, requested_fields) for item in value]
+    if isinstance(value, dict):
+        for key in LIST_KEYS:
+            if isinstance(value.get(key), list):
+                return {
+                    k: [_project_item(item, requested_fields) for item in v] if k == key else strip_hypermedia(v)
+                    for k, v in value.items()
+                    if k not in HYPERMEDIA_KEYS and not (paginated and k in PAGE_SIZE_KEYS)
+                }
+    return _project_item(value, requested_fields)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _items(value: Any) -> Tuple[Optional[str], List[Any]]:
+    """Return the key of the item list in a result (None for a bare list) and the items."""
+    if isinstance(value, list):
+        return None, value
+    if isinstance(value, dict):
+        for key in LIST_KEYS:
+            if isinstance(value.get(key), list):
+                return key, value[key]
+    return None, []
+
+
+def _raw_size(result: Any) -> int:
+    if isinstance(result, str):
+        return len(result.encode())
+    if isinstance(result, list):
+        result = [item.model_dump() if hasattr(item, "model_dump") else item for item in result]
+    elif hasattr(result, "model_dump"):
+        result = result.model_dump()
+    return len(_dumps(result).encode())
+
+
+def cap(value: Any, limit: int) -> Tuple[str, bool]:
+    """Serialize a projected result within ``limit`` bytes.
+
+    Returns:
+        The serialized result and whether anything was left out
+    """
+    text = _dumps(value)
+    if limit <= 0 or len(text.encode()) <= limit:
+        return text, False
+
+    key, items = _items(value)
+    if items:
+        # Keep as many whole items as fit, leaving room for the marker
+        budget = limit - 400
+        kept, size = 0, len(_dumps({**value, key: []}).encode()) if key else 2
+        for item in items:
+            size += len(_dumps(item).encode()) + 1
+            if size > budget:
+                break
+            kept += 1
+        if kept:
+            omitted = len(items) - kept
+            hint = f"{omitted} more items omitted to stay within the {limit}-byte tool output limit; "
+            offset = value.get("startAt", value.get("start")) if isinstance(value, dict) else None
+            if isinstance(offset, int):
+                hint += f"request the next items starting at offset {offset + kept}, or narrow the query"
+            else:
+                hint += "narrow the query or request fewer items"
+            truncated = {"items_returned": kept, "items_omitted": omitted, "continuation": hint}
+            if key:
+                return _dumps({**value, key: items[:kept], "_truncated": truncated}), True
+            return _dumps({"items": items[:kept], "_truncated": truncated}), True
+
+    return _cut(text, limit), True
+
+
+def _cut(text: str, limit: int) -> str:
+    """Cut text to about ``limit`` bytes and append a truncation marker."""
+    encoded = text.encode()
+    kept = encoded[: max(0, limit - 200)].decode(errors="ignore")
+    omitted = len(encoded) - len(kept.encode())
+    return f"{kept}\n[... output truncated: {omitted} of {len(encoded)} bytes omitted; request specific fields or a narrower query]"
+
+
+def _park(tool: str, value: Any, limit: int) -> Optional[str]:
+    """Store a list result over the limit as an artifact and return its summary."""
+    if limit <= 0 or not artifacts_enabled() or tool.startswith("artifact_"):
+        return None
+    key, items = _items(value)
+    if not items or len(_dumps(value).encode()) <= limit:
+        return None
+    meta = {k: v for k, v in value.items() if k != key} if key else {}
+    artifact = artifact_store.put(tool, items, meta)
+    logger.info(f"Stored {len(items)} items from {tool} as artifact {artifact.id}")
+    return _dumps(summarize(artifact, max_bytes=min(limit, 8000)))
+
+
+def compact_result(tool: str, result: Any, requested_fields: Optional[str] = None, paginated: bool = False) -> Any:
+    """Project, strip and cap one tool result."""
+    if result is None or (isinstance(result, dict) and "error" in result):
+        return result
+    TOOL_RAW_RESULT_BYTES.observe(_raw_size(result), tool=tool)
+    if isinstance(result, str):
+        try:
+            decoded = json.loads(result)
+        except ValueError:
+            # Plain text: only the size limit applies
+            limit = output_limit(tool)
+            if limit <= 0 or len(result.encode()) <= limit:
+                return result
+            TOOL_RESULTS_TRUNCATED.inc(tool=tool)
+            return _cut(result, limit)
+    else:
+        decoded = result
+
+    projected = project(decoded, requested_fields, paginated)
+    limit = output_limit(tool)
+    parked = _park(tool, projected, limit)
+    if parked is not None:
+        return parked
+    text, truncated = cap(projected, limit)
+    if truncated:
+        TOOL_RESULTS_TRUNCATED.inc(tool=tool)
+    return text
+
+
+def compact_tool(fn: F) -> F:
+    """Compact the results of an MCP tool (see module docstring)."""
+    name = fn.__name__
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await fn(*args, **kwargs)
+        if not compaction_enabled():
+            return result
+        try:
+            bound = signature.bind_partial(*args, **kwargs).arguments
+        except TypeError:
+            bound = kwargs
+        fields = bound.get("fields")
+        try:
+            return compact_result(
+                name, result, fields if isinstance(fields, str) else None, paginated=bool(bound.get("max_results"))
+            )
+        except Exception as e:
+            logger.warning(f"Could not compact result of {name}, returning it unchanged: {e}")
+            return result
+
+    return wrapper  # type: ignore[return-value]
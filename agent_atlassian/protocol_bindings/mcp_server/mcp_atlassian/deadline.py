@@ -0,0 +1,177 @@
+"""Request deadlines shared by the agent, the MCP tools and the API client.
+
+A deadline is an absolute wall-clock time (``time.time()``) by which a
+request must be answered. It is set once, where the request enters the
+system (an A2A task), and travels with the work:
+
+1. The agent keeps it in a context variable (and in the LangGraph config
+   under ``configurable.deadline``), so every tool call made for the request
+   sees it
+2. The MCP session pool sends it to the server in the ``_meta`` of each
+   ``tools/call`` request, minus ``ATLASSIAN_DEADLINE_HOP_MARGIN``, and
+   stops waiting for the answer when it passes
+3. :func:`deadline_tool` restores it on the server side and ends the tool
+   when it passes
+4. The API client caps HTTP timeouts, retry back-off and rate limit waits
+   by the time that is left (:func:`time_budget`, :func:`within_deadline`)
+
+Each hop keeps a small margin for itself, so an inner hop gives up before
+the outer one and the outer one still has time to report what happened.
+Deadlines are absolute, so agent and server clocks are assumed to be in
+sync (both run on the same host for the stdio transport).
+
+Work without a deadline is not limited.
+
+Configuration (environment variables):
+    ATLASSIAN_DEADLINE_HOP_MARGIN: Seconds each hop keeps for itself (default: 0.5)
+
+Example:
+    with deadline_scope(time.time() + 60):
+        timeout = time_budget(30)  # at most 30s, less if the deadline is closer
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from mcp.server.lowlevel.server import request_ctx
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Key of the deadline in the _meta of MCP requests
+META_KEY = "deadline"
+
+DEADLINES_EXCEEDED = counter(
+    "atlassian_deadlines_exceeded_total",
+    "Work stopped because the request deadline passed, by where it was stopped (agent, mcp_call, tool or http)",
+    ("where",),
+)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("atlassian_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is started or continued after the request deadline."""
+
+
+def hop_margin() -> float:
+    try:
+        return max(0.0, float(os.getenv("ATLASSIAN_DEADLINE_HOP_MARGIN", "0.5")))
+    except ValueError:
+        return 0.5
+
+
+def get_deadline() -> Optional[float]:
+    """Return the deadline of the current request, or None if it has none."""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    """Run a block with ``deadline`` as the current request deadline.
+
+    A deadline later than the enclosing one is ignored, so a hop can only
+    shrink the budget it was given.
+    """
+    outer = _deadline.get()
+    if deadline is None or (outer is not None and outer < deadline):
+        deadline = outer
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def without_deadline() -> contextvars.Context:
+    """Return a copy of the current context without a request deadline.
+
+    For work shared by several requests, such as a coalesced API call, which
+    must not stop at the deadline of the request that happened to start it.
+    """
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def remaining(margin: float = 0.0) -> Optional[float]:
+    """Seconds left before the deadline minus ``margin``, or None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - margin - time.time()
+
+
+def within_deadline(seconds: float) -> bool:
+    """Whether waiting ``seconds`` still leaves time before the deadline."""
+    left = remaining()
+    return left is None or seconds < left
+
+
+def time_budget(timeout: Optional[float], where: str = "http") -> Optional[float]:
+    """Return ``timeout`` capped by the time left before the deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        DEADLINES_EXCEEDED.inc(where=where)
+        raise DeadlineExceeded(f"Request deadline exceeded {-left:.1f}s ago")
+    return left if timeout is None else min(timeout, left)
+
+
+def _request_deadline() -> Optional[float]:
+    """The deadline sent by the client in the _meta of the current MCP request."""
+    try:
+        meta = request_ctx.get().meta
+    except LookupError:
+        # Called in-process rather than through an MCP session
+        return None
+    if meta is None:
+        return None
+    value = (meta.model_extra or {}).get(META_KEY)
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid request deadline: {value!r}")
+        return None
+
+
+def deadline_tool(fn: F) -> F:
+    """Stop an MCP tool when the deadline of its request passes.
+
+    The tool then returns an error result instead of its answer, which the
+    caller has stopped waiting for.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with deadline_scope(_request_deadline()):
+            left = remaining()
+            if left is None:
+                return await fn(*args, **kwargs)
+            try:
+                if left <= 0:
+                    raise DeadlineExceeded
+                return await asyncio.wait_for(fn(*args, **kwargs), left)
+            except TimeoutError:
+                # DeadlineExceeded from the API client, or the wait above
+                DEADLINES_EXCEEDED.inc(where="tool")
+                logger.warning(f"Tool {name} stopped at the request deadline")
+                return {"error": f"Deadline exceeded: {name} did not finish within the request's time budget"}
+
+    return wrapper  # type: ignore[return-value]
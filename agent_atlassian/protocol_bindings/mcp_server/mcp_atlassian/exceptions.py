@@ -2,3 +2,11 @@ class MCPAtlassianAuthenticationError(Exception):
     """Raised when Atlassian API authentication fails (401/403)."""
 
     pass
+
+
+class MCPAtlassianAPIError(Exception):
+    """Raised when an Atlassian API request fails while iterating over results."""
+
+    def __init__(self, message: str, error: dict) -> None:
+        super().__init__(message)
+        self.error = error
@@ -0,0 +1,249 @@
+"""In-process metrics for the Atlassian MCP server.
+
+Metrics are kept in a module-level registry so that the API client and the
+tools can record them without any wiring, and the server can expose them,
+either as JSON (:func:`snapshot`) or in the Prometheus text exposition
+format (:func:`render_prometheus`).
+"""
+
+import bisect
+import functools
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple, TypeVar, Union
+
+LabelValues = Tuple[str, ...]
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Latency buckets in seconds, from a fast cached call to a slow export
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Payload size buckets in bytes, from an empty body to a large page or search result
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Counter:
+    """A monotonically increasing counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Counter):
+    """A value that can go up and down, with optional labels."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    """A histogram of observed values with optional labels.
+
+    Bucket counts are stored per bucket and made cumulative on export.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket + overflow, sum]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Dict[LabelValues, Dict[str, Any]]:
+        """Return cumulative bucket counts, sum and count per label set."""
+        result = {}
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                cumulative, running = [], 0
+                for bucket_count in counts:
+                    running += bucket_count
+                    cumulative.append(running)
+                result[key] = {
+                    "buckets": dict(zip([*map(str, self.buckets), "+Inf"], cumulative)),
+                    "sum": total[0],
+                    "count": running,
+                }
+        return result
+
+
+Metric = Union[Counter, Gauge, Histogram]
+REGISTRY: Dict[str, Metric] = {}
+
+
+def counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """Return the counter registered under name, creating it if needed."""
+    metric = REGISTRY.get(name)
+    if metric is None:
+        metric = Counter(name, documentation, labelnames)
+        REGISTRY[name] = metric
+    return metric  # type: ignore[return-value]
+
+
+def gauge(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    """Return the gauge registered under name, creating it if needed."""
+    metric = REGISTRY.get(name)
+    if metric is None:
+        metric = Gauge(name, documentation, labelnames)
+        REGISTRY[name] = metric
+    return metric  # type: ignore[return-value]
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+) -> Histogram:
+    """Return the histogram registered under name, creating it if needed."""
+    metric = REGISTRY.get(name)
+    if metric is None:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        REGISTRY[name] = metric
+    return metric  # type: ignore[return-value]
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return all metric values as a JSON-serialisable dictionary."""
+    result: Dict[str, Any] = {}
+    for name, metric in REGISTRY.items():
+        result[name] = [
+            {"labels": dict(zip(metric.labelnames, key)), "value": value}
+            for key, value in metric.samples().items()
+        ]
+    return result
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+    for name, metric in sorted(REGISTRY.items()):
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        for key, value in sorted(metric.samples().items()):
+            if isinstance(metric, Histogram):
+                for bound, cumulative in value["buckets"].items():
+                    labels = _labels(metric.labelnames, key, [("le", bound)])
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _labels(metric.labelnames, key)
+                lines.append(f"{name}_sum{labels} {_number(value['sum'])}")
+                lines.append(f"{name}_count{labels} {value['count']}")
+            else:
+                lines.append(f"{name}{_labels(metric.labelnames, key)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+TOOL_CALLS = counter(
+    "atlassian_tool_calls_total",
+    "MCP tool calls by tool and outcome (success or error)",
+    ("tool", "outcome"),
+)
+TOOL_DURATION = histogram(
+    "atlassian_tool_duration_seconds",
+    "MCP tool call latency in seconds",
+    ("tool",),
+)
+TOOL_RESULT_BYTES = histogram(
+    "atlassian_tool_result_bytes",
+    "Size of MCP tool results in bytes, as serialised for the client",
+    ("tool",),
+    DEFAULT_SIZE_BUCKETS,
+)
+
+
+def _result_size(result: Any) -> int:
+    if isinstance(result, str):
+        return len(result.encode())
+    try:
+        return len(json.dumps(result, default=str).encode())
+    except (TypeError, ValueError):
+        return 0
+
+
+def instrument_tool(fn: F) -> F:
+    """Record call count, latency and result size of an MCP tool."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException:
+            TOOL_CALLS.inc(tool=name, outcome="error")
+            raise
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - started, tool=name)
+        outcome = "error" if isinstance(result, dict) and "error" in result else "success"
+        TOOL_CALLS.inc(tool=name, outcome=outcome)
+        TOOL_RESULT_BYTES.observe(_result_size(result), tool=name)
+        return result
+
+    return wrapper  # type: ignore[return-value]
@@ -5,12 +5,31 @@ Atlassian MCP Server
 This server provides a Model Context Protocol (MCP) interface to the Atlassian API,
 allowing large language models and AI assistants to manage Atlassian resources.
 """
+import json
 import logging
 import os
 import sys
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian import metrics
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import instrument_tool
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.compaction import compact_tool
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.deadline import deadline_tool
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.utils.io import is_read_only_mode
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.utils.tools import (
+    get_enabled_tools,
+    is_write_tool,
+    should_include_tool,
+)
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import (
+    close_http_client,
+    get_rate_limit_state,
+    open_http_client,
+)
+
 # Import tools
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.jira import attachments
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.jira import issues
@@ -28,6 +47,8 @@ from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.confluence
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.confluence import search as search_confluence
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.confluence import pages
 
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools import artifacts
+
 
 '''
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.jira import epics
@@ -43,50 +64,98 @@ from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.confluence
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger("atlassian_mcp")
+
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Open the shared Atlassian HTTP client for the lifetime of the server."""
+    await open_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+
 
 # Create server instance
-mcp = FastMCP("atlassian MCP Server")
+mcp = FastMCP("atlassian MCP Server", lifespan=app_lifespan)
+
+enabled_tools = get_enabled_tools()
+read_only = is_read_only_mode()
+
+
+def register_tool(fn: Callable[..., Awaitable[Any]]) -> None:
+    """Register a tool unless ENABLED_TOOLS excludes it or READ_ONLY_MODE forbids it."""
+    name = fn.__name__
+    if not should_include_tool(name, enabled_tools):
+        return
+    if read_only and is_write_tool(name):
+        logger.info(f"Skipping write tool {name} in read-only mode")
+        return
+    mcp.tool()(instrument_tool(deadline_tool(compact_tool(fn))))
+
 
 # Register Jira tools
-mcp.tool()(attachments.upload_attachment)
-mcp.tool()(attachments.download_attachment)
-mcp.tool()(attachments.get_issue_attachments)
-mcp.tool()(users.get_current_user_account_id)
-mcp.tool()(users.handle_user_operations)
-mcp.tool()(issues.get_issue)
-mcp.tool()(issues.get_board_issues)
-mcp.tool()(issues.get_project_issues)
-mcp.tool()(issues.create_issue)
-mcp.tool()(issues.create_issue_link)
-mcp.tool()(issues.remove_issue_link)
-mcp.tool()(search.search)
-mcp.tool()(search.search_fields)
-mcp.tool()(transitions.get_transitions)
-mcp.tool()(transitions.transition_issue)
-mcp.tool()(worklog.get_worklog)
-mcp.tool()(worklog.add_worklog)
-mcp.tool()(boards.get_agile_boards)
-mcp.tool()(sprints.get_sprints_from_board)
-mcp.tool()(sprints.create_sprint)
-mcp.tool()(sprints.update_sprint)
-mcp.tool()(links.get_link_types)
-mcp.tool()(links.link_to_epic)
+register_tool(attachments.upload_attachment)
+register_tool(attachments.download_attachment)
+register_tool(attachments.get_issue_attachments)
+register_tool(users.get_current_user_account_id)
+register_tool(users.handle_user_operations)
+register_tool(issues.get_issue)
+register_tool(issues.get_board_issues)
+register_tool(issues.get_project_issues)
+register_tool(issues.create_issue)
+register_tool(issues.create_issue_link)
+register_tool(issues.remove_issue_link)
+register_tool(search.search)
+register_tool(search.search_fields)
+register_tool(transitions.get_transitions)
+register_tool(transitions.transition_issue)
+register_tool(worklog.get_worklog)
+register_tool(worklog.add_worklog)
+register_tool(boards.get_agile_boards)
+register_tool(sprints.get_sprints_from_board)
+register_tool(sprints.create_sprint)
+register_tool(sprints.update_sprint)
+register_tool(links.get_link_types)
+register_tool(links.link_to_epic)
 
 
 # Register Confluence tools
 
-mcp.tool()(pages.get_page)
-mcp.tool()(pages.create_page)
-mcp.tool()(pages.update_page)
-mcp.tool()(pages.delete_page)
-mcp.tool()(pages.get_page_children)
-mcp.tool()(comments.get_comments)
-mcp.tool()(comments.add_comment)
-mcp.tool()(labels.add_label)
-mcp.tool()(labels.get_labels)
-mcp.tool()(search_confluence.search_confluence)
+register_tool(pages.get_page)
+register_tool(pages.create_page)
+register_tool(pages.update_page)
+register_tool(pages.delete_page)
+register_tool(pages.get_page_children)
+register_tool(comments.get_comments)
+register_tool(comments.add_comment)
+register_tool(labels.add_label)
+register_tool(labels.get_labels)
+register_tool(search_confluence.search_confluence)
+
+# Register tools over large results stored as artifacts
+register_tool(artifacts.artifact_slice)
+register_tool(artifacts.artifact_filter)
+register_tool(artifacts.artifact_aggregate)
+
+
+@mcp.resource("atlassian://rate-limits", mime_type="application/json")
+def rate_limits() -> str:
+    """Current Atlassian API rate limit budget and back-off state per site."""
+    return json.dumps(get_rate_limit_state(), indent=2)
+
+
+@mcp.resource("atlassian://metrics", mime_type="application/json")
+def server_metrics() -> str:
+    """Metrics recorded by the Atlassian API client and tools (latency, retries, cache, ...)."""
+    return json.dumps(metrics.snapshot(), indent=2)
+
+
+@mcp.resource("atlassian://metrics/prometheus", mime_type="text/plain")
+def server_metrics_prometheus() -> str:
+    """Metrics recorded by the Atlassian API client and tools, in Prometheus text format."""
+    return metrics.render_prometheus()
 
 
 '''
@@ -116,6 +185,11 @@ mcp.tool()(spaces.get_spaces)
 mcp.tool()(spaces.get_space_details)
 mcp.tool()(utils.format_page)'''
 
-# Start server when run directly
+# Start server when run directly. Logging is configured only here, so that
+# importing the server (in-process transport) leaves the host's logging alone.
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+    )
     mcp.run() 
\ No newline at end of file
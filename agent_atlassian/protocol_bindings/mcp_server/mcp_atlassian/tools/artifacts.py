@@ -0,0 +1,195 @@
+"""Tools over large results parked in the artifact store"""
+
+import json
+import logging
+from typing import Annotated, Any, Dict, List, Optional
+
+from pydantic import Field
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.artifacts import (
+    Artifact,
+    artifact_store,
+    field_values,
+    select_fields,
+    summarize,
+)
+
+logger = logging.getLogger("mcp-artifacts")
+
+OPERATORS = ("eq", "ne", "contains", "in", "gt", "gte", "lt", "lte", "exists", "missing")
+METRICS = ("count", "sum", "avg", "min", "max")
+
+
+def _get(artifact_id: str) -> Artifact:
+    artifact = artifact_store.get(artifact_id)
+    if artifact is None:
+        raise ValueError(
+            f"Artifact {artifact_id} not found or expired; run the original tool again to get a new artifact_id"
+        )
+    return artifact
+
+
+def _fields(fields: str) -> List[str]:
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(actual: Any, operator: str, expected: str) -> bool:
+    if operator in ("eq", "ne"):
+        equal = str(actual).lower() == expected.lower()
+        return equal if operator == "eq" else not equal
+    if operator == "contains":
+        return expected.lower() in str(actual).lower()
+    if operator == "in":
+        return str(actual).lower() in {v.strip().lower() for v in expected.split(",")}
+    left, right = _number(actual), _number(expected)
+    if left is None or right is None:
+        # Not numeric: compare as strings (ISO dates sort correctly)
+        left, right = str(actual), expected  # type: ignore[assignment]
+    return {
+        "gt": left > right,  # type: ignore[operator]
+        "gte": left >= right,  # type: ignore[operator]
+        "lt": left < right,  # type: ignore[operator]
+        "lte": left <= right,  # type: ignore[operator]
+    }[operator]
+
+
+def _matches(item: Any, path: str, operator: str, value: str) -> bool:
+    values = [v for v in field_values(item, path) if v is not None]
+    if operator == "exists":
+        return bool(values)
+    if operator == "missing":
+        return not values
+    if operator == "ne":
+        return all(_compare(v, "ne", value) for v in values)
+    return any(_compare(v, operator, value) for v in values)
+
+
+async def artifact_slice(
+    artifact_id: Annotated[str, Field(description="Handle returned in place of a large tool result")],
+    offset: Annotated[int, Field(description="Index of the first row (0-based)", default=0, ge=0)] = 0,
+    limit: Annotated[int, Field(description="Number of rows to return (1-100)", default=20, ge=1, le=100)] = 20,
+    fields: Annotated[
+        str,
+        Field(
+            description="(Optional) Comma-separated dotted field paths to return (e.g. 'key,summary,status.name'); all fields if empty",
+            default="",
+        ),
+    ] = "",
+) -> str:
+    """Return a page of rows from a stored large result."""
+    artifact = _get(artifact_id)
+    rows = artifact.items[offset:offset + limit]
+    paths = _fields(fields)
+    if paths:
+        rows = [select_fields(row, paths) for row in rows]
+    response: Dict[str, Any] = {
+        "artifact_id": artifact_id,
+        "offset": offset,
+        "returned": len(rows),
+        "item_count": len(artifact.items),
+        "rows": rows,
+    }
+    if offset + len(rows) < len(artifact.items):
+        response["next_offset"] = offset + len(rows)
+    return json.dumps(response, indent=2, ensure_ascii=False)
+
+
+async def artifact_filter(
+    artifact_id: Annotated[str, Field(description="Handle returned in place of a large tool result")],
+    field: Annotated[str, Field(description="Dotted field path to test (e.g. 'status.name', 'assignee.display_name')")],
+    operator: Annotated[
+        str,
+        Field(
+            description=(
+                "Comparison: eq, ne, contains (case-insensitive), in (comma-separated values), "
+                "gt, gte, lt, lte (numeric, or string order for dates), exists, missing"
+            ),
+            default="eq",
+        ),
+    ] = "eq",
+    value: Annotated[str, Field(description="Value to compare with (unused for exists/missing)", default="")] = "",
+) -> str:
+    """Select the rows of a stored large result that match a condition.
+
+    The matching rows are stored as a new artifact, so filters can be chained
+    and the result paged with artifact_slice or grouped with artifact_aggregate.
+    """
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown operator {operator}. Valid operators: {', '.join(OPERATORS)}")
+    artifact = _get(artifact_id)
+    matched = [item for item in artifact.items if _matches(item, field, operator, value)]
+    filtered = artifact_store.put(
+        artifact.tool,
+        matched,
+        {"source_artifact": artifact_id, "filter": f"{field} {operator} {value}".strip()},
+    )
+    response = summarize(filtered)
+    response["matched"] = len(matched)
+    response["source_artifact"] = artifact_id
+    return json.dumps(response, indent=2, ensure_ascii=False)
+
+
+async def artifact_aggregate(
+    artifact_id: Annotated[str, Field(description="Handle returned in place of a large tool result")],
+    group_by: Annotated[
+        str,
+        Field(description="(Optional) Dotted field path to group rows by (e.g. 'status.name'); one group if empty", default=""),
+    ] = "",
+    metric: Annotated[
+        str,
+        Field(description="Aggregate per group: count, sum, avg, min or max", default="count"),
+    ] = "count",
+    field: Annotated[
+        str,
+        Field(description="Numeric dotted field path for sum, avg, min and max", default=""),
+    ] = "",
+    limit: Annotated[int, Field(description="Maximum number of groups to return (1-200)", default=50, ge=1, le=200)] = 50,
+) -> str:
+    """Count, sum or average the rows of a stored large result, grouped by a field."""
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric}. Valid metrics: {', '.join(METRICS)}")
+    if metric != "count" and not field:
+        raise ValueError(f"The {metric} metric needs a numeric field")
+    artifact = _get(artifact_id)
+
+    groups: Dict[str, List[Any]] = {}
+    for item in artifact.items:
+        keys = field_values(item, group_by) if group_by else ["all"]
+        for key in keys or [None]:
+            groups.setdefault(json.dumps(key, default=str) if not isinstance(key, str) else key, []).append(item)
+
+    results = []
+    for key, items in groups.items():
+        entry: Dict[str, Any] = {"group": key, "count": len(items)}
+        if metric != "count":
+            numbers = [n for item in items for n in map(_number, field_values(item, field)) if n is not None]
+            if numbers:
+                entry[metric] = {
+                    "sum": sum(numbers),
+                    "avg": sum(numbers) / len(numbers),
+                    "min": min(numbers),
+                    "max": max(numbers),
+                }[metric]
+            else:
+                entry[metric] = None
+        results.append(entry)
+    results.sort(key=lambda entry: entry["count"], reverse=True)
+
+    response = {
+        "artifact_id": artifact_id,
+        "item_count": len(artifact.items),
+        "group_by": group_by or None,
+        "metric": metric,
+        "group_count": len(results),
+        "groups": results[:limit],
+    }
+    return json.dumps(response, indent=2, ensure_ascii=False)
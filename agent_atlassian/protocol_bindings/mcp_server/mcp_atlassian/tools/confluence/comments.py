@@ -5,13 +5,13 @@ from typing import Any, Annotated
 from pydantic import BaseModel, Field
 import json
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 from mcp.server.fastmcp import Context
 
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-confluence")
 
+@cached_tool(ttl=60, tags=lambda args: ["confluence:page", f"confluence:page:{args['page_id']}"])
 async def get_comments(
     page_id: str,
     limit: int = 25,
@@ -48,6 +48,7 @@ async def get_comments(
         logger.error(f"Failed to get comments for page {page_id}: {response}")
         return response
 
+@invalidates(lambda args: [f"confluence:page:{args['page_id']}"])
 async def add_comment(
     page_id: str,
     content: str
@@ -2,8 +2,6 @@
 
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-confluence")
 
 DEFAULT_PAGE_SIZE = 25
@@ -4,14 +4,14 @@ import logging
 from typing import Any, Annotated
 from pydantic import BaseModel, Field
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 import json
 from mcp.server.fastmcp import Context
 
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-confluence")
 
+@cached_tool(ttl=60, tags=lambda args: ["confluence:page", f"confluence:page:{args['page_id']}"])
 async def get_labels(
     page_id: str
 ) -> dict:
@@ -35,6 +35,7 @@ async def get_labels(
         logger.error(f"Failed to get labels for page {page_id}: {response}")
         return response
 
+@invalidates(lambda args: [f"confluence:page:{args['page_id']}", "confluence:search"])
 async def add_label(
     page_id: str,
     name: str
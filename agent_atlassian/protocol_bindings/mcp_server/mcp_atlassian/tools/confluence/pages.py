@@ -3,14 +3,14 @@
 import logging
 from typing import Any, Annotated
 from pydantic import BaseModel, Field
-from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import fetch_all, make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 import json
 from mcp.server.fastmcp import Context
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-confluence")
 
+@cached_tool(ttl=60, tags=lambda args: ["confluence:page", f"confluence:page:{args['page_id']}"])
 async def get_page(
     page_id: str = "",
     title: str = "",
@@ -51,13 +51,15 @@ async def get_page(
         logger.error(f"Failed to get page: {response}")
         return response
 
+@cached_tool(ttl=60, tags=lambda args: ["confluence:page", f"confluence:page:{args['parent_id']}"])
 async def get_page_children(
     parent_id: str,
     expand: str = "version",
     limit: int = 25,
     include_content: bool = False,
     convert_to_markdown: bool = True,
-    start: int = 0
+    start: int = 0,
+    max_results: int = 0
 ) -> dict:
     """
     Get child pages of a specific Confluence page.
@@ -69,41 +71,52 @@ async def get_page_children(
         include_content: Whether to include the page content
         convert_to_markdown: Convert content to markdown if include_content is true
         start: Starting index for pagination
+        max_results: Follow pagination and return up to this many child pages
+            (0 returns a single page of `limit` results)
 
     Returns:
         Response JSON from Confluence API or error dict
     """
-    success, response = await make_api_request(
-        endpoint=f"/rest/api/content/{parent_id}/child/page",
-        method="GET",
-        params={
-            "expand": expand,
-            "limit": limit,
-            "start": start,
-        }
-    )
+    path = f"wiki/rest/api/content/{parent_id}/child/page"
+    params = {
+        "expand": expand,
+        "limit": limit,
+        "start": start,
+    }
+    if max_results:
+        success, response = await fetch_all(path, params, items_key="results", max_items=max_results)
+    else:
+        success, response = await make_api_request(path=path, method="GET", params=params)
     
     if not success:
         logger.error(f"Failed to get child pages for {parent_id}: {response}")
         return response
 
-    # Process content if needed
+    # Process content if needed. The response may be shared with other
+    # callers (coalesced or cached), so build new page dicts instead of
+    # modifying it in place.
+    pages = response if max_results else response.get("results", [])
     if include_content and convert_to_markdown and success:
-        for page in response.get("results", []):
-            if "body" in page and "storage" in page["body"]:
-                page["content"] = page["body"]["storage"].get("value", "")
+        pages = [
+            {**page, "content": page["body"]["storage"].get("value", "")}
+            if "body" in page and "storage" in page["body"]
+            else page
+            for page in pages
+        ]
 
-    # Format result
+    # Format result; after following pagination, the page size no longer applies
     result = {
         "parent_id": parent_id,
-        "count": len(response.get("results", [])),
-        "limit": limit,
+        "count": len(pages),
         "start": start,
-        "results": response.get("results", [])
+        "results": pages
     }
+    if not max_results:
+        result["limit"] = limit
     
     return result
 
+@invalidates(lambda args: [f"confluence:page:{args['parent_id']}" if args["parent_id"] else "", "confluence:search"])
 async def create_page(
     space_key: str,
     title: str,
@@ -138,10 +151,13 @@ async def create_page(
     if parent_id:
         payload["ancestors"] = [{"id": parent_id}]
 
+    # No idempotency key: the API ignores it, so a POST retried after a
+    # timeout or 5xx could create a duplicate page. Only connection errors,
+    # raised before the request is sent, are retried.
     success, response = await make_api_request(
-        endpoint="/rest/api/content",
+        path="wiki/rest/api/content",
         method="POST",
-        json=payload
+        data=payload,
     )
 
     if success:
@@ -150,6 +166,7 @@ async def create_page(
         logger.error(f"Failed to create Confluence page: {response}")
         return response
 
+@invalidates(["confluence:page", "confluence:search"])
 async def update_page(
     page_id: str,
     title: str,
@@ -226,6 +243,7 @@ async def update_page(
         logger.error(f"Failed to update Confluence page {page_id}: {response}")
         return response
 
+@invalidates(["confluence:page", "confluence:search"])
 async def delete_page(
     page_id: str
 ) -> dict:
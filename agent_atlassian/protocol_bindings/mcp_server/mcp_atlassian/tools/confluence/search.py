@@ -4,15 +4,15 @@ import logging
 from typing import Any
 from pydantic import BaseModel
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool
 import json
 from typing import Annotated
 from pydantic import Field
 from mcp.server.fastmcp import Context
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-confluence")
 
+@cached_tool(ttl=30, tags=["confluence:search"])
 async def search_confluence(
     query: str,
     limit: int = 10,
@@ -6,10 +6,9 @@ from pathlib import Path
 from typing import Any
 from pydantic import BaseModel
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models.jira.common import JiraAttachment
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
 # Refactor download_attachment to return a JiraAttachment object
@@ -55,6 +54,7 @@ async def download_attachment(url: str, target_path: str) -> JiraAttachment:
         return None
 
 # Refactor upload_attachment to accept and return JiraAttachment objects
+@invalidates(lambda args: [f"jira:issue:{args['issue_key']}"])
 async def upload_attachment(issue_key: str, attachment: JiraAttachment) -> JiraAttachment:
     """Upload a single attachment to a Jira issue and return the updated JiraAttachment object."""
     logger.debug(f"Uploading attachment {attachment.filename} to issue {issue_key}")
@@ -87,6 +87,7 @@ async def upload_attachment(issue_key: str, attachment: JiraAttachment) -> JiraA
         logger.error(f"Error uploading attachment: {str(e)}")
         return None
 
+@cached_tool(ttl=60, tags=lambda args: ["jira:issue", f"jira:issue:{args['issue_key']}"])
 async def get_issue_attachments(issue_key: str) -> list[JiraAttachment]:
     """Retrieve all attachments for a Jira issue."""
     logger.debug(f"Fetching attachments for issue {issue_key}")
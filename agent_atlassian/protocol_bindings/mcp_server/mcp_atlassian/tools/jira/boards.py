@@ -5,13 +5,13 @@ import logging
 from typing import Annotated
 from pydantic import Field
 from mcp.server.fastmcp import Context
-from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import fetch_all, make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models.jira.agile import JiraBoard
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
+@cached_tool(ttl=300, tags=["jira:boards"])
 async def get_agile_boards(
     ctx: Context,
     board_name: Annotated[
@@ -34,7 +34,19 @@ async def get_agile_boards(
         int,
         Field(description="Maximum number of results (1-50)", default=10, ge=1, le=50),
     ] = 10,
-) -> str:
+    max_results: Annotated[
+        int,
+        Field(
+            description=(
+                "(Optional) Follow pagination and return all results up to this many "
+                "(max 5000) in one call. 0 returns a single page of 'limit' results."
+            ),
+            default=0,
+            ge=0,
+            le=5000,
+        ),
+    ] = 0,
+) -> list[JiraBoard]:
     """Get jira agile boards by name, project key, or type.
 
     Args:
@@ -44,9 +56,10 @@ async def get_agile_boards(
         board_type: Board type ('scrum' or 'kanban').
         start_at: Starting index.
         limit: Maximum results.
+        max_results: Follow pagination and return up to this many boards (0 for a single page).
 
     Returns:
-        JSON string representing a list of board objects.
+        List of JiraBoard objects.
 
     Raises:
         ValueError: If Jira client is unavailable.
@@ -59,14 +72,21 @@ async def get_agile_boards(
         "maxResults": limit,
     }
 
-    success, response = await make_api_request(
-        path="rest/agile/1.0/board",
-        method="GET",
-        params=params,
-    )
+    if max_results:
+        success, boards_data = await fetch_all(
+            "rest/agile/1.0/board", params, items_key="values", max_items=max_results
+        )
+        if not success:
+            raise ValueError(f"Failed to fetch agile boards: {boards_data}")
+    else:
+        success, response = await make_api_request(
+            path="rest/agile/1.0/board",
+            method="GET",
+            params=params,
+        )
 
-    if not success:
-        raise ValueError(f"Failed to fetch agile boards: {response}")
+        if not success:
+            raise ValueError(f"Failed to fetch agile boards: {response}")
+        boards_data = response.get("values", [])
 
-    boards_data = response.json().get("values", [])
-    return [JiraBoard(**board) for board in boards_data]
\ No newline at end of file
+    return [JiraBoard.from_api_response(board) for board in boards_data]
\ No newline at end of file
@@ -8,13 +8,13 @@ from mcp.server.fastmcp import Context
 from pydantic import Field
 from requests.exceptions import HTTPError
 
-from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import fetch_all, make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira-issues")
 
+@cached_tool(ttl=30, tags=lambda args: ["jira:issue", f"jira:issue:{args['issue_key']}"])
 async def get_issue(
     ctx: Context,
     issue_key: Annotated[str, Field(description="Jira issue key (e.g., 'PROJ-123')")],
@@ -89,6 +89,7 @@ async def get_issue(
     return json.dumps(response, indent=2, ensure_ascii=False)
 
 
+@cached_tool(ttl=30, tags=["jira:search"])
 async def get_project_issues(
     ctx: Context,
     project_key: Annotated[str, Field(description="The project key")],
@@ -100,6 +101,18 @@ async def get_project_issues(
         int,
         Field(description="Starting index for pagination (0-based)", default=0, ge=0),
     ] = 0,
+    max_results: Annotated[
+        int,
+        Field(
+            description=(
+                "(Optional) Follow pagination and return all results up to this many "
+                "(max 5000) in one call. 0 returns a single page of 'limit' results."
+            ),
+            default=0,
+            ge=0,
+            le=5000,
+        ),
+    ] = 0,
 ) -> str:
     """Get all issues for a specific Jira project."""
     params = {
@@ -108,6 +121,13 @@ async def get_project_issues(
         "startAt": start_at,
     }
 
+    if max_results:
+        success, issues = await fetch_all("rest/api/2/search", params, items_key="issues", max_items=max_results)
+        if not success:
+            raise ValueError(f"Failed to fetch project issues: {issues}")
+        response = {"startAt": start_at, "count": len(issues), "issues": issues}
+        return json.dumps(response, indent=2, ensure_ascii=False)
+
     success, response = await make_api_request(
         path="rest/api/2/search",
         method="GET",
@@ -120,6 +140,7 @@ async def get_project_issues(
     return json.dumps(response, indent=2, ensure_ascii=False)
 
 
+@cached_tool(ttl=30, tags=["jira:search"])
 async def get_board_issues(
     ctx: Context,
     board_id: Annotated[str, Field(description="The id of the board (e.g., '1001')")],
@@ -164,6 +185,18 @@ async def get_board_issues(
             default="version",
         ),
     ] = "version",
+    max_results: Annotated[
+        int,
+        Field(
+            description=(
+                "(Optional) Follow pagination and return all results up to this many "
+                "(max 5000) in one call. 0 returns a single page of 'limit' results."
+            ),
+            default=0,
+            ge=0,
+            le=5000,
+        ),
+    ] = 0,
 ) -> str:
     """Get all issues linked to a specific board filtered by JQL."""
     fields_list: Optional[List[str]] = None
@@ -178,6 +211,15 @@ async def get_board_issues(
         "expand": expand,
     }
 
+    if max_results:
+        success, issues = await fetch_all(
+            f"rest/agile/1.0/board/{board_id}/issue", params, items_key="issues", max_items=max_results
+        )
+        if not success:
+            raise ValueError(f"Failed to fetch board issues: {issues}")
+        response = {"startAt": start_at, "count": len(issues), "issues": issues}
+        return json.dumps(response, indent=2, ensure_ascii=False)
+
     success, response = await make_api_request(
         path=f"rest/agile/1.0/board/{board_id}/issue",
         method="GET",
@@ -192,6 +234,7 @@ async def get_board_issues(
 
 logger = logging.getLogger("mcp-jira-create-issue")
 
+@invalidates(["jira:search"])
 async def create_issue(
     project_key: str,
     summary: str,
@@ -256,10 +299,13 @@ async def create_issue(
 
     payload = {"fields": fields}
 
+    # No idempotency key: the API ignores it, so a POST retried after a
+    # timeout or 5xx could create a duplicate issue. Only connection errors,
+    # raised before the request is sent, are retried.
     success, response = await make_api_request(
         path="rest/api/3/issue",
         method="POST",
-        data=payload
+        data=payload,
     )
 
     if success:
@@ -268,6 +314,7 @@ async def create_issue(
         logger.error(f"Failed to create Jira issue: {response}")
         return response
 
+@invalidates(["jira:search"])
 async def batch_create_issues(
     ctx: Context,
     issues: Annotated[
@@ -387,6 +434,7 @@ async def batch_create_issues(
         logger.error(f"Failed to create Jira issues in batch: {response}")
         return json.dumps(response, indent=2, ensure_ascii=False)
 
+@invalidates(lambda args: [f"jira:issue:{args['inward_issue_key']}", f"jira:issue:{args['outward_issue_key']}"])
 async def create_issue_link(
     ctx: Context,
     link_type: Annotated[
@@ -461,6 +509,7 @@ async def create_issue_link(
         logger.error(f"Failed to create issue link: {response}")
         return json.dumps(response, indent=2, ensure_ascii=False)
 
+@invalidates(["jira:issue"])
 async def remove_issue_link(
     ctx: Context,
     link_id: Annotated[str, Field(description="The ID of the link to remove")],
@@ -577,6 +626,7 @@ async def batch_get_changelogs(
     
     return json.dumps(results, indent=2, ensure_ascii=False)
 
+@invalidates(lambda args: [f"jira:issue:{args['issue_key']}", "jira:search"])
 async def delete_issue(
     issue_key: str,
     delete_subtasks: bool = False
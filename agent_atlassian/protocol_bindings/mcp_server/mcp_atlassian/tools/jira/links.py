@@ -6,13 +6,13 @@ from typing import Any
 from pydantic import Field
 from typing_extensions import Annotated
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 from mcp.server.fastmcp import Context
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models.jira.link import JiraIssueLinkType
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
+@cached_tool(ttl=3600, tags=["jira:link-types"])
 async def get_link_types(ctx: Context) -> str:
     """Get all available issue link types.
 
@@ -28,6 +28,7 @@ async def get_link_types(ctx: Context) -> str:
     link_types_data = response.json().get("issueLinkTypes", [])
     return json.dumps([JiraIssueLinkType(**link) for link in link_types_data], indent=2, ensure_ascii=False)
 
+@invalidates(lambda args: [f"jira:issue:{args['issue_key']}", f"jira:issue:{args['epic_key']}", "jira:search"])
 async def link_to_epic(
     ctx: Context,
     issue_key: Annotated[
@@ -4,17 +4,17 @@ import logging
 import json
 from typing import Any, List, Optional
 from pydantic import BaseModel
-from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import fetch_all, make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool
 from mcp.server.fastmcp import Context
-from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models.jira.search import JiraSearchResult
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models.jira.issue import JiraIssue
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
 DEFAULT_READ_JIRA_FIELDS = ["summary", "status", "assignee", "priority"]
 
-# Example usage of JiraSearchResult model in search
+# Each matching issue is returned as a JiraIssue model
+@cached_tool(ttl=30, tags=["jira:search"])
 async def search(
     ctx: Context,
     jql: str,
@@ -23,7 +23,8 @@ async def search(
     start_at: int = 0,
     projects_filter: Optional[str] = "",
     expand: Optional[str] = "",
-) -> list[JiraSearchResult]:
+    max_results: int = 0,
+) -> list[JiraIssue]:
     """Search Jira issues using JQL (Jira Query Language).
 
     Args:
@@ -34,9 +35,11 @@ async def search(
         start_at: Starting index for pagination.
         projects_filter: Comma-separated list of project keys to filter by.
         expand: Optional fields to expand.
+        max_results: Follow pagination and return up to this many issues
+            (0 returns a single page of `limit` results).
 
     Returns:
-        List of JiraSearchResult objects representing the search results.
+        List of JiraIssue objects, one per matching issue.
     """
     fields_list: Optional[List[str]] = None
     if fields and fields != "*all":
@@ -51,18 +54,26 @@ async def search(
         "projectsFilter": projects_filter,
     }
 
-    success, response = await make_api_request(
-        path="rest/api/2/search",
-        method="GET",
-        params=params,
-    )
-
-    if not success:
-        raise ValueError(f"Failed to search Jira issues: {response}")
-
-    search_results = response.json().get("issues", [])
-    return [JiraSearchResult(**issue) for issue in search_results]
-
+    if max_results:
+        success, search_results = await fetch_all(
+            "rest/api/2/search", params, items_key="issues", max_items=max_results
+        )
+        if not success:
+            raise ValueError(f"Failed to search Jira issues: {search_results}")
+    else:
+        success, response = await make_api_request(
+            path="rest/api/2/search",
+            method="GET",
+            params=params,
+        )
+
+        if not success:
+            raise ValueError(f"Failed to search Jira issues: {response}")
+        search_results = response.get("issues", [])
+
+    return [JiraIssue.from_api_response(issue, requested_fields=fields) for issue in search_results]
+
+@cached_tool(ttl=3600, tags=["jira:fields"])
 async def search_fields(
     ctx: Context,
     keyword: Optional[str] = "",
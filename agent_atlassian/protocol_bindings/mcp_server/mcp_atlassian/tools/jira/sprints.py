@@ -5,13 +5,13 @@ import json
 from typing import Any
 from pydantic import BaseModel, Field
 from typing_extensions import Annotated
-from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import fetch_all, make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 from mcp.server.fastmcp import Context
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
+@cached_tool(ttl=120, tags=["jira:sprints"])
 async def get_sprints_from_board(
     ctx: Context,
     board_id: Annotated[str, Field(description="The id of board (e.g., '1000')")],
@@ -27,6 +27,18 @@ async def get_sprints_from_board(
         int,
         Field(description="Maximum number of results (1-50)", default=10, ge=1, le=50),
     ] = 10,
+    max_results: Annotated[
+        int,
+        Field(
+            description=(
+                "(Optional) Follow pagination and return all results up to this many "
+                "(max 5000) in one call. 0 returns a single page of 'limit' results."
+            ),
+            default=0,
+            ge=0,
+            le=5000,
+        ),
+    ] = 0,
 ) -> str:
     """Get jira sprints from board by state.
 
@@ -36,6 +48,7 @@ async def get_sprints_from_board(
         state: Sprint state ('active', 'future', 'closed'). If None, returns all sprints.
         start_at: Starting index.
         limit: Maximum results.
+        max_results: Follow pagination and return up to this many sprints (0 for a single page).
 
     Returns:
         JSON string representing a list of sprint objects.
@@ -45,11 +58,22 @@ async def get_sprints_from_board(
         "startAt": start_at,
         "maxResults": limit,
     }
-    response = await make_api_request(ctx, f"/rest/agile/1.0/board/{board_id}/sprint", params=params, method='GET')
-    if not response or response.status_code != 200:
+    if max_results:
+        success, sprints = await fetch_all(
+            f"rest/agile/1.0/board/{board_id}/sprint", params, items_key="values", max_items=max_results
+        )
+        response = {"startAt": start_at, "count": len(sprints), "values": sprints} if success else sprints
+    else:
+        success, response = await make_api_request(
+            path=f"rest/agile/1.0/board/{board_id}/sprint",
+            method="GET",
+            params=params,
+        )
+    if not success:
         raise ValueError(f"Failed to fetch sprints for board {board_id}. Response: {response}")
-    return json.dumps(response.json(), indent=2, ensure_ascii=False)
+    return json.dumps(response, indent=2, ensure_ascii=False)
 
+@invalidates(["jira:sprints"])
 async def create_sprint(
     ctx: Context,
     board_id: Annotated[str, Field(description="The id of board (e.g., '1000')")],
@@ -91,6 +115,7 @@ async def create_sprint(
         raise ValueError(f"Failed to create sprint for board {board_id}. Response: {response}")
     return json.dumps(response.json(), indent=2, ensure_ascii=False)
 
+@invalidates(["jira:sprints", "jira:search"])
 async def update_sprint(
     ctx: Context,
     sprint_id: Annotated[str, Field(description="The id of sprint (e.g., '10001')")],
@@ -7,11 +7,11 @@ from typing import Annotated, Optional, Any, Dict
 from mcp.server.fastmcp import Context
 from pydantic import Field
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
+@cached_tool(ttl=60, tags=lambda args: ["jira:issue", f"jira:issue:{args['issue_key']}"])
 async def get_transitions(
     ctx: Context,
     issue_key: Annotated[str, Field(description="Jira issue key (e.g., 'PROJ-123')")],
@@ -35,6 +35,7 @@ async def get_transitions(
 
     return json.dumps(response, indent=2, ensure_ascii=False)
 
+@invalidates(lambda args: [f"jira:issue:{args['issue_key']}", "jira:search"])
 async def transition_issue(
     ctx: Context,
     issue_key: Annotated[str, Field(description="Jira issue key (e.g., 'PROJ-123')")],
@@ -10,9 +10,8 @@ from requests.exceptions import HTTPError
 
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.exceptions import MCPAtlassianAuthenticationError
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("mcp-jira")
 
 class JiraUser(BaseModel):
@@ -23,6 +22,7 @@ class JiraUser(BaseModel):
     active: bool
     timeZone: str
 
+@cached_tool(ttl=600, tags=["jira:users"])
 async def handle_user_operations(
     action: str,
     ctx: Context = None,
@@ -103,6 +103,7 @@ async def handle_user_operations(
 
     return json.dumps(response_data, indent=2, ensure_ascii=False)
 
+@cached_tool(ttl=3600, tags=["jira:users"])
 async def get_current_user_account_id() -> str:
     """Get the account ID of the current user."""
     logger.debug("Fetching current user account ID")
@@ -6,11 +6,13 @@ from typing import Annotated, Any, Optional
 from pydantic import Field, BaseModel
 from mcp.server.fastmcp import Context
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import cached_tool, invalidates
 from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.models.jira.worklog import JiraWorklog
 
 # Configure logging
 logger = logging.getLogger("mcp-jira-worklog")
 
+@cached_tool(ttl=60, tags=lambda args: ["jira:issue", f"jira:issue:{args['issue_key']}"])
 async def get_worklog(
     ctx: Context,
     issue_key: Annotated[str, Field(description="Jira issue key (e.g., 'PROJ-123')")],
@@ -30,6 +32,7 @@ async def get_worklog(
     worklogs_data = response.json().get("worklogs", [])
     return [JiraWorklog(**worklog) for worklog in worklogs_data]
 
+@invalidates(lambda args: [f"jira:issue:{args['issue_key']}"])
 async def add_worklog(
     ctx: Context,
     issue_key: Annotated[str, Field(description="Jira issue key (e.g., 'PROJ-123')")],
@@ -5,6 +5,26 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# Tools that change Jira or Confluence; not registered in read-only mode
+WRITE_TOOLS = frozenset(
+    {
+        "upload_attachment",
+        "create_issue",
+        "create_issue_link",
+        "remove_issue_link",
+        "transition_issue",
+        "add_worklog",
+        "create_sprint",
+        "update_sprint",
+        "link_to_epic",
+        "create_page",
+        "update_page",
+        "delete_page",
+        "add_comment",
+        "add_label",
+    }
+)
+
 
 def get_enabled_tools() -> list[str] | None:
     """Get the list of enabled tools from environment variable.
@@ -61,3 +81,8 @@ def should_include_tool(tool_name: str, enabled_tools: list[str] | None) -> bool
         f"Tool '{tool_name}' included: {should_include} (based on enabled_tools: {enabled_tools})"
     )
     return should_include
+
+
+def is_write_tool(tool_name: str) -> bool:
+    """Check if a tool changes Jira or Confluence content."""
+    return tool_name in WRITE_TOOLS
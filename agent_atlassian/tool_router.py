@@ -0,0 +1,181 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per-query selection of the MCP tools bound to the LLM.
+
+Every tool bound to the model sends its JSON schema with each LLM call.
+The router picks the tool groups a user turn is about (Jira issues, agile
+boards and sprints, Confluence, users, stored artifacts) by keyword and
+issue-key matching, leaves out write tools unless the turn or the recent
+conversation asks for a change (so a bare "yes, go ahead" can carry out the
+change the agent proposed), and applies the ``ENABLED_TOOLS`` and
+``READ_ONLY_MODE`` filters. When a turn matches no group, the recent
+conversation is tried, and then all tools, write tools included, are bound,
+so routing never leaves the model without a tool it may need.
+
+Subsets are memoized per tool list, so an agent compiled for a subset can
+be cached and reused (see ``agent_cache``). Tools are returned in name
+order, so the schemas at the start of the prompt are byte-identical across
+turns and stay in the provider's prompt cache (see ``prompt_cache``).
+
+Configuration (environment variables):
+    ATLASSIAN_TOOL_ROUTING: Set to false to always bind all tools (default: true)
+"""
+
+import logging
+import os
+import re
+import threading
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from langchain_core.tools import BaseTool
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.metrics import counter, histogram
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.utils.io import is_read_only_mode
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.utils.tools import (
+    get_enabled_tools,
+    is_write_tool,
+    should_include_tool,
+)
+
+logger = logging.getLogger(__name__)
+
+TOOL_ROUTES = counter(
+    "atlassian_tool_router_routes_total",
+    "User turns routed by the selected tool groups ('all' when routing fell back to every tool)",
+    ("groups",),
+)
+TOOLS_BOUND = histogram(
+    "atlassian_tool_router_tools_bound",
+    "Number of tools bound to the LLM per user turn",
+    (),
+    (1, 2, 4, 6, 8, 12, 16, 24, 32, 48),
+)
+
+# Group -> (keywords, tool names)
+TOOL_GROUPS: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {
+    "jira": (
+        frozenset({
+            "jira", "issue", "issues", "ticket", "tickets", "bug", "bugs", "story", "stories", "task", "tasks",
+            "epic", "epics", "subtask", "jql", "priority", "status", "resolved", "unresolved", "blocker",
+            "project", "projects", "worklog", "worklogs", "logged", "estimate", "transition", "transitions",
+            "attachment", "attachments", "attach", "link", "links", "linked", "due", "field", "fields",
+        }),
+        frozenset({
+            "get_issue", "search", "search_fields", "get_project_issues", "create_issue", "create_issue_link",
+            "remove_issue_link", "get_transitions", "transition_issue", "get_worklog", "add_worklog",
+            "get_link_types", "link_to_epic", "get_issue_attachments", "upload_attachment", "download_attachment",
+        }),
+    ),
+    "agile": (
+        frozenset({"sprint", "sprints", "board", "boards", "scrum", "kanban", "backlog", "velocity", "iteration"}),
+        frozenset({"get_agile_boards", "get_sprints_from_board", "create_sprint", "update_sprint", "get_board_issues"}),
+    ),
+    "confluence": (
+        frozenset({
+            "confluence", "wiki", "page", "pages", "space", "spaces", "doc", "docs", "document", "documents",
+            "documentation", "article", "articles", "runbook", "runbooks", "cql", "label", "labels",
+        }),
+        frozenset({
+            "get_page", "create_page", "update_page", "delete_page", "get_page_children", "get_comments",
+            "add_comment", "add_label", "get_labels", "search_confluence",
+        }),
+    ),
+    "users": (
+        frozenset({"user", "users", "account", "me", "my", "mine", "who", "assignee", "assigned", "assign", "reporter", "email"}),
+        frozenset({"get_current_user_account_id", "handle_user_operations"}),
+    ),
+    "artifacts": (
+        frozenset({"artifact", "artifacts"}),
+        frozenset({"artifact_slice", "artifact_filter", "artifact_aggregate"}),
+    ),
+}
+
+# Words asking for a change; without one, write tools are left out
+WRITE_INTENT = frozenset({
+    "create", "add", "new", "open", "file", "raise", "update", "edit", "change", "set", "move", "transition",
+    "assign", "reassign", "close", "resolve", "reopen", "delete", "remove", "link", "log", "upload", "attach",
+    "comment", "rename", "start", "complete", "label", "write", "publish", "post",
+})
+
+ISSUE_KEY = re.compile(r"\b[A-Z][A-Z0-9]+-\d+\b")
+ARTIFACT_ID = re.compile(r"\bart_[0-9a-f]{12}\b")
+WORD = re.compile(r"[a-z0-9_]+")
+
+
+def routing_enabled() -> bool:
+    return os.getenv("ATLASSIAN_TOOL_ROUTING", "true").lower() not in ("false", "0", "no")
+
+
+def match_groups(text: str) -> FrozenSet[str]:
+    """Return the tool groups a piece of text is about."""
+    words = set(WORD.findall(text.lower()))
+    groups = {group for group, (keywords, _) in TOOL_GROUPS.items() if words & keywords}
+    if ISSUE_KEY.search(text):
+        groups.add("jira")
+    if ARTIFACT_ID.search(text):
+        groups.add("artifacts")
+    return frozenset(groups)
+
+
+def wants_write(text: str) -> bool:
+    return bool(set(WORD.findall(text.lower())) & WRITE_INTENT)
+
+
+class ToolRouter:
+    """Selects and memoizes tool subsets from one list of tools."""
+
+    def __init__(self, tools: Sequence[BaseTool]) -> None:
+        self.tools = tools
+        self._subsets: Dict[Tuple[FrozenSet[str], bool], List[BaseTool]] = {}
+        self._lock = threading.Lock()
+
+    def _allowed(self, name: str, groups: FrozenSet[str], write: bool, enabled: List[str]) -> bool:
+        if not should_include_tool(name, enabled):
+            return False
+        if is_write_tool(name) and not write:
+            return False
+        return not groups or any(name in TOOL_GROUPS[group][1] for group in groups)
+
+    def select(self, query: str, context: str = "") -> List[BaseTool]:
+        """Return the tools to bind for a user turn.
+
+        Args:
+            query: The user's message
+            context: Recent conversation, used when the message alone matches no
+                group, and for the change a confirmation like "do it" refers to
+        """
+        groups = match_groups(query) or match_groups(context)
+        write = wants_write(query) or wants_write(context) or not groups
+        if not routing_enabled():
+            groups, write = frozenset(), True
+        write = write and not is_read_only_mode()
+        key = (groups, write)
+        with self._lock:
+            subset = self._subsets.get(key)
+            if subset is None:
+                enabled = get_enabled_tools()
+                subset = sorted(
+                    (tool for tool in self.tools if self._allowed(tool.name, groups, write, enabled)),
+                    key=lambda tool: tool.name,
+                )
+                self._subsets[key] = subset
+        TOOL_ROUTES.inc(groups="+".join(sorted(groups)) or "all")
+        TOOLS_BOUND.observe(len(subset))
+        logger.debug(f"Routed turn to groups {sorted(groups) or 'all'} (write={write}): {len(subset)} tools")
+        return subset
+
+
+_routers: Dict[int, ToolRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def route_tools(tools: Sequence[BaseTool], query: str, context: str = "") -> List[BaseTool]:
+    """Select the tools for a user turn, memoizing subsets per tool list."""
+    with _routers_lock:
+        router = _routers.get(id(tools))
+        if router is None or router.tools is not tools:
+            router = _routers[id(tools)] = ToolRouter(tools)
+            while len(_routers) > 8:
+                del _routers[next(iter(_routers))]
+    return router.select(query, context)
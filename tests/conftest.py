@@ -0,0 +1,30 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import httpx
+import pytest
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api import client
+
+
+@pytest.fixture
+def atlassian_api(monkeypatch):
+    """Answer the API client's requests with a handler instead of Atlassian.
+
+    Call the fixture with a function taking an ``httpx.Request`` and
+    returning an ``httpx.Response``.
+    """
+    monkeypatch.setenv("ATLASSIAN_TOKEN", "token")
+    monkeypatch.setenv("ATLASSIAN_EMAIL", "agent@example.com")
+    monkeypatch.setenv("ATLASSIAN_API_URL", "https://example.atlassian.net")
+    monkeypatch.setenv("ATLASSIAN_TOOL_CACHE", "false")
+    monkeypatch.delenv("ATLASSIAN_CACHE_DB", raising=False)
+    monkeypatch.setattr(client, "_http_client", None)
+    monkeypatch.setattr(client, "_response_cache", None)
+
+    def serve(handler):
+        monkeypatch.setattr(
+            client, "_build_http_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+    return serve
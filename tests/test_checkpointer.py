@@ -0,0 +1,93 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import operator
+from types import SimpleNamespace
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from agent_atlassian import checkpointer as checkpointer_module
+from agent_atlassian.checkpointer import BoundedCheckpointer
+
+
+class State(TypedDict):
+    turns: Annotated[List[str], operator.add]
+
+
+def build_graph(saver):
+    graph = StateGraph(State)
+    graph.add_node("reply", lambda state: {"turns": ["reply"]})
+    graph.add_edge(START, "reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=saver)
+
+
+def config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def stored(saver, thread_id):
+    """Whether the wrapped saver still holds the thread (without touching it)."""
+    return saver.inner.get_tuple(config(thread_id)) is not None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(checkpointer_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_least_recently_used_thread_is_evicted():
+    saver = BoundedCheckpointer(InMemorySaver(), ttl=0, max_threads=2)
+    graph = build_graph(saver)
+    graph.invoke({"turns": ["a"]}, config("a"))
+    graph.invoke({"turns": ["b"]}, config("b"))
+    # Reading "a" makes "b" the least recently used
+    assert graph.get_state(config("a")).values["turns"] == ["a", "reply"]
+    graph.invoke({"turns": ["c"]}, config("c"))
+
+    assert stored(saver, "a")
+    assert not stored(saver, "b")
+    assert stored(saver, "c")
+    assert saver.stats()["threads"] == 2
+
+
+def test_idle_thread_expires_after_the_ttl(clock):
+    saver = BoundedCheckpointer(InMemorySaver(), ttl=60, max_threads=0)
+    graph = build_graph(saver)
+    graph.invoke({"turns": ["a"]}, config("a"))
+    clock[0] += 30
+    graph.invoke({"turns": ["b"]}, config("b"))
+    clock[0] += 31
+
+    graph.invoke({"turns": ["b2"]}, config("b"))
+
+    assert not stored(saver, "a")
+    assert stored(saver, "b")
+
+
+def test_expired_thread_starts_over_when_used_again(clock):
+    saver = BoundedCheckpointer(InMemorySaver(), ttl=60, max_threads=0)
+    graph = build_graph(saver)
+
+    async def scenario():
+        await graph.ainvoke({"turns": ["first"]}, config("a"))
+        clock[0] += 61
+        return await graph.ainvoke({"turns": ["second"]}, config("a"))
+
+    assert asyncio.run(scenario())["turns"] == ["second", "reply"]
+
+
+def test_deleted_thread_is_no_longer_tracked():
+    saver = BoundedCheckpointer(InMemorySaver(), ttl=0, max_threads=10)
+    build_graph(saver).invoke({"turns": ["a"]}, config("a"))
+
+    saver.delete_thread("a")
+
+    assert not stored(saver, "a")
+    assert saver.stats()["threads"] == 0
@@ -0,0 +1,85 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+
+import httpx
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.compaction import compact_tool, project
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.confluence.pages import get_page_children
+
+CHILDREN = [
+    {
+        "id": str(100 + n),
+        "type": "page",
+        "status": "current",
+        "title": f"Child {n}",
+        "version": {"number": 1},
+        "_links": {"self": f"https://example.atlassian.net/wiki/rest/api/content/{100 + n}"},
+        "_expandable": {"ancestors": ""},
+    }
+    for n in range(60)
+]
+
+
+def children_page(request):
+    start = int(request.url.params["start"])
+    limit = int(request.url.params["limit"])
+    return httpx.Response(
+        200,
+        json={
+            "results": CHILDREN[start:start + limit],
+            "start": start,
+            "limit": limit,
+            "size": len(CHILDREN[start:start + limit]),
+            "_links": {"next": f"/rest/api/content/9/child/page?start={start + limit}"},
+        },
+    )
+
+
+def test_paginated_result_keeps_tool_keys_and_drops_page_size(atlassian_api, monkeypatch):
+    monkeypatch.setenv("ATLASSIAN_PAGE_SIZE", "25")
+    monkeypatch.setenv("ATLASSIAN_TOOL_OUTPUT_MAX_BYTES", "0")
+    atlassian_api(children_page)
+
+    result = json.loads(asyncio.run(compact_tool(get_page_children)(parent_id="9", max_results=55)))
+
+    assert result["parent_id"] == "9"
+    assert result["count"] == 55
+    assert result["start"] == 0
+    assert "limit" not in result
+    assert [page["title"] for page in result["results"]] == [f"Child {n}" for n in range(55)]
+    assert "_links" not in json.dumps(result)
+
+
+def test_single_page_keeps_every_top_level_key():
+    sprints = {
+        "maxResults": 2,
+        "startAt": 0,
+        "isLast": False,
+        "self": "https://example.atlassian.net/rest/agile/1.0/board/7/sprint",
+        "values": [
+            {
+                "id": 1,
+                "self": "https://example.atlassian.net/rest/agile/1.0/sprint/1",
+                "state": "active",
+                "name": "Sprint 1",
+                "originBoardId": 7,
+            }
+        ],
+    }
+
+    projected = project(sprints)
+
+    assert projected["isLast"] is False
+    assert projected["maxResults"] == 2
+    assert projected["startAt"] == 0
+    assert "self" not in projected
+    assert projected["values"][0]["name"] == "Sprint 1"
+    assert "self" not in projected["values"][0]
+
+
+def test_paginated_project_drops_page_size():
+    projected = project({"startAt": 0, "maxResults": 50, "total": 120, "issues": []}, paginated=True)
+    assert projected == {"startAt": 0, "total": 120, "issues": []}
@@ -0,0 +1,69 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+
+from agent_atlassian.history import compact_messages, history_compaction_hook
+
+
+def turn(n, result_chars=4000):
+    """One turn: a question, a tool call, its result and the answer."""
+    call_id = f"call-{n}"
+    return [
+        HumanMessage(content=f"question {n}", id=f"h{n}"),
+        AIMessage(content="", tool_calls=[{"name": "search", "args": {"jql": str(n)}, "id": call_id}], id=f"c{n}"),
+        ToolMessage(content="x" * result_chars, tool_call_id=call_id, id=f"t{n}"),
+        AIMessage(content=f"answer {n}", id=f"a{n}"),
+    ]
+
+
+def conversation(turns, result_chars=4000):
+    return [message for n in range(turns) for message in turn(n, result_chars)]
+
+
+def assert_tool_calls_answered(messages):
+    """Every tool call has a result after it, and every result follows its call."""
+    calls = set()
+    for message in messages:
+        if isinstance(message, AIMessage):
+            calls.update(call["id"] for call in message.tool_calls)
+        elif isinstance(message, ToolMessage):
+            assert message.tool_call_id in calls
+    answered = {message.tool_call_id for message in messages if isinstance(message, ToolMessage)}
+    assert calls == answered
+
+
+def test_history_within_budget_is_left_alone():
+    assert compact_messages(conversation(3, result_chars=100), max_tokens=12000) is None
+
+
+def test_old_tool_results_are_cut_to_an_excerpt():
+    messages = conversation(4)
+    compacted = compact_messages(messages, max_tokens=3000, keep_turns=2, excerpt_chars=200)
+
+    assert len(compacted) == len(messages)
+    assert_tool_calls_answered(compacted)
+    old_results = [m for m in compacted[:8] if isinstance(m, ToolMessage)]
+    assert all(m.response_metadata["elided_chars"] == 3800 for m in old_results)
+    # The kept turns are untouched
+    assert compacted[8:] == messages[8:]
+
+
+def test_oldest_turns_are_dropped_whole():
+    messages = conversation(6)
+    compacted = compact_messages(messages, max_tokens=2500, keep_turns=2, excerpt_chars=200)
+
+    assert isinstance(compacted[0], HumanMessage)
+    assert len(compacted) % 4 == 0 and len(compacted) < len(messages)
+    assert_tool_calls_answered(compacted)
+    assert compacted[-8:] == messages[-8:]
+
+
+def test_hook_replaces_the_stored_history():
+    hook = history_compaction_hook(max_tokens=3000, keep_turns=2, excerpt_chars=200)
+
+    update = hook({"messages": conversation(4)})
+
+    assert isinstance(update["messages"][0], RemoveMessage)
+    assert_tool_calls_answered(update["messages"][1:])
+    assert hook({"messages": conversation(1, result_chars=100)}) == {"messages": []}
@@ -0,0 +1,68 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import httpx
+import pytest
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.jira.boards import get_agile_boards
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.tools.jira.search import search
+
+ISSUES = [
+    {
+        "id": str(10000 + n),
+        "key": f"PROJ-{n}",
+        "self": f"https://example.atlassian.net/rest/api/2/issue/{10000 + n}",
+        "fields": {
+            "summary": f"Issue {n}",
+            "status": {"name": "In Progress", "statusCategory": {"key": "indeterminate", "name": "In Progress"}},
+            "assignee": {"accountId": "abc", "displayName": "Jane Doe"},
+            "priority": {"id": "3", "name": "Medium"},
+        },
+    }
+    for n in range(1, 4)
+]
+
+BOARDS = [
+    {"id": 0, "self": "https://example.atlassian.net/rest/agile/1.0/board/0", "name": "PROJ board", "type": "scrum"},
+    {"id": 7, "self": "https://example.atlassian.net/rest/agile/1.0/board/7", "name": "OPS board", "type": "kanban"},
+]
+
+
+def page(request, items, items_key):
+    """Answer an offset-paginated request from a list of items."""
+    size_key = "limit" if "wiki/" in request.url.path else "maxResults"
+    start = int(request.url.params.get("startAt", 0))
+    size = int(request.url.params.get(size_key, 50))
+    chunk = items[start:start + size]
+    return httpx.Response(
+        200,
+        json={"startAt": start, "maxResults": size, "total": len(items), "isLast": start + size >= len(items),
+              items_key: chunk},
+    )
+
+
+@pytest.mark.parametrize("max_results", [0, 10])
+def test_search_returns_the_issues(atlassian_api, monkeypatch, max_results):
+    monkeypatch.setenv("ATLASSIAN_PAGE_SIZE", "2")
+    atlassian_api(lambda request: page(request, ISSUES, "issues"))
+    issues = asyncio.run(search(None, jql="project = PROJ", max_results=max_results))
+
+    assert [issue.key for issue in issues] == ["PROJ-1", "PROJ-2", "PROJ-3"]
+    simplified = issues[0].to_simplified_dict()
+    assert simplified["summary"] == "Issue 1"
+    assert simplified["status"]["name"] == "In Progress"
+    assert simplified["assignee"]["display_name"] == "Jane Doe"
+
+
+@pytest.mark.parametrize("max_results", [0, 10])
+def test_get_agile_boards_returns_the_boards(atlassian_api, monkeypatch, max_results):
+    monkeypatch.setenv("ATLASSIAN_PAGE_SIZE", "1")
+    atlassian_api(lambda request: page(request, BOARDS, "values"))
+    boards = asyncio.run(get_agile_boards(None, max_results=max_results))
+
+    assert [board.to_simplified_dict() for board in boards] == [
+        {"id": "0", "name": "PROJ board", "type": "scrum"},
+        {"id": "7", "name": "OPS board", "type": "kanban"},
+    ]
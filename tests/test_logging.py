@@ -0,0 +1,33 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import logging
+import subprocess
+import sys
+
+import httpx
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import make_api_request
+
+
+def test_importing_the_server_does_not_enable_debug_logging():
+    # In a fresh interpreter: pytest configures the root logger itself
+    script = (
+        "import logging\n"
+        "import agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.server\n"
+        "print(logging.getLevelName(logging.getLogger().getEffectiveLevel()))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() != "DEBUG"
+
+
+def test_request_log_redacts_credentials(atlassian_api, caplog):
+    atlassian_api(lambda request: httpx.Response(200, json={"accountId": "abc"}))
+    caplog.set_level(logging.DEBUG, logger="atlassian_mcp")
+
+    success, _ = asyncio.run(make_api_request("rest/api/2/myself"))
+
+    assert success
+    assert "Request headers" in caplog.text
+    assert "Basic" not in caplog.text
@@ -0,0 +1,76 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import httpx
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.client import fetch_all
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.pagination import PageRequest, remaining_pages
+
+ISSUES = [{"id": str(n), "key": f"PROJ-{n}"} for n in range(230)]
+
+
+def search_api(requests, cap=50, short=None):
+    """Jira search that caps maxResults at ``cap`` but echoes the requested size.
+
+    ``short`` maps an offset to the number of items returned there, to cut a
+    page short before the total is reached. Later pages answer first, so
+    fanned-out pages complete out of order.
+    """
+    short = short or {}
+
+    async def handler(request):
+        start = int(request.url.params.get("startAt", 0))
+        requested = int(request.url.params["maxResults"])
+        requests.append((start, requested))
+        await asyncio.sleep(0.001 * (len(ISSUES) - start) / 50)
+        size = short.get(start, min(requested, cap))
+        return httpx.Response(
+            200,
+            json={"startAt": start, "maxResults": requested, "total": len(ISSUES), "issues": ISSUES[start:start + size]},
+        )
+
+    return handler
+
+
+def test_fanout_pages_are_reassembled_in_order_despite_a_server_cap(atlassian_api):
+    requests = []
+    atlassian_api(search_api(requests))
+
+    success, issues = asyncio.run(fetch_all("rest/api/2/search", {"jql": "project = PROJ"}, page_size=100, fanout=4))
+
+    assert success
+    assert issues == ISSUES
+    assert sorted(start for start, _ in requests) == [0, 50, 100, 150, 200]
+
+
+def test_short_page_before_the_total_is_filled_in(atlassian_api):
+    requests = []
+    atlassian_api(search_api(requests, short={100: 20}))
+
+    success, issues = asyncio.run(fetch_all("rest/api/2/search", {"jql": "project = PROJ"}, page_size=50, fanout=4))
+
+    assert success
+    assert issues == ISSUES
+    assert (120, 30) in requests
+
+
+def test_max_items_stops_at_the_requested_count(atlassian_api):
+    requests = []
+    atlassian_api(search_api(requests))
+
+    success, issues = asyncio.run(fetch_all("rest/api/2/search", {"jql": "project = PROJ"}, max_items=120, fanout=4))
+
+    assert success
+    assert issues == ISSUES[:120]
+    assert sorted(requests) == [(0, 50), (50, 50), (100, 20)]
+
+
+def test_remaining_pages_stride_ignores_requested_and_echoed_size():
+    request = PageRequest("rest/api/2/search", {"jql": "x", "startAt": 0, "maxResults": 100})
+    first = {"startAt": 0, "maxResults": 100, "total": 130, "issues": ISSUES[:50]}
+
+    pages = remaining_pages(request, first, first["issues"])
+
+    assert [(page.params["startAt"], page.params["maxResults"]) for page in pages] == [(50, 50), (100, 30)]
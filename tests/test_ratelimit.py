@@ -0,0 +1,45 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.ratelimit import SiteRateLimiter
+
+
+async def acquire_many(limiter, count, timeout=None):
+    """Acquire ``count`` tokens concurrently and return how many were granted in time."""
+
+    async def acquire():
+        try:
+            await asyncio.wait_for(limiter.acquire(), timeout)
+            return 1
+        except asyncio.TimeoutError:
+            return 0
+
+    return sum(await asyncio.gather(*(acquire() for _ in range(count))))
+
+
+def test_limiter_is_usable_from_successive_event_loops():
+    limiter = SiteRateLimiter("example.atlassian.net", rate=1000, burst=1)
+    # Callers queue on the lock in both loops
+    assert asyncio.run(acquire_many(limiter, 5)) == 5
+    assert asyncio.run(acquire_many(limiter, 5)) == 5
+    assert limiter.waiting == 0
+
+
+def test_loops_in_different_threads_share_one_budget():
+    limiter = SiteRateLimiter("example.atlassian.net", rate=0.001, burst=10)
+    granted = []
+
+    def run():
+        granted.append(asyncio.run(acquire_many(limiter, 5, timeout=0.2)))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == 4
+    assert sum(granted) == 10
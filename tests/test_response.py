@@ -0,0 +1,65 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent_atlassian.protocol_bindings.a2a_server.response import infer_response, structured_response_mode
+
+
+def status_of(text: str) -> str:
+    response = infer_response([HumanMessage(content="question"), AIMessage(content=text)])
+    assert response is not None
+    return response.status
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Sorry, I couldn't find any issues matching that JQL.",
+        "I could not find any Confluence pages labelled runbook in the OPS space.",
+        "I was unable to find any open bugs assigned to you.",
+        "No issues match the query project = FOO AND status = Open.",
+        "Sorry, there are no sprints on board 12 yet.",
+        "PROJ-1 is In Progress and assigned to Jane Doe.",
+    ],
+)
+def test_answers_without_results_are_completed(text):
+    assert status_of(text) == "completed"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Error: the Atlassian API returned 401 Unauthorized.",
+        "I encountered an error while retrieving PROJ-1: 503 Service Unavailable.",
+        "I couldn't access the OPS space: you do not have permission to view it.",
+        "Failed to create the issue: the field 'priority' is required.",
+        "I was unable to update the page because its version changed.",
+    ],
+)
+def test_failures_are_errors(text):
+    assert status_of(text) == "error"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Which project should I create the issue in?",
+        "Please provide the issue key you want me to transition.",
+    ],
+)
+def test_questions_require_input(text):
+    assert status_of(text) == "input_required"
+
+
+def test_no_answer_without_final_message():
+    assert infer_response([]) is None
+    assert infer_response([AIMessage(content="", tool_calls=[{"name": "search", "args": {}, "id": "1"}])]) is None
+
+
+def test_structured_response_pass_is_default(monkeypatch):
+    monkeypatch.delenv("ATLASSIAN_STRUCTURED_RESPONSE", raising=False)
+    assert structured_response_mode() == "llm"
+    monkeypatch.setenv("ATLASSIAN_STRUCTURED_RESPONSE", "infer")
+    assert structured_response_mode() == "infer"
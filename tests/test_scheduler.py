@@ -0,0 +1,77 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+
+from agent_atlassian.protocol_bindings.a2a_server.scheduler import ExecutionScheduler, SchedulerBusy
+
+
+async def run(scheduler, context_id, name, order, release):
+    """A request that records when it starts and finishes once released."""
+    async with scheduler.slot(context_id):
+        order.append(name)
+        await release.wait()
+
+
+def test_requests_on_one_context_run_in_arrival_order():
+    async def scenario():
+        scheduler = ExecutionScheduler(max_concurrency=4, max_queue=0, queue_timeout=0)
+        order, release = [], asyncio.Event()
+        requests = []
+        for name in ("first", "second", "third"):
+            requests.append(asyncio.create_task(run(scheduler, "ctx", name, order, release)))
+            await asyncio.sleep(0)
+        # Other conversations are not held up behind "ctx"
+        other = asyncio.create_task(run(scheduler, "other", "other", order, release))
+        await asyncio.sleep(0.01)
+        started = list(order)
+        release.set()
+        await asyncio.gather(*requests, other)
+        return started, order, scheduler.stats()
+
+    started, order, stats = asyncio.run(scenario())
+    assert started == ["first", "other"]
+    assert order == ["first", "other", "second", "third"]
+    assert stats["running"] == 0 and stats["queued"] == 0 and stats["sessions"] == 0
+
+
+def test_request_is_rejected_when_the_queue_is_full():
+    async def scenario():
+        scheduler = ExecutionScheduler(max_concurrency=1, max_queue=1, queue_timeout=0)
+        order, release = [], asyncio.Event()
+        running = asyncio.create_task(run(scheduler, "a", "a", order, release))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(run(scheduler, "b", "b", order, release))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy) as rejected:
+            async with scheduler.slot("c"):
+                pass
+        release.set()
+        await asyncio.gather(running, queued)
+        return rejected.value, order
+
+    rejected, order = asyncio.run(scenario())
+    assert rejected.reason == "queue_full"
+    assert rejected.retry_after > 0
+    assert order == ["a", "b"]
+
+
+def test_request_is_rejected_after_the_queue_timeout():
+    async def scenario():
+        scheduler = ExecutionScheduler(max_concurrency=1, max_queue=0, queue_timeout=0.05)
+        release = asyncio.Event()
+        running = asyncio.create_task(run(scheduler, "a", "a", [], release))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy) as rejected:
+            async with scheduler.slot("b"):
+                pass
+        stats = scheduler.stats()
+        release.set()
+        await running
+        return rejected.value, stats
+
+    rejected, stats = asyncio.run(scenario())
+    assert rejected.reason == "queue_timeout"
+    assert stats["queued"] == 0
@@ -0,0 +1,96 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.singleflight import SingleFlight, request_key
+
+
+class Upstream:
+    """An upstream call that finishes when released and records how it ended."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"key": "PROJ-1"}
+
+
+def test_identical_calls_share_one_upstream_call():
+    async def scenario():
+        flight, upstream = SingleFlight(), Upstream()
+        callers = [asyncio.create_task(flight.do("key", upstream)) for _ in range(3)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        results = await asyncio.gather(*callers)
+        return upstream, results, len(flight)
+
+    upstream, results, in_flight = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert results == [{"key": "PROJ-1"}] * 3
+    assert in_flight == 0
+
+
+def test_survivors_get_the_result_when_the_first_caller_is_cancelled():
+    async def scenario():
+        flight, upstream = SingleFlight(), Upstream()
+        first = asyncio.create_task(flight.do("key", upstream))
+        second = asyncio.create_task(flight.do("key", upstream))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return upstream, await second
+
+    upstream, result = asyncio.run(scenario())
+    assert result == {"key": "PROJ-1"}
+    assert not upstream.cancelled
+
+
+def test_last_caller_leaving_cancels_the_upstream_call():
+    async def scenario():
+        flight, upstream = SingleFlight(), Upstream()
+        callers = [asyncio.create_task(flight.do("key", upstream)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return upstream, len(flight)
+
+    upstream, in_flight = asyncio.run(scenario())
+    assert upstream.cancelled
+    assert in_flight == 0
+
+
+def test_caller_timing_out_leaves_the_call_to_the_others():
+    async def scenario():
+        flight, upstream = SingleFlight(), Upstream()
+        patient = asyncio.create_task(flight.do("key", upstream))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("key", upstream, timeout=0.01)
+        upstream.release.set()
+        return upstream, await patient
+
+    upstream, result = asyncio.run(scenario())
+    assert result == {"key": "PROJ-1"}
+    assert upstream.calls == 1
+    assert not upstream.cancelled
+
+
+def test_request_key_normalises_parameters():
+    assert request_key("GET", "u", {"a": 1, "b": 2}, "auth") == request_key("GET", "u", {"b": "2", "a": "1"}, "auth")
+    assert request_key("GET", "u", {}, "auth") != request_key("GET", "u", {}, "other")
@@ -0,0 +1,27 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import sqlite3
+import time
+
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.httpcache import CachedResponse
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.api.store import PersistentStore
+
+KEY = ("GET", "https://example.atlassian.net/rest/api/2/field", "", "fingerprint")
+
+
+def test_corrupted_row_is_a_miss_and_is_deleted(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    store = PersistentStore(path)
+    store.put(KEY, CachedResponse(data=[{"id": "summary"}], size=20, etag='"1"', expires_at=time.time() + 60))
+    assert store.get(KEY).data == [{"id": "summary"}]
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE responses SET body = ?", ('[{"id": "summ',))
+
+    assert store.get(KEY) is None
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+    store.put(KEY, CachedResponse(data=[{"id": "status"}], size=20, etag='"2"'))
+    assert store.get(KEY).data == [{"id": "status"}]
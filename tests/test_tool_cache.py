@@ -0,0 +1,156 @@
+# Copyright CNOE Contributors (https://cnoe.io)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+
+from agent_atlassian import mcp_pool
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian import cache
+from agent_atlassian.protocol_bindings.mcp_server.mcp_atlassian.cache import (
+    SharedInvalidations,
+    ToolResultCache,
+    cached_tool,
+    invalidates,
+)
+
+
+class Issue:
+    """Stand-in for the Jira issue behind a pair of read and write tools."""
+
+    def __init__(self):
+        self.status = "To Do"
+        self.reads = 0
+
+    def tools(self):
+        @cached_tool(ttl=300, tags=lambda args: [f"jira:issue:{args['issue_key']}"])
+        async def get_issue(issue_key: str) -> dict:
+            self.reads += 1
+            return {"key": issue_key, "status": self.status}
+
+        @invalidates(lambda args: [f"jira:issue:{args['issue_key']}"])
+        async def transition_issue(issue_key: str, status: str) -> dict:
+            self.status = status
+            return {"key": issue_key, "status": status}
+
+        return get_issue, transition_issue
+
+
+@pytest.fixture
+def local_cache(monkeypatch):
+    """A tool cache of its own for the test, as in a single server process."""
+    monkeypatch.setenv("ATLASSIAN_TOOL_CACHE", "true")
+    monkeypatch.setattr(cache, "tool_cache", ToolResultCache())
+    return cache.tool_cache
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    """Tool caches of two pooled server processes sharing one invalidation file."""
+    monkeypatch.setenv("ATLASSIAN_TOOL_CACHE", "true")
+    path = str(tmp_path / "tool-cache.sqlite")
+    caches = {name: ToolResultCache(shared=SharedInvalidations(path)) for name in ("a", "b")}
+
+    def on(name):
+        monkeypatch.setattr(cache, "tool_cache", caches[name])
+
+    return on
+
+
+def test_write_evicts_tagged_reads(local_cache):
+    issue = Issue()
+    get_issue, transition_issue = issue.tools()
+    asyncio.run(get_issue("PROJ-1"))
+    asyncio.run(get_issue("PROJ-2"))
+
+    asyncio.run(transition_issue("PROJ-1", "Done"))
+
+    assert len(local_cache) == 1
+    assert asyncio.run(get_issue("PROJ-1"))["status"] == "Done"
+    asyncio.run(get_issue("PROJ-2"))
+    assert issue.reads == 3
+
+
+def test_failed_write_still_evicts_tagged_reads(local_cache):
+    issue = Issue()
+    get_issue, _ = issue.tools()
+
+    @invalidates(lambda args: [f"jira:issue:{args['issue_key']}"])
+    async def transition_issue(issue_key: str) -> dict:
+        raise RuntimeError("timed out after the server applied it")
+
+    asyncio.run(get_issue("PROJ-1"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(transition_issue("PROJ-1"))
+    assert len(local_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [{"error": "Issue does not exist"}, '{"error": "Issue does not exist"}', '  {"error": "x", "status": 404}'],
+)
+def test_error_results_are_not_cached(local_cache, failure):
+    calls = []
+
+    @cached_tool(ttl=300)
+    async def get_issue(issue_key: str):
+        calls.append(issue_key)
+        return failure if len(calls) == 1 else {"key": issue_key}
+
+    assert asyncio.run(get_issue("PROJ-1")) == failure
+    assert asyncio.run(get_issue("PROJ-1")) == {"key": "PROJ-1"}
+    assert asyncio.run(get_issue("PROJ-1")) == {"key": "PROJ-1"}
+    assert len(calls) == 2
+
+
+def test_results_mentioning_errors_are_cached(local_cache):
+    calls = []
+
+    @cached_tool(ttl=300)
+    async def get_comment(comment_id: str) -> str:
+        calls.append(comment_id)
+        return '{"body": "the \\"error\\" field is empty"}'
+
+    asyncio.run(get_comment("1"))
+    asyncio.run(get_comment("1"))
+    assert len(calls) == 1
+
+
+def test_write_on_one_session_invalidates_reads_on_another(sessions):
+    issue = Issue()
+    get_issue, transition_issue = issue.tools()
+
+    sessions("b")
+    assert asyncio.run(get_issue("PROJ-1"))["status"] == "To Do"
+    assert asyncio.run(get_issue("PROJ-1"))["status"] == "To Do"
+    assert issue.reads == 1
+
+    sessions("a")
+    asyncio.run(transition_issue("PROJ-1", "Done"))
+
+    sessions("b")
+    assert asyncio.run(get_issue("PROJ-1"))["status"] == "Done"
+    assert issue.reads == 2
+
+
+def test_write_on_another_session_keeps_unrelated_reads(sessions):
+    issue = Issue()
+    get_issue, transition_issue = issue.tools()
+
+    sessions("b")
+    asyncio.run(get_issue("PROJ-2"))
+    sessions("a")
+    asyncio.run(transition_issue("PROJ-1", "Done"))
+    sessions("b")
+    asyncio.run(get_issue("PROJ-2"))
+    assert issue.reads == 1
+
+
+def test_pooled_servers_share_invalidations(monkeypatch):
+    for name in ("ATLASSIAN_TOKEN", "ATLASSIAN_API_URL", "ATLASSIAN_EMAIL"):
+        monkeypatch.setenv(name, "x")
+    monkeypatch.setenv("ATLASSIAN_MCP_TRANSPORT", "stdio")
+    monkeypatch.delenv("ATLASSIAN_TOOL_CACHE_DB", raising=False)
+    first, second = mcp_pool.atlassian_mcp_connection(), mcp_pool.atlassian_mcp_connection()
+    assert first["env"]["ATLASSIAN_TOOL_CACHE_DB"]
+    assert first["env"]["ATLASSIAN_TOOL_CACHE_DB"] == second["env"]["ATLASSIAN_TOOL_CACHE_DB"]